@@ -0,0 +1,96 @@
+"""
+End-to-end client benchmark against the local mock server.
+
+Measures Network.get_paths (sequential and concurrent cross-connect fetching),
+create_path in a loop, and the bulk create_paths/delete_paths, for networks of
+10, 1k and 10k trails served by multiverse.mock_server with a fixed latency.
+
+Usage:
+    python benchmarks/client_benchmark.py [--scales 10 1000 10000] [--latency 0.001] [--operations 200]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from multiverse import Multiverse, Path, OXC
+from multiverse.mock_server import MockMultiverseServer
+
+
+def timed(func, *args, **kwargs):
+    """Run func with its prints silenced and return (result, elapsed seconds)."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def make_paths(count, num_switches, ports_per_switch):
+    """Single cross-connect paths spread over the switches of the synthetic ring."""
+    paths = []
+    for idx in range(count):
+        switch = f"SW{idx % num_switches}"
+        in_port = 6 + (idx // num_switches) % (ports_per_switch - 6)
+        out_port = 6 + (idx // num_switches + 1) % (ports_per_switch - 6)
+        path = Path(name=f"BENCH_{idx}", label=f"BENCH_{idx}")
+        path.add_oxc(OXC(label=f"{switch}_OXC_{idx}", switch=switch, inPort=str(in_port), outPort=str(out_port)))
+        paths.append(path)
+    return paths
+
+
+def run_scale(server, mvs, num_trails, operations, workers, num_switches=8, ports_per_switch=64):
+    name = f"bench-{num_trails}"
+    server.add_synthetic_network(name, num_switches=num_switches, ports_per_switch=ports_per_switch,
+                                 num_trails=num_trails)
+    network, _ = timed(mvs.select_network, name)
+    network.get_topology()
+
+    rows = []
+    paths, elapsed = timed(network.get_paths, max_workers=1)
+    rows.append(("get_paths (sequential)", len(paths), elapsed))
+    paths, elapsed = timed(network.get_paths, max_workers=workers)
+    rows.append((f"get_paths ({workers} workers)", len(paths), elapsed))
+
+    singles = make_paths(operations, num_switches, ports_per_switch)
+    _, elapsed = timed(lambda: [network.create_path(path) for path in singles])
+    rows.append(("create_path loop", len(singles), elapsed))
+    _, elapsed = timed(lambda: [network.delete_path(path) for path in singles])
+    rows.append(("delete_path loop", len(singles), elapsed))
+
+    bulk = make_paths(operations, num_switches, ports_per_switch)
+    results, elapsed = timed(network.create_paths, bulk, max_workers=workers)
+    rows.append((f"create_paths ({workers} workers)", sum(r['id'] is not None for r in results), elapsed))
+    results, elapsed = timed(network.delete_paths, bulk, max_workers=workers)
+    rows.append((f"delete_paths ({workers} workers)", sum(r['deleted'] for r in results), elapsed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', type=int, nargs='+', default=[10, 1000, 10000], help='numbers of trails')
+    parser.add_argument('--latency', type=float, default=0.001, help='server latency per request, in seconds')
+    parser.add_argument('--operations', type=int, default=200, help='paths created/deleted per operation')
+    parser.add_argument('--workers', type=int, default=16, help='concurrent requests for the parallel modes')
+    args = parser.parse_args()
+
+    os.environ.setdefault("MVS_USERNAME", "bench")
+    os.environ.setdefault("MVS_PASSWORD", "bench")
+
+    with MockMultiverseServer(latency=args.latency) as server:
+        mvs, _ = timed(Multiverse, server_ip=server.host, api_port=server.api_port, auth_port=server.auth_port)
+        print(f"Mock server latency: {args.latency * 1000:.1f} ms per request")
+        print(f"{'trails':>8}  {'operation':<28} {'items':>7} {'time [s]':>10} {'items/s':>10}")
+        for num_trails in args.scales:
+            for operation, items, elapsed in run_scale(server, mvs, num_trails, args.operations, args.workers):
+                rate = items / elapsed if elapsed else float('inf')
+                print(f"{num_trails:>8}  {operation:<28} {items:>7} {elapsed:>10.3f} {rate:>10.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Import-time benchmark for the multiverse package.
+
+Runs "python -X importtime -c 'import multiverse'" in fresh interpreters, reports
+the cumulative import time of the package and its slowest imports, and fails if
+a heavy dependency is imported eagerly.
+
+Usage:
+    python benchmarks/import_time.py [--repeat 5] [--statement "import multiverse"]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Modules that must only be imported when the feature needing them is used
+HEAVY_MODULES = ['networkx', 'requests', 'urllib3', 'aiohttp', 'matplotlib', 'numpy', 'scipy']
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_importtime(statement):
+    """
+    Import in a fresh interpreter and parse the -X importtime report.
+
+    :return: List of (module, depth, self_us, cumulative_us) tuples in report order
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = REPO_ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        entries.append((module.strip(), depth, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='number of fresh interpreters to run')
+    parser.add_argument('--statement', default='import multiverse', help='import statement to measure')
+    parser.add_argument('--top', type=int, default=10, help='number of slowest imports to show')
+    args = parser.parse_args()
+
+    # Modules already imported by interpreter startup are not attributed to the statement
+    startup = {module for module, _, _, _ in run_importtime('pass')}
+
+    package_times = []
+    entries = []
+    for _ in range(args.repeat):
+        entries = [entry for entry in run_importtime(args.statement) if entry[0] not in startup]
+        # Only count the imports triggered by the statement, not interpreter startup
+        package_times.append(sum(cumulative for module, depth, _, cumulative in entries
+                                 if depth == 0 and module.split('.')[0] == 'multiverse'))
+
+    print(f"Statement: {args.statement}")
+    print(f"multiverse import time: median {statistics.median(package_times) / 1000:.1f} ms, "
+          f"min {min(package_times) / 1000:.1f} ms over {args.repeat} run(s)")
+    print("Slowest imports (last run, self time):")
+    for module, _, self_us, _ in sorted(entries, key=lambda e: e[2], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.2f} ms  {module}")
+
+    imported = {module for module, _, _, _ in entries}
+    eager = [heavy for heavy in HEAVY_MODULES if heavy in imported]
+    if eager:
+        print(f"FAIL: heavy modules imported eagerly: {', '.join(eager)}")
+        return 1
+    print("OK: no heavy module imported eagerly.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
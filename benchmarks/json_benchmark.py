@@ -0,0 +1,101 @@
+"""
+JSON codec benchmark on large topology and trail payloads.
+
+Encodes a synthetic topology (fat mesh, multiverse.synthetic) and a trail list
+with embedded cross-connects in the server format, then reports the decode time
+of every installed codec, with and without the typed schemas, and the encode
+time of the trail creation payloads.
+
+Usage:
+    python benchmarks/json_benchmark.py [--switches 2000] [--trails 20000] [--repeat 5]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from multiverse.codec import make_codec
+from multiverse.synthetic import mesh_topology
+
+
+def make_trails(topology, count, seed=0):
+    """Trails with 3-6 random cross-connects each, as listed by /subnet/{id}/trails."""
+    rng = random.Random(seed)
+    switches = [node for node in topology['nodes'] if node['type'] == 'SWITCH']
+    trails = []
+    for idx in range(count):
+        vxcs = []
+        for hop in range(rng.randint(3, 6)):
+            switch = rng.choice(switches)
+            ingress, egress = rng.sample(switch['vltps'], 2)
+            vxcs.append({'id': idx * 10 + hop, 'name': "", 'label': f"TRAIL_{idx}_{hop}",
+                         'description': "", 'switchId': switch['id'],
+                         'ingressPortId': ingress['id'], 'egressPortId': egress['id']})
+        trails.append({'id': idx + 1, 'name': f"TRAIL_{idx}", 'label': f"TRAIL_{idx}",
+                       'description': "", 'status': "ACTIVE", 'vxcs': vxcs})
+    return trails
+
+
+def best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--switches', type=int, default=2000, help='number of switches of the topology')
+    parser.add_argument('--trails', type=int, default=20000, help='number of trails')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement (best is reported)')
+    args = parser.parse_args()
+
+    topology = mesh_topology(args.switches, degree=6, ports_per_switch=64)
+    trails = make_trails(topology, args.trails)
+    payloads = [
+        ('topology', json.dumps(topology).encode()),
+        ('trails', json.dumps(trails).encode()),
+    ]
+    # Bodies of POST /trail, encoded one by one as by create_paths
+    trail_payloads = [{'name': trail['name'], 'label': trail['label'], 'description': "",
+                       'oxcs': trail['vxcs']} for trail in trails]
+
+    codecs = []
+    for name in ('json', 'orjson', 'msgspec'):
+        try:
+            codecs.append(make_codec(name))
+        except ImportError:
+            print(f"{name}: not installed, skipped")
+
+    print(f"{'payload':<10} {'size [MB]':>9}  {'codec':<8} {'typed':<5} {'decode [ms]':>11} {'speedup':>7}")
+    for payload_name, data in payloads:
+        baseline = None
+        for codec in codecs:
+            for typed in (False, True):
+                if typed and codec.name != 'msgspec':
+                    continue
+                schema = payload_name if typed else None
+                elapsed = best_time(lambda: codec.loads(data, schema), args.repeat)
+                baseline = baseline or elapsed
+                print(f"{payload_name:<10} {len(data) / 1e6:>9.1f}  {codec.name:<8} {str(typed):<5} "
+                      f"{elapsed * 1000:>11.1f} {baseline / elapsed:>6.1f}x")
+
+    print(f"\n{'payload':<14} {'count':>6}  {'codec':<8} {'encode [ms]':>11} {'speedup':>7}")
+    baseline = None
+    for codec in codecs:
+        elapsed = best_time(lambda: [codec.dumps(payload) for payload in trail_payloads], args.repeat)
+        baseline = baseline or elapsed
+        print(f"{'POST /trail':<14} {len(trail_payloads):>6}  {codec.name:<8} {elapsed * 1000:>11.1f} "
+              f"{baseline / elapsed:>6.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
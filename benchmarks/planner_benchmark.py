@@ -0,0 +1,64 @@
+"""
+Multi-demand planner benchmark.
+
+Builds a fat mesh (multiverse.synthetic), draws random switch-to-switch demands,
+then reports for each strategy of plan_paths the number of served demands, the
+total hops and the time, split between the candidate search and the assignment.
+
+Usage:
+    python benchmarks/planner_benchmark.py [--switches 100] [--demands 300] [--k 6] [--exact-demands 20]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from multiverse.ledger import PortLedger
+from multiverse.network import topology_to_graph
+from multiverse.planner import plan_paths
+from multiverse.synthetic import mesh_topology
+from multiverse.utils import search_paths_many
+
+
+def random_demands(graph, count, seed=0):
+    rng = random.Random(seed)
+    switches = sorted(node for node, data in graph.nodes(data=True) if data.get('type') == 'SWITCH')
+    return [tuple(rng.sample(switches, 2)) for _ in range(count)]
+
+
+def run(graph, demands, k, strategies, time_budget):
+    ledger = PortLedger()
+    start = time.perf_counter()
+    search_paths_many(graph, demands, ledger, k=k, only_possible=True)
+    search_time = time.perf_counter() - start
+    for strategy in strategies:
+        start = time.perf_counter()
+        plan = plan_paths(graph, demands, ledger, k=k, strategy=strategy, time_budget=time_budget)
+        elapsed = time.perf_counter() - start
+        print(f"{len(demands):>7}  {strategy:<13} {len(plan):>6} {plan.hops:>6} {str(plan.optimal):<7} "
+              f"{search_time * 1000:>11.0f} {max(elapsed - search_time, 0) * 1000:>11.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--switches', type=int, default=100, help='number of switches of the mesh')
+    parser.add_argument('--demands', type=int, default=300, help='number of demands for the heuristics')
+    parser.add_argument('--k', type=int, default=6, help='candidates per demand')
+    parser.add_argument('--exact-demands', type=int, default=20, help='number of demands for the exact strategy')
+    parser.add_argument('--budget', type=float, default=30, help='time budget of the exact strategy (s)')
+    args = parser.parse_args()
+
+    graph = topology_to_graph(mesh_topology(args.switches, degree=5, ports_per_switch=48))
+    print(f"{'demands':>7}  {'strategy':<13} {'served':>6} {'hops':>6} {'optimal':<7} "
+          f"{'search [ms]':>11} {'assign [ms]':>11}")
+    run(graph, random_demands(graph, args.demands), args.k, ('greedy', 'min-conflict', 'best'), None)
+    run(graph, random_demands(graph, args.exact_demands, seed=1), args.k, ('best', 'exact'), args.budget)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
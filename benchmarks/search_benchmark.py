@@ -0,0 +1,123 @@
+"""
+Path-search benchmark over synthetic topologies.
+
+Builds rings, grids, fat meshes and multi-link trunks with multiverse.synthetic,
+establishes a load of non-conflicting trails, then runs every search mode from
+SOURCE to DETECTOR and reports the time, the peak memory (tracemalloc) and the
+number of candidates returned. The enumerate modes only time the path
+enumeration and the cross-connect extraction, on the NetworkX graph and on the
+edge indices of the CompactTopology.
+
+Usage:
+    python benchmarks/search_benchmark.py [--size small|large] [--load 20] [--budget 10] [--modes ...]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from multiverse import CompactTopology, iter_search_paths, search_paths
+from multiverse.ledger import PortLedger
+from multiverse.network import topology_to_graph
+from multiverse.synthetic import establish_trails, grid_topology, mesh_topology, ring_topology, trunk_topology
+from multiverse.utils import extract_cross_connects, iter_all_paths
+
+TOPOLOGIES = {
+    'small': [
+        ('ring-16', lambda: ring_topology(16, links_per_hop=2)),
+        ('grid-4x4', lambda: grid_topology(4, 4)),
+        ('mesh-12', lambda: mesh_topology(12, degree=4)),
+        ('trunk-6x4', lambda: trunk_topology(6, links_per_trunk=4)),
+    ],
+    'large': [
+        ('ring-64', lambda: ring_topology(64, links_per_hop=2)),
+        ('grid-6x6', lambda: grid_topology(6, 6)),
+        ('mesh-40', lambda: mesh_topology(40, degree=5, ports_per_switch=48)),
+        ('trunk-10x6', lambda: trunk_topology(10, links_per_trunk=6, ports_per_switch=32)),
+    ],
+}
+
+START = 'SOURCE'
+END = 'DETECTOR'
+
+
+def mode_enumerate(graph, compact, ledger, budget):
+    return [extract_cross_connects(graph, path_edges) for path_edges in iter_all_paths(graph, START, END)]
+
+
+def mode_enumerate_compact(graph, compact, ledger, budget):
+    return [compact.edge_cross_connects(edges) for edges in compact.iter_edge_paths(START, END)]
+
+
+def mode_exhaustive(graph, compact, ledger, budget):
+    return list(iter_search_paths(graph, START, END, ledger, time_budget=budget))
+
+
+def mode_exhaustive_compact(graph, compact, ledger, budget):
+    return list(iter_search_paths(compact, START, END, ledger, time_budget=budget))
+
+
+def mode_exhaustive_parallel(graph, compact, ledger, budget):
+    return list(iter_search_paths(compact, START, END, ledger, time_budget=budget, processes=os.cpu_count()))
+
+
+def mode_k_shortest(graph, compact, ledger, budget):
+    return search_paths(graph, START, END, ledger, k=10)
+
+
+def mode_first_possible(graph, compact, ledger, budget):
+    return list(iter_search_paths(graph, START, END, ledger, only_possible=True, max_results=1, time_budget=budget))
+
+
+MODES = {
+    'enumerate': mode_enumerate,
+    'enumerate-compact': mode_enumerate_compact,
+    'exhaustive': mode_exhaustive,
+    'exhaustive-compact': mode_exhaustive_compact,
+    'exhaustive-parallel': mode_exhaustive_parallel,
+    'k-shortest-10': mode_k_shortest,
+    'first-possible': mode_first_possible,
+}
+
+
+def measure(mode, graph, compact, ledger, budget):
+    """Run a mode twice: once for the time, once under tracemalloc for the peak memory."""
+    start = time.perf_counter()
+    results = mode(graph, compact, ledger, budget)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    mode(graph, compact, ledger, budget)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(results), elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', choices=sorted(TOPOLOGIES), default='small', help='topology sizes')
+    parser.add_argument('--load', type=int, default=10, help='number of established trails')
+    parser.add_argument('--budget', type=float, default=10.0, help='time budget of the enumerating modes, in seconds')
+    parser.add_argument('--modes', nargs='+', choices=sorted(MODES), default=list(MODES), help='search modes to run')
+    args = parser.parse_args()
+
+    print(f"{'topology':<12} {'nodes':>5} {'edges':>5} {'trails':>6}  {'mode':<20} "
+          f"{'candidates':>10} {'time [ms]':>10} {'peak [KiB]':>10}")
+    for name, build in TOPOLOGIES[args.size]:
+        graph = topology_to_graph(build())
+        compact = CompactTopology.from_graph(graph)
+        ledger = PortLedger(establish_trails(graph, args.load))
+        for mode_name in args.modes:
+            count, elapsed, peak = measure(MODES[mode_name], graph, compact, ledger, args.budget)
+            flag = " (budget hit)" if elapsed >= args.budget else ""
+            print(f"{name:<12} {graph.number_of_nodes():>5} {graph.number_of_edges():>5} {len(ledger):>6}  "
+                  f"{mode_name:<20} {count:>10} {elapsed * 1000:>10.1f} {peak / 1024:>10.0f}{flag}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
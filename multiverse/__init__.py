@@ -1,9 +1,41 @@
 # multiverse/__init__.py
 
-from .multiverse import Multiverse
-from .network import Network
+from importlib import import_module
+
 from .path import Path
 from .oxc import OXC
-from .utils import search_paths
 
-__all__ = ['Multiverse', 'Network', 'Path', 'OXC', 'search_paths']
+# Names imported on first access, so that "import multiverse" does not pull in
+# networkx, requests or aiohttp until they are actually needed.
+_LAZY_ATTRIBUTES = {
+    'Multiverse': '.multiverse',
+    'Network': '.network',
+    'AsyncMultiverse': '.async_multiverse',
+    'AsyncNetwork': '.async_network',
+    'search_paths': '.utils',
+    'iter_search_paths': '.utils',
+    'search_paths_many': '.utils',
+    'CompactTopology': '.compact',
+    'SessionStats': '.instrumentation',
+    'SearchCache': '.search_cache',
+    'CandidateSet': '.candidates',
+    'search_disjoint_paths': '.disjoint',
+    'plan_paths': '.planner',
+}
+
+__all__ = ['Multiverse', 'Network', 'AsyncMultiverse', 'AsyncNetwork', 'Path', 'OXC', 'search_paths',
+           'iter_search_paths', 'search_paths_many', 'CompactTopology', 'SessionStats',
+           'SearchCache', 'CandidateSet', 'search_disjoint_paths',
+           'plan_paths']
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
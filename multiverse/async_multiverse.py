@@ -0,0 +1,241 @@
+# multiverse/async_multiverse.py
+
+import asyncio
+import json
+import os
+import time
+
+from .async_network import AsyncNetwork
+from .auth import TokenManager
+from .codec import get_codec
+from .instrumentation import SessionStats
+from .search_cache import make_search_cache
+from .snapshot import make_snapshot_store
+
+
+class _Response:
+    """Minimal response object mirroring the parts of requests.Response used by the client."""
+
+    def __init__(self, status_code, text, headers, content=b""):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers
+        self.content = content
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class AsyncMultiverse:
+    """
+    Asyncio version of Multiverse.
+
+    All requests share a single aiohttp connection pool, so many networks and
+    trails can be handled concurrently from one event loop:
+
+        async with AsyncMultiverse(server_ip="localhost") as mvs:
+            qnet = await mvs.select_network("qnet-example")
+            paths = await qnet.get_paths()
+    """
+
+    def __init__(self, server_ip="localhost", limit=100, api_port=8787, auth_port=8888,
+                 token_cache=None, refresh_margin=30, codec=None, snapshot_store=None,
+                 search_cache=None):
+        username = os.getenv("MVS_USERNAME")
+        password = os.getenv("MVS_PASSWORD")
+
+        if not username or not password:
+            raise ValueError("Username or password is not set in environment variables: MVS_USERNAME and MVS_PASSWORD")
+
+        self._username = username
+        self._password = password
+        self.codec = get_codec(codec)
+        self._snapshot_store = make_snapshot_store(snapshot_store)
+        self._search_cache = make_search_cache(search_cache)
+        self._limit = limit
+        self._BASE_URL = f"http://{server_ip}:{api_port}/api/topology"
+        self._AUTH_URL = f"http://{server_ip}:{auth_port}/realms/multiverse/protocol/openid-connect/token"
+        self.session = None
+        self._stats = SessionStats()
+        self._tokens = TokenManager(self._AUTH_URL, username, refresh_margin, token_cache)
+        self._token_lock = None
+
+    @property
+    def token(self):
+        return self._tokens.access_token
+
+    @property
+    def stats(self):
+        """SessionStats of the requests sent to the backend."""
+        return self._stats
+
+    async def __aenter__(self):
+        if self._tokens.is_valid():
+            print(f"Using cached token for {self._username}")
+        elif self._tokens.can_refresh():
+            await self._ensure_token()
+        else:
+            await self.login(self._username, self._password)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _get_session(self):
+        """Return the shared aiohttp session, creating it on first use."""
+        if self.session is None or self.session.closed:
+            import aiohttp
+            connector = aiohttp.TCPConnector(limit=self._limit)
+            self.session = aiohttp.ClientSession(connector=connector)
+        return self.session
+
+    async def close(self):
+        """Close the shared connection pool."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def _request(self, method, url, headers=None, authenticate=True, **kwargs):
+        """
+        Send a request through the shared session and return a buffered response.
+        Authenticated requests carry a valid access token and are sent once more
+        with a new token if the server answers 401.
+        """
+        if not authenticate:
+            return await self._send(method, url, headers, **kwargs)
+        token = await self._ensure_token()
+        response = await self._send(method, url, self._auth_headers(token, headers), **kwargs)
+        if response.status_code == 401:
+            new_token = await self._reauthenticate(token)
+            if new_token:
+                self._stats.record_retry(method, url)
+                response = await self._send(method, url, self._auth_headers(new_token, headers), **kwargs)
+        return response
+
+    @staticmethod
+    def _auth_headers(token, headers):
+        request_headers = {'Authorization': f'Bearer {token}'} if token else {}
+        if headers:
+            request_headers.update(headers)
+        return request_headers
+
+    async def _send(self, method, url, headers, **kwargs):
+        session = self._get_session()
+        started = time.perf_counter()
+        async with session.request(method, url, headers=headers, **kwargs) as response:
+            latency = time.perf_counter() - started
+            body = await response.read()
+            text = body.decode(response.get_encoding())
+        data = kwargs.get('data')
+        if isinstance(data, str):
+            data = data.encode()
+        request_bytes = len(data) if isinstance(data, bytes) else 0
+        self._stats.record(method, url, response.status, latency, request_bytes, len(body))
+        return _Response(response.status, text, response.headers, body)
+
+    def _get_token_lock(self):
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+        return self._token_lock
+
+    async def _request_token(self, data):
+        """Send a grant to the token endpoint."""
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        return await self._request("POST", self._AUTH_URL, headers=headers, authenticate=False, data=data)
+
+    async def _refresh_token(self):
+        """Renew the access token with the refresh token, falling back to a password grant."""
+        if self._tokens.can_refresh():
+            response = await self._request_token(self._tokens.refresh_grant())
+            if response.status_code == 200:
+                self._tokens.update(response.json())
+                return self._tokens.access_token
+        response = await self._request_token(TokenManager.password_grant(self._username, self._password))
+        if response.status_code == 200:
+            self._tokens.update(response.json())
+            return self._tokens.access_token
+        print(f"Login failed: {response.text}")
+        return None
+
+    async def _ensure_token(self):
+        """Return a valid access token, refreshing it if it is about to expire."""
+        if self._tokens.is_valid():
+            return self._tokens.access_token
+        async with self._get_token_lock():
+            if self._tokens.is_valid():
+                return self._tokens.access_token
+            return await self._refresh_token()
+
+    async def _reauthenticate(self, rejected_token):
+        """Return a new access token after the server rejected rejected_token."""
+        async with self._get_token_lock():
+            self._tokens.invalidate(rejected_token)
+            if self._tokens.is_valid():
+                return self._tokens.access_token
+            return await self._refresh_token()
+
+    async def login(self, username, password):
+        """Authenticate with the backend and store the access token."""
+        print(f"Logging in as {username}")
+        async with self._get_token_lock():
+            response = await self._request_token(TokenManager.password_grant(username, password))
+            if response.status_code == 200:
+                self._tokens.update(response.json())
+                print("Logged in successfully.")
+            else:
+                print(f"Login failed: {response.text}")
+
+    async def create_network(self, name, json_file_path):
+        """Create a network with topology from a JSON file."""
+        url = f"{self._BASE_URL}/upload"
+        headers = {'Content-Type': 'application/json'}
+        with open(json_file_path, 'r') as file:
+            topology = json.load(file)
+            topology['name'] = name
+        response = await self._request("POST", url, headers=headers, data=self.codec.dumps(topology))
+        if response.status_code == 201:
+            network_id = response.json()['id']
+            print(f"Network '{name}' created with ID: {network_id}")
+            return AsyncNetwork(self, network_id, name, snapshot_store=self._snapshot_store,
+                                search_cache=self._search_cache)
+        else:
+            print(f"Failed to upload network: {response.status_code} {response.text}")
+            if response.status_code == 409:
+                print(f"Network '{name}' already exists.")
+                return await self.select_network(name)
+            return None
+
+    async def select_network(self, name):
+        """Select a network by name and return an AsyncNetwork object."""
+        networks = await self.get_networks()
+        if networks:
+            for network in networks:
+                if network['name'] == name:
+                    return AsyncNetwork(self, network['id'], name, snapshot_store=self._snapshot_store,
+                                        search_cache=self._search_cache)
+        print(f"Network '{name}' not found.")
+        return None
+
+    async def get_networks(self):
+        """Fetch all networks."""
+        url = f"{self._BASE_URL}/subnet"
+        response = await self._request("GET", url)
+        if response.status_code == 200:
+            return response.json()
+        else:
+            print(f"Failed to get networks: {response.text}")
+            return None
+
+    async def delete_network(self, network):
+        """Delete a network."""
+        if not network.id:
+            print("Network ID is required to delete a network.")
+            return False
+        url = f"{self._BASE_URL}/subnet/{network.id}"
+        response = await self._request("DELETE", url)
+        if response.status_code == 200 or response.status_code == 204:
+            print(f"Network {network.name} deleted.")
+            return True
+        else:
+            print(f"Failed to delete network: {response.text}")
+            return False
@@ -0,0 +1,242 @@
+# multiverse/async_network.py
+
+import asyncio
+
+from .candidates import CandidateSet
+from .network import Network, _create_result, _delete_result
+
+
+class AsyncNetwork(Network):
+    """
+    Asyncio version of Network.
+
+    Shares the name/ID conversion helpers of Network; every method that talks
+    to the backend is a coroutine sent through the AsyncMultiverse session.
+    """
+
+    async def download_json(self):
+        """Generate a JSON from the network content similar to the JSON used in upload."""
+        url = f"{self._multiverse._BASE_URL}/subnet/{self._network_id}/download"
+        response = await self._multiverse._request("GET", url)
+        if response.status_code == 200:
+            return self._decode(response)
+        else:
+            print(f"Failed to download network content: {response.text}")
+            return None
+
+    async def get_topology(self, force=False):
+        """Fetch the topology for the network, using the same cache as Network.get_topology()."""
+        cache = self._topology_cache
+        if not force and cache.is_fresh(self.topology_ttl):
+            return cache.graph
+        url = f"{self._multiverse._BASE_URL}/subnet/{self._network_id}/topology"
+        headers = {} if force else cache.validators()
+        response = await self._multiverse._request("GET", url, headers=headers)
+        return self._handle_topology_response(response, force)
+
+    async def search_paths(self, start_name, end_name, k=None, weight=None, **options):
+        """Search the paths between two nodes of the network, as Network.search_paths()."""
+        graph = self._topology_cache.graph
+        if graph is None:
+            graph = await self.get_topology()
+        return self._search_cached(graph, start_name, end_name, k, weight, options)
+
+    async def search_candidates(self, start_name, end_name, k=None, weight=None, **options):
+        """Search the paths between two nodes as a CandidateSet, as Network.search_candidates()."""
+        results = await self.search_paths(start_name, end_name, k, weight, **options)
+        return CandidateSet(results, self._ledger) if results is not None else None
+
+    async def search_disjoint_paths(self, start_name, end_name, disjoint='node', weight=None):
+        """Search a primary and a backup path between two nodes, as Network.search_disjoint_paths()."""
+        from .disjoint import search_disjoint_paths
+
+        graph = self._topology_cache.graph
+        if graph is None:
+            graph = await self.get_topology()
+        if graph is None:
+            return None
+        return search_disjoint_paths(graph, start_name, end_name, self._ledger, disjoint, weight)
+
+    async def plan_paths(self, demands, **options):
+        """Choose a conflict-free path for as many demands as possible, as Network.plan_paths()."""
+        from .planner import plan_paths
+
+        graph = self._topology_cache.graph
+        if graph is None:
+            graph = await self.get_topology()
+        if graph is None:
+            return None
+        return plan_paths(graph, demands, self._ledger, **options)
+
+    async def get_paths(self, max_workers=None):
+        """
+        Fetch all paths (trails) for the network, fetching their cross-connects concurrently.
+
+        :param max_workers: Maximum number of parallel requests (defaults to self.max_workers)
+        :return: List of Path objects, in the order returned by the server
+        """
+        if self._node_map is None or self._port_map is None:
+            await self.get_topology()
+        url = f"{self._multiverse._BASE_URL}/subnet/{self._network_id}/trails"
+        response = await self._multiverse._request("GET", url)
+        if response.status_code == 200:
+            trails = self._decode(response, 'trails')
+            fetched, pending = self._split_embedded(trails)
+            all_vxcs = await self._gather_bounded([self._try_get_path_vxcs(path_id) for path_id in pending], max_workers)
+            fetched.update(zip(pending, all_vxcs))
+            return self._paths_from_trails(trails, fetched)
+        else:
+            print(f"Failed to get paths: {response.text}")
+            return None
+
+    async def reconcile(self):
+        """Bring the topology and paths up to date with the server (and the snapshot store)."""
+        await self.get_topology()
+        return await self.get_paths()
+
+    async def warm_start(self, background=True):
+        """
+        Return the paths of the snapshot immediately and reconcile with the server
+        in a background task (see wait_reconciled()), as Network.warm_start(): the
+        task reconciles a private copy of the network state and swaps it in at once.
+        """
+        paths = self.load_snapshot()
+        if paths is None or not background:
+            return await self.reconcile()
+        self._reconciliation = asyncio.ensure_future(self._reconcile_staged())
+        return paths
+
+    async def _reconcile_staged(self):
+        """Reconcile a private copy of the network state, then swap it in, as Network._reconcile_staged()."""
+        staging, version = self._staging_copy()
+        await staging.get_topology()
+        paths = await staging.get_paths() if staging._topology_cache.graph is not None else None
+        return self._adopt_staging(staging, version, paths)
+
+    async def wait_reconciled(self, timeout=None):
+        """Wait for the background reconciliation started by warm_start(); return True if it is done."""
+        task = self._reconciliation
+        if task is None:
+            return True
+        await asyncio.wait([task], timeout=timeout)
+        return task.done()
+
+    async def _try_get_path_vxcs(self, path_id):
+        """Fetch cross-connects for a path, reporting connection errors instead of raising."""
+        import aiohttp
+        try:
+            return await self._get_path_vxcs(path_id)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Failed to get path cross-connects: {e}")
+            return None
+
+    async def _get_path_vxcs(self, path_id):
+        """Fetch cross-connects for a given path ID."""
+        url = f"{self._multiverse._BASE_URL}/trail/{path_id}/oxcs"
+        response = await self._multiverse._request("GET", url)
+        if response.status_code == 200:
+            return self._convert_vxcs(self._decode(response, 'vxcs'))
+        else:
+            print(f"Failed to get path cross-connects: {response.text}")
+            return None
+
+    async def create_path(self, path):
+        """Create a path with the specified data."""
+        if self._node_map is None or self._port_map is None:
+            await self.get_topology()
+
+        payload = self._path_payload(path)
+
+        url = f"{self._multiverse._BASE_URL}/trail"
+        headers = {'Content-Type': 'application/json'}
+        response = await self._multiverse._request("POST", url, headers=headers, data=self._multiverse.codec.dumps(payload))
+        if response.status_code == 201:
+            print(f"Path {path.name} created")
+            path.id = self._decode(response)['id']
+            self._ledger.add_path(path)
+            return path
+        else:
+            print(f"Failed to create path: {response.text}")
+            return None
+
+    async def delete_path(self, path, force=False):
+        """Delete a path."""
+        if not path.id:
+            print("Path ID is required to delete a path.")
+            return False
+        url = f"{self._multiverse._BASE_URL}/trail/{path.id}"
+        response = await self._multiverse._request("DELETE", url)
+        if response.status_code == 200 or response.status_code == 204:
+            if force:
+                return await self.delete_path(path, False)
+            else:
+                print(f"Path {path.name} deleted.")
+                self._ledger.remove_path(path)
+                return True
+        else:
+            print(f"Failed to delete path: {response.text}")
+            return False
+
+    async def _gather_bounded(self, coros, max_workers=None):
+        """Await coroutines concurrently, at most max_workers at a time, returning the results in order."""
+        semaphore = asyncio.Semaphore(max_workers or self.max_workers)
+
+        async def run(coro):
+            async with semaphore:
+                return await coro
+
+        return await asyncio.gather(*(run(coro) for coro in coros))
+
+    async def create_paths(self, paths, max_workers=None):
+        """Create several paths concurrently. See Network.create_paths()."""
+        import aiohttp
+        if self._node_map is None or self._port_map is None:
+            await self.get_topology()
+
+        url = f"{self._multiverse._BASE_URL}/trail"
+        headers = {'Content-Type': 'application/json'}
+
+        async def send(path, payload):
+            try:
+                response = await self._multiverse._request("POST", url, headers=headers, data=self._multiverse.codec.dumps(payload))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                return _create_result(path, None, None, str(e))
+            if response.status_code == 201:
+                path.id = self._decode(response)['id']
+                return _create_result(path, path.id, response.status_code, None)
+            return _create_result(path, None, response.status_code, response.text)
+
+        async def failed(path, error):
+            return _create_result(path, None, None, error)
+
+        coros = []
+        for path in paths:
+            try:
+                coros.append(send(path, self._path_payload(path)))
+            except ValueError as e:
+                coros.append(failed(path, str(e)))
+        results = await self._gather_bounded(coros, max_workers)
+        self._record_created(results)
+        return results
+
+    async def delete_paths(self, paths, force=False, max_workers=None):
+        """Delete several paths concurrently. See Network.delete_paths()."""
+        import aiohttp
+
+        async def send(path):
+            if not path.id:
+                return _delete_result(path, False, None, "Path ID is required to delete a path.")
+            url = f"{self._multiverse._BASE_URL}/trail/{path.id}"
+            try:
+                response = await self._multiverse._request("DELETE", url)
+                if force and response.status_code in (200, 204):
+                    response = await self._multiverse._request("DELETE", url)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                return _delete_result(path, False, None, str(e))
+            if response.status_code in (200, 204):
+                return _delete_result(path, True, response.status_code, None)
+            return _delete_result(path, False, response.status_code, response.text)
+
+        results = await self._gather_bounded([send(path) for path in paths], max_workers)
+        self._record_deleted(results)
+        return results
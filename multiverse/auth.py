@@ -0,0 +1,166 @@
+# multiverse/auth.py
+
+import json
+import os
+import threading
+import time
+
+CLIENT_ID = "multiverse-access"
+
+
+def default_token_cache_path():
+    """Return the default token cache file, under $XDG_CACHE_HOME or ~/.cache."""
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "multiverse", "tokens.json")
+
+
+class TokenCache:
+    """
+    On-disk cache of tokens shared between processes, so that short-lived jobs can
+    reuse a still valid token instead of logging in again. The file is created with
+    mode 0600 in a 0700 directory and replaced atomically on every update.
+
+    :param path: Cache file (default: default_token_cache_path())
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_token_cache_path()
+
+    def _read_all(self):
+        try:
+            with open(self.path, 'r') as file:
+                entries = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def load(self, key):
+        """Return the token data stored under key, or None."""
+        return self._read_all().get(key)
+
+    def save(self, key, data):
+        """Store the token data under key (None removes the entry)."""
+        entries = self._read_all()
+        if data is None:
+            entries.pop(key, None)
+        else:
+            entries[key] = data
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as file:
+            json.dump(entries, file)
+        os.replace(tmp_path, self.path)
+
+    def clear(self, key):
+        self.save(key, None)
+
+
+def _make_token_cache(token_cache):
+    """Accept None/False (no cache), True (default location), a path or a TokenCache."""
+    if not token_cache:
+        return None
+    if token_cache is True:
+        return TokenCache()
+    if isinstance(token_cache, (str, os.PathLike)):
+        return TokenCache(os.fspath(token_cache))
+    return token_cache
+
+
+class TokenManager:
+    """
+    Access and refresh tokens of one user, with their expiry times.
+
+    Holds no connection: Multiverse and AsyncMultiverse send the grants themselves
+    and pass the token endpoint responses to update(). Expiry times are wall-clock
+    times so that they stay meaningful in the on-disk cache.
+
+    :param auth_url: Token endpoint, part of the cache key
+    :param username: User name, part of the cache key
+    :param refresh_margin: Seconds before expiry at which a token is considered expired
+    :param token_cache: None, True, a path or a TokenCache (see _make_token_cache)
+    """
+
+    def __init__(self, auth_url, username, refresh_margin=30, token_cache=None):
+        self.refresh_margin = refresh_margin
+        self.lock = threading.Lock()
+        self._key = f"{username}@{auth_url}"
+        self._cache = _make_token_cache(token_cache)
+        self.access_token = None
+        self.refresh_token = None
+        self.expires_at = None
+        self.refresh_expires_at = None
+        if self._cache is not None:
+            self._load(self._cache.load(self._key) or {})
+
+    def _load(self, data):
+        self.access_token = data.get('access_token')
+        self.refresh_token = data.get('refresh_token')
+        self.expires_at = data.get('expires_at')
+        self.refresh_expires_at = data.get('refresh_expires_at')
+
+    def _save(self):
+        if self._cache is None:
+            return
+        data = {
+            'access_token': self.access_token,
+            'refresh_token': self.refresh_token,
+            'expires_at': self.expires_at,
+            'refresh_expires_at': self.refresh_expires_at,
+        }
+        try:
+            self._cache.save(self._key, data if self.access_token or self.refresh_token else None)
+        except OSError as e:
+            print(f"Failed to write token cache: {e}")
+
+    def update(self, token_response):
+        """Store the tokens of a successful token endpoint response (JSON dict)."""
+        now = time.time()
+        self.access_token = token_response['access_token']
+        # Keycloak may omit a new refresh token on refresh; keep the current one then
+        self.refresh_token = token_response.get('refresh_token', self.refresh_token)
+        expires_in = token_response.get('expires_in')
+        self.expires_at = now + expires_in if expires_in else None
+        refresh_expires_in = token_response.get('refresh_expires_in')
+        self.refresh_expires_at = now + refresh_expires_in if refresh_expires_in else None
+        self._save()
+
+    def is_valid(self):
+        """Whether the access token can still be used for at least refresh_margin seconds."""
+        if not self.access_token:
+            return False
+        return self.expires_at is None or time.time() < self.expires_at - self.refresh_margin
+
+    def can_refresh(self):
+        if not self.refresh_token:
+            return False
+        return self.refresh_expires_at is None or time.time() < self.refresh_expires_at - self.refresh_margin
+
+    def invalidate(self, access_token):
+        """Drop access_token after the server rejected it (if it is still the current one)."""
+        if access_token == self.access_token:
+            self.access_token = None
+            self.expires_at = None
+            self._save()
+
+    def clear(self):
+        self._load({})
+        self._save()
+
+    @staticmethod
+    def password_grant(username, password):
+        return {
+            "client_id": CLIENT_ID,
+            "username": username,
+            "password": password,
+            "grant_type": "password"
+        }
+
+    def refresh_grant(self):
+        return {
+            "client_id": CLIENT_ID,
+            "refresh_token": self.refresh_token,
+            "grant_type": "refresh_token"
+        }
@@ -0,0 +1,171 @@
+# multiverse/candidates.py
+
+import weakref
+
+from .ledger import full_port_name
+
+
+class CandidateSet:
+    """
+    Candidate paths of a search, kept up to date with the port occupancy.
+
+    The candidates (path information dictionaries as returned by search_paths) are
+    indexed by the (switch, port) pairs of their cross-connects. While the set is
+    attached to a PortLedger, every change of the occupancy re-evaluates only the
+    candidates using a port that was taken or released, updating their
+    is_established, is_possible and conflicting_paths entries in place.
+
+    The candidates are expected to have been evaluated against the ledger as it is
+    (as search results are); they are copied, so results shared with a SearchCache
+    are not modified.
+
+    :param candidates: Path information dictionaries (e.g. the result of search_paths)
+    :param ledger: PortLedger the candidates are checked against
+    :param attach: Follow the changes of the ledger (see detach()). The ledger only
+        holds a weak reference to the set: a set that is no longer used stops following
+        it and is garbage collected without being detached.
+    """
+
+    def __init__(self, candidates, ledger, attach=True):
+        self._candidates = [dict(candidate) for candidate in candidates]
+        self._ledger = ledger
+        self._port_index = {}     # (switch, 'SWITCH.port') -> indexes of the candidates using it
+        for idx, candidate in enumerate(self._candidates):
+            for port in _candidate_ports(candidate):
+                self._port_index.setdefault(port, []).append(idx)
+        self._listeners = []
+        self._ledger_listener = None
+        self.evaluations = 0
+        if attach:
+            self.attach(refresh=False)
+
+    @classmethod
+    def search(cls, graph, start_name, end_name, ledger, attach=True, **options):
+        """
+        Search the candidates between two nodes and follow the changes of ledger.
+
+        :param options: k and weight (see search_paths), or max_hops, max_results and
+            processes (see iter_search_paths)
+        """
+        from .utils import iter_search_paths, search_paths
+
+        if options.get('k') is not None:
+            candidates = search_paths(graph, start_name, end_name, ledger, **options)
+        else:
+            candidates = iter_search_paths(graph, start_name, end_name, ledger, **options)
+        return cls(candidates, ledger, attach)
+
+    @property
+    def ledger(self):
+        return self._ledger
+
+    def __len__(self):
+        return len(self._candidates)
+
+    def __iter__(self):
+        return iter(self._candidates)
+
+    def __getitem__(self, idx):
+        return self._candidates[idx]
+
+    def possible(self):
+        """Return the candidates that can currently be created (established or with free ports)."""
+        return [candidate for candidate in self._candidates if candidate['is_possible']]
+
+    def using_port(self, switch, port):
+        """Return the candidates with a cross-connect on a port."""
+        return [self._candidates[idx] for idx in self._port_index.get((switch, full_port_name(switch, port)), ())]
+
+    def attach(self, refresh=True):
+        """Follow the changes of the ledger, after re-evaluating every candidate against it."""
+        if self._ledger_listener is None:
+            self._ledger_listener = _weak_listener(self._ledger, self._on_ledger_change)
+            self._ledger.add_listener(self._ledger_listener)
+        if refresh:
+            self.refresh()
+
+    def detach(self):
+        """Stop following the ledger; the candidates keep their last evaluation."""
+        if self._ledger_listener is not None:
+            self._ledger.remove_listener(self._ledger_listener)
+            self._ledger_listener = None
+
+    def add_listener(self, callback):
+        """Call callback(candidate_set, changed) with the list of candidates whose feasibility changed."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self._listeners.remove(callback)
+
+    def refresh(self):
+        """Re-evaluate every candidate; return the candidates whose feasibility changed."""
+        return self._evaluate(range(len(self._candidates)))
+
+    def update(self, ports):
+        """
+        Re-evaluate the candidates using any of the given ports.
+
+        :param ports: Iterable of (switch, port) pairs that were taken or released,
+            or None for all candidates
+        :return: List of the candidates whose feasibility changed
+        """
+        if ports is None:
+            return self.refresh()
+        affected = set()
+        for switch, port in ports:
+            affected.update(self._port_index.get((switch, full_port_name(switch, port)), ()))
+        return self._evaluate(sorted(affected))
+
+    def _on_ledger_change(self, ledger, ports):
+        self.update(ports)
+
+    def _evaluate(self, indexes):
+        from .utils import _check_feasibility
+
+        changed = []
+        for idx in indexes:
+            candidate = self._candidates[idx]
+            is_established, is_possible, conflicting_paths = _check_feasibility(candidate['cross_connects'],
+                                                                               self._ledger)
+            self.evaluations += 1
+            conflicts = list(conflicting_paths) if not is_possible and conflicting_paths else None
+            previous = candidate.get('conflicting_paths')
+            if (candidate['is_established'] == is_established and candidate['is_possible'] == is_possible
+                    and (previous is None) == (conflicts is None)
+                    and (conflicts is None or set(previous) == conflicting_paths)):
+                continue
+            candidate['is_established'] = is_established
+            candidate['is_possible'] = is_possible
+            if conflicts is None:
+                candidate.pop('conflicting_paths', None)
+            else:
+                candidate['conflicting_paths'] = conflicts
+            changed.append(candidate)
+        if changed:
+            for callback in list(self._listeners):
+                callback(self, changed)
+        return changed
+
+
+def _weak_listener(ledger, method):
+    """Return a ledger listener calling a bound method, removing itself once its object is collected."""
+    method_ref = weakref.WeakMethod(method)
+
+    def listener(changed_ledger, ports):
+        method = method_ref()
+        if method is None:
+            changed_ledger.remove_listener(listener)
+        else:
+            method(changed_ledger, ports)
+
+    return listener
+
+
+def _candidate_ports(candidate):
+    """Return the (switch, 'SWITCH.port') pairs used by the cross-connects of a candidate."""
+    ports = set()
+    for cc in candidate['cross_connects']:
+        switch = cc['switch']
+        ports.add((switch, full_port_name(switch, cc['inPort'])))
+        ports.add((switch, full_port_name(switch, cc['outPort'])))
+    return ports
@@ -0,0 +1,175 @@
+# multiverse/codec.py
+
+import json
+import os
+
+# Payload schemas understood by JSONCodec.loads: the response bodies of
+# /subnet/{id}/topology, /subnet/{id}/trails and /trail/{id}/oxcs
+SCHEMAS = ('topology', 'trails', 'vxcs')
+
+
+class JSONCodec:
+    """
+    Encodes request bodies and decodes response bodies.
+
+    loads() takes an optional schema name from SCHEMAS. Codecs that support typed
+    decoding use it to validate the payload and skip the fields the client does not
+    use; the others ignore it. Either way the result is made of plain dicts and lists.
+    """
+
+    name = 'json'
+
+    def loads(self, data, schema=None):
+        return json.loads(data)
+
+    def dumps(self, obj):
+        return json.dumps(obj).encode()
+
+
+class OrjsonCodec(JSONCodec):
+    """Codec backed by orjson."""
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def loads(self, data, schema=None):
+        return self._orjson.loads(data)
+
+    def dumps(self, obj):
+        return self._orjson.dumps(obj)
+
+
+def _msgspec_schemas():
+    """
+    TypedDict schemas of the payloads (only the fields read by the client). Every field
+    may be missing or null, as the stdlib decoder accepts them.
+    """
+    from typing import List, Optional, TypedDict, Union
+
+    Id = Optional[Union[int, str]]
+
+    class Vltp(TypedDict, total=False):
+        id: Id
+        name: Optional[str]
+
+    class Node(TypedDict, total=False):
+        id: Id
+        name: Optional[str]
+        type: Optional[str]
+        vltps: Optional[List[Vltp]]
+
+    class Link(TypedDict, total=False):
+        id: Id
+        name: Optional[str]
+        srcVnodeId: Id
+        srcVltpId: Id
+        destVnodeId: Id
+        destVltpId: Id
+
+    class Topology(TypedDict, total=False):
+        nodes: Optional[List[Node]]
+        links: Optional[List[Link]]
+
+    class Vxc(TypedDict, total=False):
+        id: Id
+        label: Optional[str]
+        switchId: Id
+        ingressPortId: Id
+        egressPortId: Id
+        switch: Optional[str]
+        inPort: Optional[str]
+        outPort: Optional[str]
+
+    class Trail(TypedDict, total=False):
+        id: Id
+        name: Optional[str]
+        label: Optional[str]
+        vxcs: Optional[List[Vxc]]
+        oxcs: Optional[List[Vxc]]
+
+    return {'topology': Topology, 'trails': List[Trail], 'vxcs': List[Vxc]}
+
+
+class MsgspecCodec(JSONCodec):
+    """
+    Codec backed by msgspec, decoding the known payloads with typed schemas so that
+    unused fields are skipped instead of materialized. Payloads that do not match a
+    schema are decoded without it.
+    """
+
+    name = 'msgspec'
+
+    def __init__(self):
+        import msgspec
+        self._validation_error = msgspec.ValidationError
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+        self._typed_decoders = {
+            schema: msgspec.json.Decoder(schema_type) for schema, schema_type in _msgspec_schemas().items()
+        }
+
+    def loads(self, data, schema=None):
+        decoder = self._typed_decoders.get(schema)
+        if decoder is not None:
+            try:
+                return decoder.decode(data)
+            except self._validation_error:
+                # Unexpected field types: decode untyped, like the other codecs
+                pass
+        return self._decoder.decode(data)
+
+    def dumps(self, obj):
+        return self._encoder.encode(obj)
+
+
+_CODECS = {
+    'json': JSONCodec,
+    'orjson': OrjsonCodec,
+    'msgspec': MsgspecCodec,
+}
+
+# Preference order of the "auto" codec
+_AUTO_ORDER = ('msgspec', 'orjson', 'json')
+
+_default_codec = None
+
+
+def make_codec(name="auto"):
+    """
+    Create a codec by name: 'json' (stdlib), 'orjson', 'msgspec' or 'auto', the
+    first one installed among msgspec, orjson and the stdlib.
+    """
+    if name != "auto":
+        if name not in _CODECS:
+            raise ValueError(f"Unknown JSON codec '{name}'. Expected one of: auto, {', '.join(_CODECS)}")
+        return _CODECS[name]()
+    for candidate in _AUTO_ORDER:
+        try:
+            return _CODECS[candidate]()
+        except ImportError:
+            continue
+
+
+def get_codec(codec=None):
+    """
+    Return codec if it is a codec object, the codec of that name if it is a string,
+    and otherwise the default codec (chosen by the MVS_JSON_CODEC environment
+    variable, "auto" if unset).
+    """
+    global _default_codec
+    if codec is None:
+        if _default_codec is None:
+            _default_codec = make_codec(os.getenv("MVS_JSON_CODEC", "auto"))
+        return _default_codec
+    if isinstance(codec, str):
+        return make_codec(codec)
+    return codec
+
+
+def set_codec(codec):
+    """Set the default codec used by new clients (a codec object or name)."""
+    global _default_codec
+    _default_codec = get_codec(codec) if codec is not None else None
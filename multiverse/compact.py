@@ -0,0 +1,438 @@
+# multiverse/compact.py
+
+
+class CompactTopology:
+    """
+    Compact, array-backed representation of a topology for path computation.
+
+    Node and port names are interned to integer IDs and the adjacency is stored as
+    NumPy CSR arrays: the outgoing edges of node i are the indices
+    offsets[i] to offsets[i + 1] - 1 of targets, edge_keys, src_ports and dest_ports.
+    Edges keep the order of the equivalent MultiDiGraph (successors, then keys), so
+    path enumeration returns the same paths in the same order as compute_all_paths.
+
+    search_paths/iter_search_paths accept a CompactTopology in place of the graph:
+    the search, the cross-connect extraction and the formatting then work on edge
+    indices, and names are only looked up for the returned path information. The
+    public path API (iter_paths, extract_cross_connects, edge_data) exchanges lists
+    of (from_node, to_node, edge_key) tuples, like with the NetworkX graph.
+    """
+
+    def __init__(self, node_names, node_types, port_names, offsets, targets, edge_keys,
+                 src_ports, dest_ports, edge_names=None):
+        self.node_names = node_names
+        self.node_types = node_types
+        self.port_names = port_names
+        self.node_index = {name: idx for idx, name in enumerate(node_names)}
+        self.port_index = {name: idx for idx, name in enumerate(port_names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.edge_keys = edge_keys
+        self.src_ports = src_ports
+        self.dest_ports = dest_ports
+        self.edge_names = edge_names
+        self._reverse = None
+        self._lists = None
+
+    def __getstate__(self):
+        # Caches are rebuilt on demand; keep pickled snapshots (e.g. for worker processes) compact
+        state = self.__dict__.copy()
+        state.update(_reverse=None, _lists=None)
+        return state
+
+    @classmethod
+    def _from_adjacency(cls, node_names, node_types, port_names, adjacency, edge_names=None):
+        """
+        Build the CSR arrays from per-node lists of (target, key, src_port, dest_port)
+        tuples of integer IDs, given in edge order.
+        """
+        import numpy as np
+
+        offsets = np.zeros(len(node_names) + 1, dtype=np.int64)
+        for idx, edges in enumerate(adjacency):
+            offsets[idx + 1] = offsets[idx] + len(edges)
+        flat = [edge for edges in adjacency for edge in edges]
+        targets = np.array([edge[0] for edge in flat], dtype=np.int32)
+        edge_keys = np.array([edge[1] for edge in flat], dtype=np.int64)
+        src_ports = np.array([edge[2] for edge in flat], dtype=np.int32)
+        dest_ports = np.array([edge[3] for edge in flat], dtype=np.int32)
+        return cls(node_names, node_types, port_names, offsets, targets, edge_keys,
+                   src_ports, dest_ports, edge_names)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Build a CompactTopology from a MultiDiGraph produced by topology_to_graph.
+
+        :param graph: NetworkX MultiDiGraph
+        :return: CompactTopology
+        """
+        node_names = list(graph.nodes)
+        node_types = [graph.nodes[name].get('type', '') for name in node_names]
+        node_index = {name: idx for idx, name in enumerate(node_names)}
+        port_names = []
+        port_index = {}
+
+        def intern_port(name):
+            if name not in port_index:
+                port_index[name] = len(port_names)
+                port_names.append(name)
+            return port_index[name]
+
+        adjacency = []
+        edge_names = []
+        for node in node_names:
+            edges = []
+            for neighbor in graph.successors(node):
+                for key, edge_data in graph[node][neighbor].items():
+                    edges.append((node_index[neighbor], key,
+                                  intern_port(edge_data.get('src_port', '')),
+                                  intern_port(edge_data.get('dest_port', ''))))
+                    edge_names.append(edge_data.get('name', ''))
+            adjacency.append(edges)
+        return cls._from_adjacency(node_names, node_types, port_names, adjacency, edge_names)
+
+    @classmethod
+    def from_topology(cls, topology_dict):
+        """
+        Build a CompactTopology directly from a topology dictionary, without NetworkX.
+
+        :param topology_dict: Topology as returned by the server
+        :return: CompactTopology
+        """
+        node_names = []
+        node_types = []
+        node_index = {}
+        node_id_to_index = {}
+        port_names = []
+        port_id_to_index = {}
+        for node in topology_dict['nodes']:
+            name = node.get('name', '')
+            if name not in node_index:
+                node_index[name] = len(node_names)
+                node_names.append(name)
+                node_types.append(node.get('type', ''))
+            node_id_to_index[node['id']] = node_index[name]
+            for port in node.get('vltps', []):
+                port_id_to_index[port['id']] = len(port_names)
+                port_names.append(port.get('name', ''))
+        unknown_port = len(port_names)
+        port_names.append('')
+
+        # Group the links by source then destination node, in order of first
+        # appearance, which is the edge order of the equivalent MultiDiGraph
+        grouped = [dict() for _ in node_names]
+        for link in topology_dict.get('links', []):
+            src = node_id_to_index.get(link['srcVnodeId'])
+            dest = node_id_to_index.get(link['destVnodeId'])
+            if src is None or dest is None:
+                continue
+            edge = (dest, int(link['id']),
+                    port_id_to_index.get(link['srcVltpId'], unknown_port),
+                    port_id_to_index.get(link['destVltpId'], unknown_port),
+                    link.get('name', ''))
+            grouped[src].setdefault(dest, {})[edge[1]] = edge
+
+        adjacency = []
+        edge_names = []
+        for by_dest in grouped:
+            edges = []
+            for by_key in by_dest.values():
+                for edge in by_key.values():
+                    edges.append(edge[:4])
+                    edge_names.append(edge[4])
+            adjacency.append(edges)
+        return cls._from_adjacency(node_names, node_types, port_names, adjacency, edge_names)
+
+    def to_graph(self):
+        """
+        Convert back to a NetworkX MultiDiGraph with the attributes used by topology_to_graph.
+
+        :return: NetworkX MultiDiGraph
+        """
+        import networkx as nx
+
+        G = nx.MultiDiGraph()
+        for name, node_type in zip(self.node_names, self.node_types):
+            G.add_node(name, type=node_type)
+        offsets = self.offsets.tolist()
+        for node in range(len(self.node_names)):
+            for edge in range(offsets[node], offsets[node + 1]):
+                G.add_edge(
+                    self.node_names[node],
+                    self.node_names[int(self.targets[edge])],
+                    key=int(self.edge_keys[edge]),
+                    name=self.edge_names[edge] if self.edge_names else '',
+                    src_port=self.port_names[int(self.src_ports[edge])],
+                    dest_port=self.port_names[int(self.dest_ports[edge])],
+                )
+        return G
+
+    @property
+    def number_of_nodes(self):
+        return len(self.node_names)
+
+    @property
+    def number_of_edges(self):
+        return len(self.targets)
+
+    @property
+    def nbytes(self):
+        """Memory used by the adjacency arrays, in bytes."""
+        return sum(array.nbytes for array in (self.offsets, self.targets, self.edge_keys,
+                                              self.src_ports, self.dest_ports))
+
+    def __contains__(self, node_name):
+        return node_name in self.node_index
+
+    def _reverse_adjacency(self):
+        """
+        Return the reverse adjacency in CSR form as lists (offsets, sources, edge indices):
+        the edges into node i are edge indices offsets[i] to offsets[i + 1] - 1.
+        """
+        import numpy as np
+
+        if self._reverse is None:
+            sources = np.repeat(np.arange(len(self.node_names), dtype=np.int32), np.diff(self.offsets))
+            order = np.argsort(self.targets, kind='stable')
+            reverse_offsets = np.searchsorted(self.targets[order], np.arange(len(self.node_names) + 1))
+            self._reverse = (reverse_offsets.tolist(), sources[order].tolist(), order.tolist())
+        return self._reverse
+
+    def nodes_reaching(self, target_name):
+        """Return the set of node names from which target_name can be reached (including it)."""
+        if target_name not in self.node_index:
+            return set()
+        reverse_offsets, reverse_sources, _ = self._reverse_adjacency()
+        target = self.node_index[target_name]
+        seen = bytearray(len(self.node_names))
+        seen[target] = 1
+        stack = [target]
+        while stack:
+            node = stack.pop()
+            for source in reverse_sources[reverse_offsets[node]:reverse_offsets[node + 1]]:
+                if not seen[source]:
+                    seen[source] = 1
+                    stack.append(source)
+        return {self.node_names[idx] for idx in range(len(self.node_names)) if seen[idx]}
+
+    def _distances_to(self, end, start, end_port_id=None):
+        """
+        Return the number of hops from every node to end (-1 if it cannot reach it), as
+        utils._distances_to_end: the last hop must arrive on end_port_id if given and
+        start is not expanded.
+        """
+        from collections import deque
+
+        reverse_offsets, reverse_sources, reverse_edges = self._reverse_adjacency()
+        dest_ports = self.dest_ports
+        distances = [-1] * len(self.node_names)
+        distances[end] = 0
+        queue = deque()
+        for idx in range(reverse_offsets[end], reverse_offsets[end + 1]):
+            source = reverse_sources[idx]
+            if distances[source] < 0 and (end_port_id is None or dest_ports[reverse_edges[idx]] == end_port_id):
+                distances[source] = 1
+                queue.append(source)
+        while queue:
+            node = queue.popleft()
+            if node == start:
+                continue
+            for source in reverse_sources[reverse_offsets[node]:reverse_offsets[node + 1]]:
+                if distances[source] < 0:
+                    distances[source] = distances[node] + 1
+                    queue.append(source)
+        return distances
+
+    def _edge_index(self, edge):
+        """Return the index of an edge (from_node, to_node, edge_key) in the arrays."""
+        offsets, targets, keys, _, _ = self._edge_lists()
+        u, v, key = edge
+        u_idx = self.node_index[u]
+        v_idx = self.node_index[v]
+        # Scan the outgoing edges of u: no per-edge dict, and degrees are small
+        for idx in range(offsets[u_idx], offsets[u_idx + 1]):
+            if targets[idx] == v_idx and keys[idx] == key:
+                return idx
+        raise KeyError(edge)
+
+    def edge_data(self, edge):
+        """Return the attributes of an edge (from_node, to_node, edge_key) as in the NetworkX graph."""
+        idx = self._edge_index(edge)
+        return {
+            'name': self.edge_names[idx] if self.edge_names else '',
+            'src_port': self.port_names[int(self.src_ports[idx])],
+            'dest_port': self.port_names[int(self.dest_ports[idx])],
+        }
+
+    def _edge_lists(self):
+        """Return cached plain-list copies of the adjacency arrays, much faster than NumPy scalars per element."""
+        if self._lists is None:
+            self._lists = (self.offsets.tolist(), self.targets.tolist(), self.edge_keys.tolist(),
+                           self.src_ports.tolist(), self.dest_ports.tolist())
+        return self._lists
+
+    def search_setup(self, start_name, end_name, start_port=None, end_port=None):
+        """
+        Resolve the names of a search between two different nodes to IDs.
+
+        :return: Tuple (start, end, start_port_id, end_port_id, distances) for walk(),
+            or None if no path can exist
+        """
+        if start_name not in self.node_index:
+            raise KeyError(f"Node '{start_name}' not in topology.")
+        if end_name not in self.node_index:
+            return None
+        start = self.node_index[start_name]
+        end = self.node_index[end_name]
+        # Unknown ports can never match (-1 is not a port ID)
+        start_port_id = self.port_index.get(start_port, -1) if start_port else None
+        end_port_id = self.port_index.get(end_port, -1) if end_port else None
+        distances = self._distances_to(end, start, end_port_id)
+        if distances[start] < 0:
+            return None
+        return start, end, start_port_id, end_port_id, distances
+
+    def edge_ports(self, edge):
+        """Return the (src_port, dest_port) names of an edge index."""
+        _, _, _, src_ports, dest_ports = self._edge_lists()
+        return self.port_names[src_ports[edge]], self.port_names[dest_ports[edge]]
+
+    def path_nodes(self, start, edges):
+        """Return the node names of a path from start given as edge indices."""
+        targets = self._edge_lists()[1]
+        names = self.node_names
+        return [names[start]] + [names[targets[edge]] for edge in edges]
+
+    def edge_cross_connects(self, edges):
+        """Extracts the cross-connects of a path given as edge indices, as utils.extract_cross_connects."""
+        _, targets, _, src_ports, dest_ports = self._edge_lists()
+        names = self.node_names
+        port_names = self.port_names
+        return [{'switch': names[targets[edge_in]],
+                 'inPort': port_names[dest_ports[edge_in]],
+                 'outPort': port_names[src_ports[edge_out]]}
+                for edge_in, edge_out in zip(edges, edges[1:])]
+
+    def edge_tuples(self, start, edges):
+        """Convert a path from start given as edge indices to (from_node, to_node, edge_key) tuples."""
+        _, targets, keys, _, _ = self._edge_lists()
+        names = self.node_names
+        path = []
+        node = start
+        for edge in edges:
+            neighbor = targets[edge]
+            path.append((names[node], names[neighbor], keys[edge]))
+            node = neighbor
+        return path
+
+    def iter_paths(self, start_name, end_name, start_port=None, end_port=None, max_hops=None, deadline=None):
+        """
+        Generates all simple paths between two nodes with an iterative depth-first
+        search over the arrays, skipping neighbors that cannot reach end_name (within
+        max_hops). Same parameters and results as utils.iter_all_paths.
+        """
+        start = self.node_index.get(start_name)
+        for edges in self.iter_edge_paths(start_name, end_name, start_port, end_port, max_hops, deadline):
+            yield self.edge_tuples(start, edges)
+
+    def iter_edge_paths(self, start_name, end_name, start_port=None, end_port=None, max_hops=None, deadline=None):
+        """As iter_paths(), yielding the paths as lists of edge indices."""
+        if start_name == end_name and start_name in self.node_index:
+            if not end_port:
+                yield []
+            return
+        setup = self.search_setup(start_name, end_name, start_port, end_port)
+        if setup is None:
+            return
+        for _, edges in self.walk(*setup, max_hops=max_hops, deadline=deadline):
+            yield edges
+
+    def walk(self, start, end, start_port_id, end_port_id, distances, max_hops=None, deadline=None,
+             prefix=(), split_depth=None):
+        """
+        Depth-first search from start to end over edge indices (see search_setup() for
+        the arguments), yielding (complete, edges) tuples in search order.
+
+        complete paths end at end. With split_depth, the partial paths of split_depth
+        edges are yielded with complete False instead of being explored, so their
+        subtrees can be searched separately by passing them as prefix: the search
+        then only explores the paths that start with these edges.
+        """
+        import time
+
+        offsets, targets, _, src_ports, dest_ports = self._edge_lists()
+        # Outgoing edges worth following from each node, as (neighbor, edge, index of the
+        # first edge to the next neighbor), so a visited neighbor is skipped in one step
+        out_edges = {}
+
+        def edges_from(node):
+            edges = out_edges.get(node)
+            if edges is None:
+                edges = []
+                group = 0
+                for edge in range(offsets[node], offsets[node + 1]):
+                    neighbor = targets[edge]
+                    if distances[neighbor] < 0 or neighbor == start:
+                        continue
+                    if node == start and start_port_id is not None and src_ports[edge] != start_port_id:
+                        continue
+                    if neighbor == end and end_port_id is not None and dest_ports[edge] != end_port_id:
+                        continue
+                    if edges and edges[-1][0] != neighbor:
+                        # The edges to a neighbor are contiguous in the arrays
+                        for item in edges[group:]:
+                            item[2] = len(edges)
+                        group = len(edges)
+                    edges.append([neighbor, edge, None])
+                for item in edges[group:]:
+                    item[2] = len(edges)
+                out_edges[node] = edges
+            return edges
+
+        visited = bytearray(len(self.node_names))
+        visited[start] = 1
+        path = list(prefix)           # edges of the current partial path
+        node = start
+        for edge in prefix:
+            node = targets[edge]
+            visited[node] = 1
+        base = len(path)
+        nodes = [node]                # nodes of the current partial path, from the end of prefix
+        edge_lists = [edges_from(node)]
+        positions = [0]               # next edge to try from each node
+        steps = 0
+        while nodes:
+            edges = edge_lists[-1]
+            position = positions[-1]
+            if position >= len(edges):
+                visited[nodes.pop()] = 0
+                edge_lists.pop()
+                positions.pop()
+                if len(path) > base:
+                    path.pop()
+                continue
+            if deadline is not None:
+                steps += 1
+                if steps % 1024 == 0 and time.monotonic() > deadline:
+                    return
+            neighbor, edge, next_neighbor = edges[position]
+            if visited[neighbor] or (max_hops is not None and len(path) + 1 + distances[neighbor] > max_hops):
+                positions[-1] = next_neighbor
+                continue
+            positions[-1] = position + 1
+            if neighbor == end:
+                yield True, path + [edge]
+                continue
+            if split_depth is not None and len(path) + 1 >= split_depth:
+                yield False, path + [edge]
+                continue
+            visited[neighbor] = 1
+            path.append(edge)
+            nodes.append(neighbor)
+            edge_lists.append(edges_from(neighbor))
+            positions.append(0)
+
+    def extract_cross_connects(self, path_edges):
+        """Extracts the cross-connects of a path of edges, as utils.extract_cross_connects."""
+        return self.edge_cross_connects([self._edge_index(edge) for edge in path_edges])
@@ -0,0 +1,208 @@
+# multiverse/disjoint.py
+
+import heapq
+
+from .compact import CompactTopology
+from .utils import _edge_weight_function, _iter_paths_info, _parse_endpoint, _port_occupancy
+
+DISJOINT_MODES = ('node', 'link')
+
+
+class _FlowGraph:
+    """Residual graph of unit-capacity arcs; arc i and i ^ 1 are the forward and reverse arcs of a pair."""
+
+    def __init__(self):
+        self.adjacency = []
+        self.heads = []
+        self.capacities = []
+        self.costs = []
+        self.labels = []
+
+    def add_node(self):
+        self.adjacency.append([])
+        return len(self.adjacency) - 1
+
+    def add_arc(self, tail, head, cost, label=None):
+        for src, dest, capacity, arc_cost in ((tail, head, 1, cost), (head, tail, 0, -cost)):
+            self.adjacency[src].append(len(self.heads))
+            self.heads.append(dest)
+            self.capacities.append(capacity)
+            self.costs.append(arc_cost)
+            self.labels.append(label)
+
+    def shortest_path(self, source, target, potentials):
+        """
+        Dijkstra over the residual arcs with reduced costs (costs + potentials, all
+        non-negative); updates the potentials and returns the arcs of the path, or None.
+        """
+        inf = float('inf')
+        distances = [inf] * len(self.adjacency)
+        previous = [-1] * len(self.adjacency)
+        distances[source] = 0
+        heap = [(0, source)]
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance > distances[node]:
+                continue
+            for arc in self.adjacency[node]:
+                if not self.capacities[arc]:
+                    continue
+                head = self.heads[arc]
+                new_distance = distance + self.costs[arc] + potentials[node] - potentials[head]
+                if new_distance < distances[head]:
+                    distances[head] = new_distance
+                    previous[head] = arc
+                    heapq.heappush(heap, (new_distance, head))
+        if distances[target] == inf:
+            return None
+        for node, distance in enumerate(distances):
+            if distance < inf:
+                potentials[node] += distance
+        arcs = []
+        node = target
+        while node != source:
+            arc = previous[node]
+            arcs.append(arc)
+            node = self.heads[arc ^ 1]
+        return arcs[::-1]
+
+    def augment(self, arcs):
+        for arc in arcs:
+            self.capacities[arc] -= 1
+            self.capacities[arc ^ 1] += 1
+
+
+def _edge_usable(start_name, end_name, start_port, end_port, ledger, u, v, edge_data):
+    """Whether a path leg can use an edge: port constraints at the ends, free ports at the switches."""
+    if v == start_name or u == end_name:
+        return False
+    if u == start_name:
+        if start_port and edge_data['src_port'] != start_port:
+            return False
+    elif ledger.is_port_used(u, edge_data['src_port']):
+        return False
+    if v == end_name:
+        if end_port and edge_data['dest_port'] != end_port:
+            return False
+    elif ledger.is_port_used(v, edge_data['dest_port']):
+        return False
+    return True
+
+
+def compute_disjoint_paths(graph, start_name, end_name, start_port=None, end_port=None, paths_data=(),
+                           disjoint='node', weight=None):
+    """
+    Computes a pair of disjoint paths between two nodes with the smallest total weight
+    (Suurballe's algorithm: two successive shortest paths in the residual graph, with
+    the intermediate nodes split in two for node-disjoint paths).
+
+    Both paths leave start_port and arrive on end_port when given. Edges on ports used
+    by the established paths are skipped, so both paths can be created.
+
+    Parameters:
+    - graph: The NetworkX graph, or a CompactTopology.
+    - start_name: The name of the starting node.
+    - end_name: The name of the ending node.
+    - start_port: Optional, the source port name (e.g., 'SOURCE.1').
+    - end_port: Optional, the destination port name (e.g., 'DETECTOR.1').
+    - paths_data: The established Path objects, or a PortLedger of them.
+    - disjoint: 'node' for paths without common links and intermediate nodes, 'link'
+      for paths only without common links.
+    - weight: Optional, the edge attribute holding the edge weight (non-negative), or a
+      function (from_node, to_node, edge_key, edge_data) returning it. Defaults to the hop count.
+
+    Returns:
+    tuple: The two paths (lists of edges (from_node, to_node, edge_key)), the lighter
+    first, or None if the nodes are not connected by two disjoint paths.
+    """
+    if disjoint not in DISJOINT_MODES:
+        raise ValueError(f"Unknown disjoint mode '{disjoint}'. Expected one of: {', '.join(DISJOINT_MODES)}")
+    if isinstance(graph, CompactTopology):
+        graph = graph.to_graph()
+    if start_name == end_name or start_name not in graph or end_name not in graph:
+        return None
+    ledger = _port_occupancy(paths_data)
+    weight_fn = _edge_weight_function(weight)
+
+    # Flow nodes: (entry, exit) of every graph node, the same node unless it is split
+    flow = _FlowGraph()
+    terminals = {}
+    for node in graph.nodes:
+        entry = flow.add_node()
+        if disjoint == 'node' and node != start_name and node != end_name:
+            exit_ = flow.add_node()
+            flow.add_arc(entry, exit_, 0)
+        else:
+            exit_ = entry
+        terminals[node] = (entry, exit_)
+    for u, v, key, edge_data in graph.edges(keys=True, data=True):
+        if _edge_usable(start_name, end_name, start_port, end_port, ledger, u, v, edge_data):
+            flow.add_arc(terminals[u][1], terminals[v][0], weight_fn(u, v, key, edge_data), (u, v, key))
+
+    source = terminals[start_name][1]
+    target = terminals[end_name][0]
+    potentials = [0] * len(flow.adjacency)
+    for _ in range(2):
+        arcs = flow.shortest_path(source, target, potentials)
+        if arcs is None:
+            return None
+        flow.augment(arcs)
+
+    # Edges carrying flow (the saturated forward arcs), by tail node
+    successors = {}
+    for arc in range(0, len(flow.heads), 2):
+        label = flow.labels[arc]
+        if label is not None and not flow.capacities[arc]:
+            successors.setdefault(label[0], []).append(label)
+
+    paths = []
+    for _ in range(2):
+        path = []
+        positions = {start_name: 0}    # node -> length of the path when reaching it
+        node = start_name
+        while node != end_name:
+            edge = successors[node].pop()
+            node = edge[1]
+            if node in positions:
+                # Drop a zero-weight cycle of the flow
+                del path[positions[node]:]
+                positions = {start_name: 0}
+                positions.update((path_edge[1], idx + 1) for idx, path_edge in enumerate(path))
+                continue
+            path.append(edge)
+            positions[node] = len(path)
+        paths.append(path)
+
+    def path_weight(path):
+        return sum(weight_fn(u, v, key, graph[u][v][key]) for u, v, key in path)
+
+    paths.sort(key=path_weight)
+    return tuple(paths)
+
+
+def search_disjoint_paths(graph, start_name, end_name, paths_data, disjoint='node', weight=None):
+    """
+    Finds a primary and a backup path between two nodes that do not share links
+    (and intermediate nodes with disjoint='node'), using free ports only.
+
+    Parameters:
+    - graph: The NetworkX graph, or a CompactTopology.
+    - start_name: The starting node, with an optional port (e.g., 'SOURCE' or 'SOURCE.1').
+    - end_name: The ending node, with an optional port (e.g., 'DETECTOR' or 'DETECTOR.1').
+    - paths_data: The established Path objects, or a PortLedger of them.
+    - disjoint: 'node' or 'link' (see compute_disjoint_paths).
+    - weight: Optional, the edge attribute or function used as edge weight instead of the hop count.
+
+    Returns:
+    tuple: The primary and backup path information, in the format of the items returned
+    by search_paths (ready for Path.from_computed_path), or None if no disjoint pair exists.
+    """
+    start_name, start_port = _parse_endpoint(start_name)
+    end_name, end_port = _parse_endpoint(end_name)
+    if isinstance(graph, CompactTopology):
+        graph = graph.to_graph()
+    ledger = _port_occupancy(paths_data)
+    pair = compute_disjoint_paths(graph, start_name, end_name, start_port, end_port, ledger, disjoint, weight)
+    if pair is None:
+        return None
+    return tuple(_iter_paths_info(graph, start_name, end_name, pair, ledger))
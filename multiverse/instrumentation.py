@@ -0,0 +1,232 @@
+# multiverse/instrumentation.py
+
+import re
+import threading
+from urllib.parse import urlsplit
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_template(url):
+    """Return the templated path of a URL, e.g. '/api/topology/trail/{id}/oxcs'."""
+    return _ID_SEGMENT.sub("/{id}", urlsplit(url).path)
+
+
+class EndpointStats:
+    """Counters of the requests sent to one (method, templated path) endpoint."""
+
+    def __init__(self):
+        self.count = 0
+        self.retries = 0
+        self.status_codes = {}
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)   # last bucket is +Inf
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    def record(self, status_code, latency, request_bytes, response_bytes):
+        self.count += 1
+        self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+        self.latency_sum += latency
+        self.latency_max = max(self.latency_max, latency)
+        for idx, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                self.latency_buckets[idx] += 1
+                break
+        else:
+            self.latency_buckets[-1] += 1
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'retries': self.retries,
+            'status_codes': dict(self.status_codes),
+            'latency_sum': self.latency_sum,
+            'latency_mean': self.latency_sum / self.count if self.count else 0.0,
+            'latency_max': self.latency_max,
+            'latency_buckets': dict(zip([*LATENCY_BUCKETS, float('inf')], self.latency_buckets)),
+            'request_bytes': self.request_bytes,
+            'response_bytes': self.response_bytes,
+        }
+
+
+class SessionStats:
+    """
+    In-process statistics of the HTTP traffic of a Multiverse session, per endpoint:
+    latency histogram, byte counts, status codes and retries.
+
+    Multiverse registers response_hook on its requests session; AsyncMultiverse records
+    its requests directly. Listeners added with add_listener receive every record, which
+    is how exporters such as OpenTelemetryExporter are fed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self._listeners = []
+
+    def _endpoint(self, method, template):
+        key = (method, template)
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints[key] = EndpointStats()
+        return stats
+
+    def record(self, method, url, status_code, latency, request_bytes=0, response_bytes=0):
+        """
+        Record one request.
+
+        :param method: HTTP method
+        :param url: Request URL, templated with endpoint_template()
+        :param status_code: Response status code
+        :param latency: Time until the response was received, in seconds
+        :param request_bytes: Size of the request body
+        :param response_bytes: Size of the response body
+        """
+        template = endpoint_template(url)
+        with self._lock:
+            self._endpoint(method, template).record(status_code, latency, request_bytes, response_bytes)
+        for listener in list(self._listeners):
+            listener(method, template, status_code, latency, request_bytes, response_bytes)
+
+    def record_retry(self, method, url):
+        """Record that a request to an endpoint is being sent again."""
+        with self._lock:
+            self._endpoint(method, endpoint_template(url)).retries += 1
+
+    def response_hook(self, response, *args, **kwargs):
+        """
+        requests response hook recording the request of a response. The latency is
+        response.elapsed, the time until the response headers were parsed.
+        """
+        request = response.request
+        body = request.body or b""
+        if kwargs.get('stream'):
+            # Do not consume streamed bodies; rely on the announced size
+            response_bytes = int(response.headers.get('Content-Length') or 0)
+        else:
+            response_bytes = len(response.content or b"")
+        self.record(request.method, request.url, response.status_code, response.elapsed.total_seconds(),
+                    len(body), response_bytes)
+
+    def add_listener(self, callback):
+        """Call callback(method, template, status_code, latency, request_bytes, response_bytes) for every request."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self._listeners.remove(callback)
+
+    def snapshot(self):
+        """
+        Return the statistics collected so far.
+
+        :return: Dict mapping (method, templated path) to a dict of counters
+        """
+        with self._lock:
+            return {key: stats.to_dict() for key, stats in self._endpoints.items()}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def to_prometheus(self, prefix="multiverse_client"):
+        """Return the statistics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_request_duration_seconds Latency of the requests to the Multiverse backend.",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        for (method, template), stats in sorted(snapshot.items()):
+            labels = f'method="{method}",endpoint="{template}"'
+            cumulative = 0
+            for bound, count in stats['latency_buckets'].items():
+                cumulative += count
+                le = "+Inf" if bound == float('inf') else repr(bound)
+                lines.append(f'{prefix}_request_duration_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{prefix}_request_duration_seconds_sum{{{labels}}} {stats['latency_sum']}")
+            lines.append(f"{prefix}_request_duration_seconds_count{{{labels}}} {stats['count']}")
+        counters = [
+            ('requests_total', "Requests by status code.", None),
+            ('request_bytes_total', "Bytes sent in request bodies.", 'request_bytes'),
+            ('response_bytes_total', "Bytes received in response bodies.", 'response_bytes'),
+            ('retries_total', "Requests sent again.", 'retries'),
+        ]
+        for name, help_text, field in counters:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for (method, template), stats in sorted(snapshot.items()):
+                labels = f'method="{method}",endpoint="{template}"'
+                if field is None:
+                    for status_code, count in sorted(stats['status_codes'].items()):
+                        lines.append(f'{prefix}_{name}{{{labels},status="{status_code}"}} {count}')
+                else:
+                    lines.append(f"{prefix}_{name}{{{labels}}} {stats[field]}")
+        return "\n".join(lines) + "\n"
+
+
+def serve_prometheus(stats, port=9464, host="0.0.0.0"):
+    """
+    Serve stats.to_prometheus() on http://host:port/metrics from a background thread.
+
+    :return: The HTTP server; call shutdown() on it to stop serving
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = stats.to_prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class OpenTelemetryExporter:
+    """
+    Forward the records of a SessionStats to OpenTelemetry metrics
+    (requires the opentelemetry-api package).
+
+    :param stats: SessionStats to export
+    :param meter: OpenTelemetry meter; the global meter provider's is used by default
+    """
+
+    def __init__(self, stats, meter=None):
+        from opentelemetry import metrics
+
+        meter = meter or metrics.get_meter("multiverse.client")
+        self._duration = meter.create_histogram(
+            "multiverse.client.request.duration", unit="s",
+            description="Latency of the requests to the Multiverse backend.")
+        self._request_bytes = meter.create_counter(
+            "multiverse.client.request.size", unit="By", description="Bytes sent in request bodies.")
+        self._response_bytes = meter.create_counter(
+            "multiverse.client.response.size", unit="By", description="Bytes received in response bodies.")
+        self._stats = stats
+        stats.add_listener(self._export)
+
+    def _export(self, method, template, status_code, latency, request_bytes, response_bytes):
+        attributes = {'http.request.method': method, 'url.template': template,
+                      'http.response.status_code': status_code}
+        self._duration.record(latency, attributes)
+        self._request_bytes.add(request_bytes, attributes)
+        self._response_bytes.add(response_bytes, attributes)
+
+    def close(self):
+        self._stats.remove_listener(self._export)
@@ -0,0 +1,162 @@
+# multiverse/ledger.py
+
+
+def full_port_name(switch, port):
+    """Return the 'SWITCH.port' name of a port given either as 'SWITCH.port' or as a bare port."""
+    prefix = f"{switch}."
+    if port.startswith(prefix):
+        return port
+    return prefix + port
+
+
+def _resolved_port(switch, port):
+    """Return the 'SWITCH.port' name of a cross-connect port, or None if its switch or port is unknown."""
+    if not switch or not port:
+        return None
+    return full_port_name(switch, port)
+
+
+def _sequence_ports(seq):
+    """Return the set of (switch, port) keys used by a cross-connect sequence, without the unresolved ones."""
+    return {(switch, port) for switch, in_port, out_port in seq for port in (in_port, out_port) if port is not None}
+
+
+class PortLedger:
+    """
+    Port occupancy of the established paths of a network.
+
+    Indexes which paths use each (switch, port) and hashes the established
+    cross-connect sequences. It is updated incrementally when paths are added
+    or removed, so a path search does not need to walk every established path.
+    Ports are stored with their 'SWITCH.port' names, the form used by the graph.
+
+    Cross-connects whose switch or port could not be resolved to a name (e.g. a
+    port missing from a stale topology) do not occupy any port; the paths having
+    some are listed by unresolved_paths.
+    """
+
+    def __init__(self, paths=()):
+        self._paths = {}          # path key -> (path name, cross-connect sequence)
+        self._used_ports = {}     # (switch, port) -> {path key: path name}
+        self._established = {}    # cross-connect sequence -> number of paths
+        self._unresolved = {}     # path key -> path name, for paths with unresolved ports
+        self._version = 0
+        self._listeners = []
+        for path in paths:
+            self.add_path(path)
+
+    @property
+    def version(self):
+        """Counter increased on every change of the occupancy."""
+        return self._version
+
+    @property
+    def unresolved_paths(self):
+        """Names of the paths with cross-connect ports that could not be resolved."""
+        return list(self._unresolved.values())
+
+    def __len__(self):
+        return len(self._paths)
+
+    def __getstate__(self):
+        # Listeners are bound to this process (e.g. a network and its caches)
+        state = self.__dict__.copy()
+        state['_listeners'] = []
+        return state
+
+    def add_listener(self, callback):
+        """
+        Call callback(ledger, ports) after every change of the occupancy.
+
+        ports is the set of (switch, 'SWITCH.port') keys whose users changed, or None
+        when the whole ledger was replaced by reset().
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        self._listeners.remove(callback)
+
+    def _notify(self, ports):
+        for callback in list(self._listeners):
+            callback(self, ports)
+
+    @staticmethod
+    def _path_key(path):
+        return path.id if path.id else id(path)
+
+    def add_path(self, path):
+        """
+        Add the cross-connects of an established path to the ledger.
+
+        :param path: Path object; adding a path already in the ledger replaces it
+        """
+        key = self._path_key(path)
+        if key in self._paths:
+            self.remove_path(path)
+        seq = tuple(
+            (oxc.switch, _resolved_port(oxc.switch, oxc.inPort), _resolved_port(oxc.switch, oxc.outPort))
+            for oxc in path.oxcs
+        )
+        self._paths[key] = (path.name, seq)
+        self._established[seq] = self._established.get(seq, 0) + 1
+        ports = _sequence_ports(seq)
+        for port_key in ports:
+            self._used_ports.setdefault(port_key, {})[key] = path.name
+        if any(in_port is None or out_port is None for _, in_port, out_port in seq):
+            self._unresolved[key] = path.name
+        self._version += 1
+        self._notify(ports)
+
+    def remove_path(self, path):
+        """
+        Release the ports of a path.
+
+        :param path: Path object
+        :return: True if the path was in the ledger
+        """
+        key = self._path_key(path)
+        entry = self._paths.pop(key, None)
+        if entry is None:
+            return False
+        _, seq = entry
+        count = self._established[seq] - 1
+        if count:
+            self._established[seq] = count
+        else:
+            del self._established[seq]
+        ports = _sequence_ports(seq)
+        for port_key in ports:
+            users = self._used_ports.get(port_key)
+            if users is not None:
+                users.pop(key, None)
+                if not users:
+                    del self._used_ports[port_key]
+        self._unresolved.pop(key, None)
+        self._version += 1
+        self._notify(ports)
+        return True
+
+    def reset(self, paths=()):
+        """
+        Replace the content of the ledger with the given established paths.
+
+        The new indexes are built aside and swapped in, so that readers of other
+        threads see either the old or the new occupancy, never an empty one.
+        """
+        staged = PortLedger(paths)
+        self._paths, self._used_ports, self._established, self._unresolved = (
+            staged._paths, staged._used_ports, staged._established, staged._unresolved)
+        self._version += 1
+        self._notify(None)
+
+    def is_established(self, cross_connects_seq):
+        """Return True if a sequence of (switch, inPort, outPort) tuples matches an established path."""
+        return tuple(cross_connects_seq) in self._established
+
+    def port_users(self, switch, port):
+        """Return the names of the paths using a port (empty if the port is free)."""
+        users = self._used_ports.get((switch, full_port_name(switch, port)))
+        return set(users.values()) if users else set()
+
+    def is_port_used(self, switch, port):
+        return (switch, full_port_name(switch, port)) in self._used_ports
@@ -0,0 +1,358 @@
+# multiverse/mock_server.py
+
+"""
+Lightweight local stand-in for the Multiverse backend.
+
+Serves the topology REST API and the Keycloak token endpoint used by the client,
+with configurable latency, error injection and synthetic networks of any size,
+so that Multiverse/Network can be exercised and benchmarked without the real
+backend:
+
+    with MockMultiverseServer(latency=0.001) as server:
+        server.add_synthetic_network("bench", num_switches=8, num_trails=1000)
+        mvs = Multiverse(server_ip=server.host, api_port=server.api_port, auth_port=server.auth_port)
+"""
+
+import json
+import random
+import re
+import secrets
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from .synthetic import ring_topology
+
+API_PREFIX = "/api/topology"
+TOKEN_PATH = "/realms/multiverse/protocol/openid-connect/token"
+
+
+class _Network:
+    """State of one network of the mock server."""
+
+    def __init__(self, network_id, name, topology, upload):
+        self.id = network_id
+        self.name = name
+        self.topology = topology
+        self.upload = upload
+        self.trails = {}
+        self.version = 1
+
+
+class MockMultiverseServer:
+    """
+    In-process mock of the Multiverse topology API and token endpoint.
+
+    :param host: Interface to listen on
+    :param api_port: Port of the topology API (0 picks a free port)
+    :param auth_port: Port of the token endpoint (0 picks a free port)
+    :param latency: Delay added to every request, in seconds
+    :param error_rate: Probability of answering an API request with error_status
+    :param error_status: Status code of the injected errors
+    :param token_lifetime: Lifetime of the issued access tokens, in seconds
+    :param seed: Seed of the random generator used for error injection and synthetic data
+    """
+
+    def __init__(self, host="127.0.0.1", api_port=0, auth_port=0, latency=0.0, error_rate=0.0,
+                 error_status=503, token_lifetime=300, seed=None):
+        self.host = host
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.token_lifetime = token_lifetime
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._networks = {}
+        self._tokens = {}          # access token -> expiry time
+        self._refresh_tokens = set()
+        self._next_id = 1
+        self._deleted_trails = set()
+        self.request_counts = {}   # (method, templated path) -> number of requests
+        self._api_server = ThreadingHTTPServer((host, api_port), self._handler(self._handle_api))
+        self._auth_server = ThreadingHTTPServer((host, auth_port), self._handler(self._handle_auth))
+        self._api_server.daemon_threads = True
+        self._auth_server.daemon_threads = True
+        self._threads = []
+
+    @property
+    def api_port(self):
+        return self._api_server.server_address[1]
+
+    @property
+    def auth_port(self):
+        return self._auth_server.server_address[1]
+
+    def start(self):
+        """Serve both endpoints from background threads."""
+        for server in (self._api_server, self._auth_server):
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        for server in (self._api_server, self._auth_server):
+            server.shutdown()
+            server.server_close()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _new_id(self):
+        with self._lock:
+            new_id = self._next_id
+            self._next_id += 1
+            return new_id
+
+    # ----- Data -----
+
+    def add_network(self, name, topology, trails=(), upload=None):
+        """
+        Add a network in server format.
+
+        :param name: Network name
+        :param topology: Topology dict with 'nodes' (id, name, type, vltps) and 'links'
+        :param trails: Trail dicts, with their cross-connects in 'vxcs' (switchId, ingressPortId, egressPortId)
+        :param upload: Optional content returned by the download endpoint
+        :return: ID of the network
+        """
+        network = _Network(self._new_id(), name, topology, upload)
+        for trail in trails:
+            trail = dict(trail)
+            trail['id'] = self._new_id()
+            trail['vsubnetId'] = network.id
+            network.trails[trail['id']] = trail
+        with self._lock:
+            self._networks[network.id] = network
+        return network.id
+
+    def add_synthetic_network(self, name, num_switches=8, ports_per_switch=32, num_trails=0, topology=None):
+        """
+        Add a synthetic network with num_trails single cross-connect trails.
+
+        :param topology: Topology in server format, e.g. from multiverse.synthetic; a ring of
+            num_switches switches with ports_per_switch ports by default
+        :return: ID of the network
+        """
+        if topology is None:
+            topology = ring_topology(num_switches, ports_per_switch)
+        switches = [node for node in topology['nodes'] if node['type'] == 'SWITCH']
+        trails = []
+        for idx in range(num_trails):
+            switch = switches[idx % len(switches)]
+            ports = switch['vltps']
+            ingress = ports[(idx // len(switches)) % len(ports)]
+            egress = ports[(idx // len(switches) + 1) % len(ports)]
+            trails.append({
+                'name': f"TRAIL_{idx}",
+                'label': f"SYNTHETIC_{idx}",
+                'description': "",
+                'status': "PENDING",
+                'vxcs': [{
+                    'name': "",
+                    'label': f"{switch['name']}_OXC_{idx}",
+                    'description': "",
+                    'switchId': switch['id'],
+                    'ingressPortId': ingress['id'],
+                    'egressPortId': egress['id'],
+                }],
+            })
+        return self.add_network(name, topology, trails)
+
+    def _link(self, ports_by_name, src_port, dest_port):
+        src_node_id, src_port_id = ports_by_name[src_port]
+        dest_node_id, dest_port_id = ports_by_name[dest_port]
+        return {
+            'id': self._new_id(),
+            'name': f"{src_port}_{dest_port}",
+            'srcVnodeId': src_node_id,
+            'srcVltpId': src_port_id,
+            'destVnodeId': dest_node_id,
+            'destVltpId': dest_port_id,
+        }
+
+    def _from_upload(self, upload):
+        """Convert the upload format (nodes, capabilities, links, paths) to server topology and trails."""
+        nodes = []
+        ports_by_name = {}
+        for item in upload.get('nodes', []) + upload.get('capabilities', []):
+            node = {'id': self._new_id(), 'name': item['name'], 'type': item.get('type', 'SWITCH'), 'vltps': []}
+            for port in item.get('inPorts', []) + item.get('outPorts', []):
+                vltp = {'id': self._new_id(), 'name': f"{item['name']}.{port}"}
+                node['vltps'].append(vltp)
+                ports_by_name[vltp['name']] = (node['id'], vltp['id'])
+            nodes.append(node)
+        links = []
+        for item in upload.get('links', []):
+            link = self._link(ports_by_name, item['outPort'], item['inPort'])
+            link['name'] = item.get('label', link['name'])
+            links.append(link)
+        trails = []
+        for item in upload.get('paths', []):
+            vxcs = []
+            for oxc in item.get('oxcs', []):
+                switch_id, ingress_id = ports_by_name[f"{oxc['switch']}.{oxc['inPort']}"]
+                _, egress_id = ports_by_name[f"{oxc['switch']}.{oxc['outPort']}"]
+                vxcs.append({'name': "", 'label': oxc.get('label', ""), 'description': "",
+                             'switchId': switch_id, 'ingressPortId': ingress_id, 'egressPortId': egress_id})
+            trails.append({'name': item['name'], 'label': item.get('label', ""), 'description': "",
+                           'status': "PENDING", 'vxcs': vxcs})
+        return {'nodes': nodes, 'links': links}, trails
+
+    # ----- HTTP -----
+
+    def _handler(self, handle):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, format, *args):
+                pass
+
+            def _dispatch(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b""
+                if server.latency:
+                    time.sleep(server.latency)
+                status, payload, headers = handle(self.command, self.path, self.headers, body)
+                data = b"" if payload is None else json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_DELETE = do_PUT = _dispatch
+
+        return Handler
+
+    def _count(self, method, path):
+        template = re.sub(r"/\d+", "/{id}", path)
+        with self._lock:
+            self.request_counts[(method, template)] = self.request_counts.get((method, template), 0) + 1
+
+    def _issue_token(self):
+        access_token = secrets.token_hex(16)
+        refresh_token = secrets.token_hex(16)
+        with self._lock:
+            self._tokens[access_token] = time.monotonic() + self.token_lifetime
+            self._refresh_tokens.add(refresh_token)
+        return {
+            'access_token': access_token,
+            'expires_in': self.token_lifetime,
+            'refresh_token': refresh_token,
+            'refresh_expires_in': self.token_lifetime * 6,
+            'token_type': "Bearer",
+        }
+
+    def _handle_auth(self, method, path, headers, body):
+        self._count(method, path)
+        if method != "POST" or path != TOKEN_PATH:
+            return 404, {'error': "not found"}, None
+        form = {key: values[0] for key, values in parse_qs(body.decode()).items()}
+        grant_type = form.get('grant_type')
+        if grant_type == "password" and form.get('username') and form.get('password'):
+            return 200, self._issue_token(), None
+        if grant_type == "refresh_token":
+            with self._lock:
+                valid = form.get('refresh_token') in self._refresh_tokens
+                self._refresh_tokens.discard(form.get('refresh_token'))
+            if valid:
+                return 200, self._issue_token(), None
+        return 401, {'error': "invalid_grant"}, None
+
+    def _authorized(self, headers):
+        authorization = headers.get('Authorization', "")
+        if not authorization.startswith("Bearer "):
+            return False
+        with self._lock:
+            expiry = self._tokens.get(authorization[len("Bearer "):])
+        return expiry is not None and expiry > time.monotonic()
+
+    def _handle_api(self, method, path, headers, body):
+        self._count(method, path)
+        if not path.startswith(API_PREFIX):
+            return 404, {'error': "not found"}, None
+        if not self._authorized(headers):
+            return 401, {'error': "unauthorized"}, None
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self.error_status, {'error': "injected error"}, None
+        route = path[len(API_PREFIX):].split("?")[0]
+        parts = [part for part in route.split("/") if part]
+
+        if method == "POST" and parts == ["upload"]:
+            upload = json.loads(body)
+            if any(network.name == upload.get('name') for network in list(self._networks.values())):
+                return 409, {'error': "network already exists"}, None
+            topology, trails = self._from_upload(upload)
+            return 201, {'id': self.add_network(upload.get('name'), topology, trails, upload)}, None
+        if method == "GET" and parts == ["subnet"]:
+            return 200, [{'id': network.id, 'name': network.name} for network in list(self._networks.values())], None
+        if len(parts) >= 2 and parts[0] == "subnet":
+            network = self._networks.get(int(parts[1])) if parts[1].isdigit() else None
+            if network is None:
+                return 404, {'error': "network not found"}, None
+            if method == "DELETE" and len(parts) == 2:
+                with self._lock:
+                    del self._networks[network.id]
+                return 204, None, None
+            if method == "GET" and parts[2:] == ["topology"]:
+                etag = f'"{network.id}-{network.version}"'
+                if headers.get('If-None-Match') == etag:
+                    return 304, None, {'ETag': etag}
+                return 200, network.topology, {'ETag': etag}
+            if method == "GET" and parts[2:] == ["download"]:
+                return 200, network.upload or {'name': network.name}, None
+            if method == "GET" and parts[2:] == ["trails"]:
+                trails = [{key: value for key, value in trail.items() if key != 'vxcs'}
+                          for trail in list(network.trails.values())]
+                return 200, trails, None
+        if len(parts) >= 2 and parts[0] == "trail":
+            network, trail = self._find_trail(parts[1])
+            if trail is None:
+                # Deleting a trail again succeeds, as with delete_path(force=True)
+                if method == "DELETE" and len(parts) == 2 and parts[1].isdigit() and int(parts[1]) in self._deleted_trails:
+                    return 204, None, None
+                return 404, {'error': "trail not found"}, None
+            if method == "GET" and parts[2:] == ["oxcs"]:
+                return 200, [dict(vxc) for vxc in trail['vxcs']], None
+            if method == "DELETE" and len(parts) == 2:
+                with self._lock:
+                    network.trails.pop(trail['id'], None)
+                    self._deleted_trails.add(trail['id'])
+                return 204, None, None
+        if method == "POST" and parts == ["trail"]:
+            trail = json.loads(body)
+            network = self._networks.get(trail.get('vsubnetId'))
+            if network is None:
+                return 404, {'error': "network not found"}, None
+            trail['id'] = self._new_id()
+            with self._lock:
+                network.trails[trail['id']] = trail
+            return 201, {'id': trail['id']}, None
+        return 404, {'error': "not found"}, None
+
+    def _find_trail(self, trail_id):
+        if not trail_id.isdigit():
+            return None, None
+        for network in list(self._networks.values()):
+            trail = network.trails.get(int(trail_id))
+            if trail is not None:
+                return network, trail
+        return None, None
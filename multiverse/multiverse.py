@@ -4,44 +4,162 @@ import requests
 import json
 import os
 
+from .auth import TokenManager
+from .codec import get_codec
+from .instrumentation import SessionStats
 from .network import Network
+from .search_cache import make_search_cache
+from .snapshot import make_snapshot_store
+
+
+def _no_auth(request):
+    """Auth for the token endpoint requests, which must not carry the bearer token."""
+    return request
+
+
+class _BearerAuth(requests.auth.AuthBase):
+    """
+    Attaches a valid access token to every request of the session, refreshing it
+    beforehand when it is about to expire, and sends a request once more with a
+    new token when the server answers 401.
+    """
+
+    def __init__(self, multiverse):
+        self._multiverse = multiverse
+
+    def __call__(self, request):
+        token = self._multiverse._ensure_token()
+        if token:
+            request.headers['Authorization'] = f'Bearer {token}'
+        request.register_hook('response', self.handle_401)
+        return request
+
+    def handle_401(self, response, **kwargs):
+        request = response.request
+        if response.status_code != 401 or getattr(request, '_mvs_retried', False):
+            return response
+        rejected = request.headers.get('Authorization', '')[len('Bearer '):]
+        token = self._multiverse._reauthenticate(rejected)
+        if not token:
+            return response
+
+        # The session hooks only see the final response, so record the 401 here
+        self._multiverse.stats.response_hook(response, **kwargs)
+        self._multiverse.stats.record_retry(request.method, request.url)
+        response.content
+        response.close()
+        retry = request.copy()
+        retry._mvs_retried = True
+        retry.headers['Authorization'] = f'Bearer {token}'
+        new_response = response.connection.send(retry, **kwargs)
+        new_response.history.append(response)
+        new_response.request = retry
+        return new_response
+
 
 class Multiverse:
-    def __init__(self, server_ip="localhost"):
+    def __init__(self, server_ip="localhost", pool_maxsize=32, api_port=8787, auth_port=8888,
+                 token_cache=None, refresh_margin=30, codec=None, snapshot_store=None,
+                 search_cache=None):
+        """
+        :param token_cache: Reuse tokens across processes through an on-disk cache:
+            True for the default location (~/.cache/multiverse/tokens.json), a file path
+            or a TokenCache. Disabled by default.
+        :param refresh_margin: Refresh the access token this many seconds before it expires
+        :param codec: JSON codec or codec name ('json', 'orjson', 'msgspec', 'auto');
+            defaults to codec.get_codec()
+        :param snapshot_store: Save the topology and paths of the networks to a local snapshot
+            store, to warm start them later (Network.warm_start()): True for the default
+            location (~/.cache/multiverse/snapshots.sqlite3), a file path or a SnapshotStore
+        :param search_cache: Cache the results of Network.search_paths(), shared by the
+            networks: True for the default size, a maximum number of entries or a SearchCache
+        """
         username = os.getenv("MVS_USERNAME")
         password = os.getenv("MVS_PASSWORD")
 
         if not username or not password:
             raise ValueError("Username or password is not set in environment variables: MVS_USERNAME and MVS_PASSWORD")
 
-        self._token = None
-        self._BASE_URL = f"http://{server_ip}:8787/api/topology"
-        self._AUTH_URL = f"http://{server_ip}:8888/realms/multiverse/protocol/openid-connect/token"
+        self._username = username
+        self._password = password
+        self.codec = get_codec(codec)
+        self._snapshot_store = make_snapshot_store(snapshot_store)
+        self._search_cache = make_search_cache(search_cache)
+        self._BASE_URL = f"http://{server_ip}:{api_port}/api/topology"
+        self._AUTH_URL = f"http://{server_ip}:{auth_port}/realms/multiverse/protocol/openid-connect/token"
         self.session = requests.Session()
-        self.login(username, password)
+        # Large enough for the concurrent cross-connect fetches of Network.get_paths
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Per-endpoint latency, size and status statistics of every request of the session
+        self._stats = SessionStats()
+        self.session.hooks['response'].append(self._stats.response_hook)
+        self._tokens = TokenManager(self._AUTH_URL, username, refresh_margin, token_cache)
+        self.session.auth = _BearerAuth(self)
+        if self._tokens.is_valid():
+            print(f"Using cached token for {username}")
+        elif self._tokens.can_refresh():
+            self._ensure_token()
+        else:
+            self.login(username, password)
 
     @property
     def token(self):
-        return self._token
+        return self._tokens.access_token
+
+    @property
+    def stats(self):
+        """SessionStats of the requests sent to the backend."""
+        return self._stats
 
     def login(self, username, password):
         """Authenticate with the backend and store the access token."""
         print(f"Logging in as {username}")
-        url = self._AUTH_URL
+        with self._tokens.lock:
+            response = self._request_token(TokenManager.password_grant(username, password))
+            if response.status_code == 200:
+                self._tokens.update(response.json())
+                print("Logged in successfully.")
+            else:
+                print(f"Login failed: {response.text}")
+
+    def _request_token(self, data):
+        """Send a grant to the token endpoint."""
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        data = {
-            "client_id": "multiverse-access",
-            "username": username,
-            "password": password,
-            "grant_type": "password"
-        }
-        response = self.session.post(url, headers=headers, data=data)
+        return self.session.post(self._AUTH_URL, headers=headers, data=data, auth=_no_auth)
+
+    def _refresh_token(self):
+        """Renew the access token with the refresh token, falling back to a password grant."""
+        if self._tokens.can_refresh():
+            response = self._request_token(self._tokens.refresh_grant())
+            if response.status_code == 200:
+                self._tokens.update(response.json())
+                return self._tokens.access_token
+        response = self._request_token(TokenManager.password_grant(self._username, self._password))
         if response.status_code == 200:
-            self._token = response.json()['access_token']
-            self.session.headers.update({'Authorization': f'Bearer {self._token}'})
-            print("Logged in successfully.")
-        else:
-            print(f"Login failed: {response.text}")
+            self._tokens.update(response.json())
+            return self._tokens.access_token
+        print(f"Login failed: {response.text}")
+        return None
+
+    def _ensure_token(self):
+        """Return a valid access token, refreshing it if it is about to expire."""
+        if self._tokens.is_valid():
+            return self._tokens.access_token
+        with self._tokens.lock:
+            # Another thread may have refreshed it while we waited for the lock
+            if self._tokens.is_valid():
+                return self._tokens.access_token
+            return self._refresh_token()
+
+    def _reauthenticate(self, rejected_token):
+        """Return a new access token after the server rejected rejected_token."""
+        with self._tokens.lock:
+            self._tokens.invalidate(rejected_token)
+            if self._tokens.is_valid():
+                return self._tokens.access_token
+            return self._refresh_token()
 
     def create_network(self, name, json_file_path):
         """Create a network with topology from a JSON file."""
@@ -50,11 +168,12 @@ class Multiverse:
         with open(json_file_path, 'r') as file:
             topology = json.load(file)
             topology['name'] = name
-        response = self.session.post(url, headers=headers, data=json.dumps(topology))
+        response = self.session.post(url, headers=headers, data=self.codec.dumps(topology))
         if response.status_code == 201:
             network_id = response.json()['id']
             print(f"Network '{name}' created with ID: {network_id}")
-            return Network(self, network_id, name)
+            return Network(self, network_id, name, snapshot_store=self._snapshot_store,
+                           search_cache=self._search_cache)
         else:
             print(f"Failed to upload network: {response.status_code} {response.text}")
             if response.status_code == 409:
@@ -68,7 +187,8 @@ class Multiverse:
         if networks:
             for network in networks:
                 if network['name'] == name:
-                    return Network(self, network['id'], name)
+                    return Network(self, network['id'], name, snapshot_store=self._snapshot_store,
+                                   search_cache=self._search_cache)
         print(f"Network '{name}' not found.")
         return None
 
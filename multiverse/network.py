@@ -1,9 +1,13 @@
 # _multiverse/network.py
 
-import json
+import threading
+import time
 
+from .candidates import CandidateSet
+from .ledger import PortLedger
 from .path import Path
-import networkx as nx
+from .search_cache import make_search_cache
+from .topology_diff import TopologyDelta, apply_topology_delta
 
 
 def topology_to_graph(topology_dict):
@@ -11,6 +15,8 @@ def topology_to_graph(topology_dict):
     Converts an optical network topology dictionary to a NetworkX MultiDiGraph,
     allowing multiple links between nodes.
     """
+    import networkx as nx
+
     G = nx.MultiDiGraph()
     
     # Add nodes to the graph using node names as identifiers
@@ -50,13 +56,95 @@ def topology_to_graph(topology_dict):
     return G
 
 
+class TopologyCache:
+    """Parsed topology and graph of a network, with the validators used to revalidate them."""
+
+    def __init__(self):
+        self.topology = None
+        self.graph = None
+        self.etag = None
+        self.last_modified = None
+        self.fetched_at = None
+        self.version = 0
+        self._compact = None    # (version, CompactTopology of the graph)
+
+    def is_fresh(self, ttl):
+        """Return True if the cached topology is younger than ttl seconds."""
+        return self.graph is not None and self.fetched_at is not None and time.monotonic() - self.fetched_at < ttl
+
+    def validators(self):
+        """Return the conditional request headers for the cached topology."""
+        headers = {}
+        if self.graph is None:
+            return headers
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def touch(self, response_headers):
+        """Record a successful (re)validation."""
+        self.etag = response_headers.get('ETag', self.etag)
+        self.last_modified = response_headers.get('Last-Modified', self.last_modified)
+        self.fetched_at = time.monotonic()
+
+    def copy(self):
+        """Return a copy with its own graph, to be updated without touching this cache."""
+        cache = TopologyCache()
+        cache.topology = self.topology
+        cache.graph = self.graph.copy() if self.graph is not None else None
+        cache.etag = self.etag
+        cache.last_modified = self.last_modified
+        cache.fetched_at = self.fetched_at
+        cache.version = self.version
+        return cache
+
+    def compact_graph(self):
+        """Return a CompactTopology of the graph, converted once per version (for parallel searches)."""
+        if self._compact is None or self._compact[0] != self.version:
+            from .compact import CompactTopology
+
+            self._compact = (self.version, CompactTopology.from_graph(self.graph))
+        return self._compact[1]
+
+    def clear(self):
+        self.topology = None
+        self.graph = None
+        self._compact = None
+        self.etag = None
+        self.last_modified = None
+        self.fetched_at = None
+
+
 class Network:
-    def __init__(self, multiverse, network_id, name):
+    def __init__(self, multiverse, network_id, name, max_workers=8, topology_ttl=0, snapshot_store=None,
+                 search_cache=None):
         self._multiverse = multiverse
         self._network_id = network_id
         self._name = name
         self._node_map = None
         self._port_map = None
+        self._node_ids = None
+        self._port_ids = None
+        self.max_workers = max_workers
+        self.topology_ttl = topology_ttl
+        self._topology_cache = TopologyCache()
+        self._ledger = PortLedger()
+        self._failed_path_ids = []
+        self._snapshot_store = snapshot_store
+        self._snapshot_oxcs = {}
+        self._reconciliation = None
+        # Serializes the updates of the topology cache, maps and ledger with the swap
+        # of the state built by a background reconciliation
+        self._state_lock = threading.RLock()
+        self._topology_delta = None
+        self._topology_listeners = []
+        self._search_cache = make_search_cache(search_cache)
+        # Identifies the topology and ledger of this object in the keys of a shared search cache,
+        # their versions are only counters of this object (kept alive by the keys, so never reused)
+        self._search_token = object()
+        self._ledger.add_listener(self._on_ledger_change)
 
     @property
     def name(self):
@@ -66,86 +154,541 @@ class Network:
     def id(self):
         return self._network_id
 
+    @property
+    def topology_version(self):
+        """Counter increased every time get_topology() sees a changed topology."""
+        return self._topology_cache.version
+
+    @property
+    def ledger(self):
+        """PortLedger of the established paths, refreshed by get_paths() and updated by path creation and deletion."""
+        return self._ledger
+
+    @property
+    def failed_path_ids(self):
+        """IDs of the paths whose cross-connects could not be fetched by the last get_paths()."""
+        return self._failed_path_ids
+
+    @property
+    def topology_delta(self):
+        """TopologyDelta of the last topology change seen by get_topology(), or None."""
+        return self._topology_delta
+
+    def add_topology_listener(self, callback):
+        """Call callback(network, delta) after every topology change applied by get_topology()."""
+        self._topology_listeners.append(callback)
+
+    def remove_topology_listener(self, callback):
+        self._topology_listeners.remove(callback)
+
+    @property
+    def search_cache(self):
+        """SearchCache of the results of search_paths(), or None."""
+        return self._search_cache
+
+    def _search_scope(self):
+        return (self._multiverse._BASE_URL, self._network_id, self._search_token)
+
+    def _invalidate_searches(self):
+        if self._search_cache is not None:
+            self._search_cache.invalidate(self._search_scope())
+
+    def _on_ledger_change(self, ledger, ports):
+        self._invalidate_searches()
+
+    @property
+    def snapshot_store(self):
+        """SnapshotStore the topology and paths are saved to, or None."""
+        return self._snapshot_store
+
+    def _decode(self, response, schema=None):
+        """Decode a response body with the client's JSON codec (see codec.SCHEMAS)."""
+        return self._multiverse.codec.loads(response.content, schema)
+
     def download_json(self):
         """Generate a JSON from the network content similar to the JSON used in upload."""
         url = f"{self._multiverse._BASE_URL}/subnet/{self._network_id}/download"
         response = self._multiverse.session.get(url)
         if response.status_code == 200:
-            return response.json()
+            return self._decode(response)
         else:
             print(f"Failed to download network content: {response.text}")
             return None
 
-    def get_topology(self):
-        """Fetch the topology for the network."""
+    def get_topology(self, force=False):
+        """
+        Fetch the topology for the network.
+
+        The topology, the ID/name maps and the graph are cached. Within topology_ttl
+        seconds the cached graph is returned without any request; after that the
+        cache is revalidated with ETag/If-Modified-Since when the server supports
+        them. When the topology changed, only the differences are applied to the
+        cached graph and maps, in place (see topology_delta and add_topology_listener()).
+
+        :param force: Download and rebuild the topology regardless of the cache
+        :return: NetworkX MultiDiGraph, shared between calls and updated in place
+        """
+        cache = self._topology_cache
+        if not force and cache.is_fresh(self.topology_ttl):
+            return cache.graph
         url = f"{self._multiverse._BASE_URL}/subnet/{self._network_id}/topology"
-        response = self._multiverse.session.get(url)
+        headers = {} if force else cache.validators()
+        response = self._multiverse.session.get(url, headers=headers)
+        return self._handle_topology_response(response, force)
+
+    def _handle_topology_response(self, response, force=False):
+        """Update the topology cache from a topology response and return the graph."""
+        with self._state_lock:
+            return self._apply_topology_response(response, force)
+
+    def _apply_topology_response(self, response, force):
+        cache = self._topology_cache
+        if response.status_code == 304 and cache.graph is not None:
+            cache.touch(response.headers)
+            return cache.graph
         if response.status_code == 200:
-            topology = response.json()
-            self._update_maps(topology)
-            return topology_to_graph(topology)
+            topology = self._decode(response, 'topology')
+            changed = topology != cache.topology
+            delta = None
+            if changed and not force and cache.graph is not None and self._node_map is not None:
+                delta = apply_topology_delta(cache.graph, cache.topology, topology)
+                if not delta.full_rebuild:
+                    self._apply_maps_delta(cache.topology, topology, delta)
+                    cache.topology = topology
+            if force or (changed and (delta is None or delta.full_rebuild)):
+                self._update_maps(topology)
+                cache.topology = topology
+                cache.graph = topology_to_graph(topology)
+            if changed:
+                cache.version += 1
+            cache.touch(response.headers)
+            if changed or force:
+                self._save_topology_snapshot()
+            if changed:
+                self._notify_topology_change(delta)
+            return cache.graph
         else:
             print(f"Failed to get topology: {response.text}")
             self._reset_maps()
+            cache.clear()
+            self._invalidate_searches()
             return None
 
+    def _notify_topology_change(self, delta):
+        """Record the delta of a topology change (a full-rebuild delta if none was computed) and notify listeners."""
+        if delta is None:
+            delta = TopologyDelta()
+            delta.full_rebuild = True
+        self._topology_delta = delta
+        self._invalidate_searches()
+        for callback in list(self._topology_listeners):
+            callback(self, delta)
+
     def _update_maps(self, topology):
-        """Create mappings from port IDs to names."""
+        """Create mappings from node and port IDs to names, and the reverse indexes."""
         self._node_map = {}
         self._port_map = {}
+        self._node_ids = {}
+        self._port_ids = {}
         for node in topology['nodes']:
-            self._node_map[node['id']] = node['name']
-            for port in node['vltps']:
-                self._port_map[port['id']] = port['name']
+            self._index_node(node)
+
+    def _index_node(self, node, ports=None):
+        """Add a node and its ports (or only the given ones) to the maps."""
+        node_name = node['name']
+        self._node_map[node['id']] = node_name
+        self._node_ids[node_name] = node['id']
+        for port in node['vltps'] if ports is None else ports:
+            port_name = port['name']
+            self._port_map[port['id']] = port_name
+            # Index both the "NODE.port" full name and the bare port name
+            prefix = f"{node_name}."
+            if port_name.startswith(prefix):
+                self._port_ids[(node_name, port_name[len(prefix):])] = port['id']
+            self._port_ids[(node_name, port_name)] = port['id']
+
+    def _unindex_node(self, node, ports=None):
+        """Remove a node and its ports (or only the given ones) from the maps."""
+        node_name = node['name']
+        if ports is None:
+            if self._node_ids.get(node_name) == node['id']:
+                del self._node_ids[node_name]
+            self._node_map.pop(node['id'], None)
+        for port in node['vltps'] if ports is None else ports:
+            port_name = port['name']
+            self._port_map.pop(port['id'], None)
+            prefix = f"{node_name}."
+            keys = [(node_name, port_name)]
+            if port_name.startswith(prefix):
+                keys.append((node_name, port_name[len(prefix):]))
+            for key in keys:
+                if self._port_ids.get(key) == port['id']:
+                    del self._port_ids[key]
+
+    def _apply_maps_delta(self, old_topology, new_topology, delta):
+        """Update the maps in place from old_topology to new_topology, given their TopologyDelta."""
+        nodes = set(delta.added_nodes) | set(delta.removed_nodes) | set(delta.changed_nodes)
+        ports = set(delta.added_ports) | set(delta.removed_ports) | set(delta.changed_ports)
+        for topology, update in ((old_topology, self._unindex_node), (new_topology, self._index_node)):
+            for node in topology['nodes']:
+                if node['id'] in nodes:
+                    update(node)
+                elif node['id'] in delta.port_nodes:
+                    node_ports = [port for port in node['vltps'] if port['id'] in ports]
+                    if node_ports:
+                        update(node, node_ports)
 
     def _reset_maps(self):
         self._node_map = None
         self._port_map = None
+        self._node_ids = None
+        self._port_ids = None
+
+    def _resolve_node_id(self, node_name):
+        """Return the ID of a node from its name, or None if not found."""
+        return self._node_ids.get(node_name)
+
+    def _resolve_port_id(self, node_name, port_name):
+        """Return the ID of a port from its node name and either its "NODE.port" or bare name."""
+        return self._port_ids.get((node_name, port_name))
+
+    def search_paths(self, start_name, end_name, k=None, weight=None, **options):
+        """
+        Search the paths between two nodes of the network, over the cached topology
+        graph (fetched first if needed) and the port occupancy of the ledger.
+
+        With a search_cache, results are reused while the topology and the occupancy
+        do not change: cached entries are dropped when get_topology() sees a new
+        topology and when paths are created, deleted or fetched again. Searches with
+        a time_budget are not cached, their result depends on the timing.
+
+        :param start_name: Starting node, with an optional port (e.g., 'SOURCE' or 'SOURCE.1')
+        :param end_name: Ending node, with an optional port (e.g., 'DETECTOR' or 'DETECTOR.1')
+        :param k: Only return the k shortest paths (see utils.search_paths)
+        :param weight: With k, the edge attribute or function used as edge weight
+        :param options: max_hops, max_results, only_possible, time_budget and processes
+            (see utils.iter_search_paths); with k, only max_hops, max_results and
+            only_possible (see utils.search_paths)
+        :return: List of path information dictionaries as returned by utils.search_paths,
+            or None if the topology cannot be fetched
+        """
+        graph = self._topology_cache.graph
+        if graph is None:
+            graph = self.get_topology()
+        return self._search_cached(graph, start_name, end_name, k, weight, options)
+
+    def search_candidates(self, start_name, end_name, k=None, weight=None, **options):
+        """
+        Search the paths between two nodes as search_paths(), as a CandidateSet that
+        keeps their feasibility up to date while paths are created and deleted.
+
+        :return: CandidateSet attached to the ledger (weakly: dropping it is enough to
+            stop following the ledger), or None if the topology cannot be fetched
+        """
+        results = self.search_paths(start_name, end_name, k, weight, **options)
+        return CandidateSet(results, self._ledger) if results is not None else None
+
+    def search_disjoint_paths(self, start_name, end_name, disjoint='node', weight=None):
+        """
+        Search a primary and a backup path between two nodes over the cached topology
+        graph, avoiding the ports used by the established paths (see
+        disjoint.search_disjoint_paths).
+
+        :param disjoint: 'node' (no common link or intermediate node) or 'link'
+        :return: Tuple (primary, backup) of path information dictionaries, or None
+        """
+        from .disjoint import search_disjoint_paths
+
+        graph = self._topology_cache.graph
+        if graph is None:
+            graph = self.get_topology()
+        if graph is None:
+            return None
+        return search_disjoint_paths(graph, start_name, end_name, self._ledger, disjoint, weight)
+
+    def plan_paths(self, demands, **options):
+        """
+        Choose a conflict-free path for as many demands as possible over the cached
+        topology graph and the ports left free by the established paths (see
+        planner.plan_paths for the options). Create them with
+        create_paths(plan.paths()).
+
+        :param demands: Iterable of (start_name, end_name) tuples, with optional ports
+        :return: ProvisioningPlan, or None if the topology cannot be fetched
+        """
+        from .planner import plan_paths
+
+        graph = self._topology_cache.graph
+        if graph is None:
+            graph = self.get_topology()
+        if graph is None:
+            return None
+        return plan_paths(graph, demands, self._ledger, **options)
+
+    def _search_cached(self, graph, start_name, end_name, k, weight, options):
+        from .utils import _check_search_options, iter_search_paths, search_paths
+
+        _check_search_options(k, weight, options)
+        if graph is None:
+            return None
+        processes = options.get('processes')
+        if k is None and processes is not None and processes > 1 and graph is self._topology_cache.graph:
+            graph = self._topology_cache.compact_graph()
+
+        def search():
+            if k is not None:
+                return search_paths(graph, start_name, end_name, self._ledger, k=k, weight=weight, **options)
+            return list(iter_search_paths(graph, start_name, end_name, self._ledger, **options))
+
+        cache = self._search_cache
+        if cache is None or options.get('time_budget') is not None:
+            return search()
+        # The number of processes does not change the result
+        key_options = {name: value for name, value in options.items() if name != 'processes'}
+        key_options.update(k=k, weight=weight)
+        key = cache.make_key((self._search_token, self._topology_cache.version),
+                             (self._search_token, self._ledger.version), start_name, end_name, key_options)
+        return cache.get_or_search(key, search, self._search_scope())
+
+    def get_paths(self, max_workers=None):
+        """
+        Fetch all paths (trails) for the network, including their cross-connects.
+
+        Cross-connects are fetched concurrently over the shared session, unless the
+        server already embeds them in the trail list. Paths whose cross-connects
+        cannot be fetched are reported and left out; their IDs are available in
+        failed_path_ids.
 
-    def get_paths(self):
-        """Fetch all paths (trails) for the network, including their cross-connects."""
+        :param max_workers: Maximum number of parallel requests (defaults to self.max_workers)
+        :return: List of Path objects, in the order returned by the server
+        """
         if self._node_map is None or self._port_map is None:
             t = self.get_topology()
         url = f"{self._multiverse._BASE_URL}/subnet/{self._network_id}/trails"
         response = self._multiverse.session.get(url)
         if response.status_code == 200:
-            paths_obj = []
-            for path in response.json():
-                vxcs = self._get_path_vxcs(path['id'])
-                path['oxcs'] = vxcs
-                paths_obj.append(Path.from_dict(path))
-            return paths_obj
+            trails = self._decode(response, 'trails')
+            fetched, pending = self._split_embedded(trails)
+            fetched.update(zip(pending, self._map_concurrently(self._try_get_path_vxcs, pending, max_workers)))
+            return self._paths_from_trails(trails, fetched)
         else:
             print(f"Failed to get paths: {response.text}")
             return None
 
+    def _map_concurrently(self, func, items, max_workers=None):
+        """Apply func to every item using up to max_workers threads, returning the results in order."""
+        workers = max_workers or self.max_workers
+        if workers > 1 and len(items) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(workers, len(items))) as executor:
+                return list(executor.map(func, items))
+        return [func(item) for item in items]
+
+    def _split_embedded(self, trails):
+        """
+        Separate trails whose cross-connects are embedded by a bulk endpoint from
+        those that need a request to /trail/{id}/oxcs.
+
+        :return: Tuple (dict of path ID to embedded cross-connects, list of path IDs to fetch)
+        """
+        fetched = {}
+        pending = []
+        # Cross-connects of a trail do not change, so those loaded from a snapshot are reused once
+        known, self._snapshot_oxcs = self._snapshot_oxcs, {}
+        for path in trails:
+            vxcs = path.get('vxcs', path.get('oxcs'))
+            if vxcs is not None and all('switchId' in vxc for vxc in vxcs):
+                fetched[path['id']] = self._convert_vxcs(vxcs)
+            elif path['id'] in known:
+                fetched[path['id']] = known[path['id']]
+            else:
+                pending.append(path['id'])
+        return fetched, pending
+
+    def _paths_from_trails(self, trails, fetched):
+        """Build Path objects from trails and their cross-connects, keeping the trail order."""
+        complete = []
+        failed = []
+        for path in trails:
+            vxcs = fetched.get(path['id'])
+            if vxcs is None:
+                failed.append(path['id'])
+                continue
+            path['oxcs'] = vxcs
+            complete.append(path)
+        paths_obj = Path.from_dicts(complete)
+        self._failed_path_ids = failed
+        self._ledger.reset(paths_obj)
+        self._save_paths_snapshot(paths_obj)
+        if failed:
+            print(f"Failed to get cross-connects for {len(failed)} path(s): {failed}")
+        unresolved = self._ledger.unresolved_paths
+        if unresolved:
+            print(f"Unknown cross-connect ports in {len(unresolved)} path(s), not counted as used: {unresolved}")
+        return paths_obj
+
+    def _save_topology_snapshot(self):
+        if self._snapshot_store is None:
+            return
+        import sqlite3
+        cache = self._topology_cache
+        try:
+            self._snapshot_store.save_topology(self._multiverse._BASE_URL, self._network_id, cache.topology,
+                                               cache.etag, cache.last_modified)
+        except sqlite3.Error as e:
+            print(f"Failed to save topology snapshot: {e}")
+
+    def _save_paths_snapshot(self, paths):
+        if self._snapshot_store is None:
+            return
+        import sqlite3
+        try:
+            self._snapshot_store.save_paths(self._multiverse._BASE_URL, self._network_id, paths)
+        except sqlite3.Error as e:
+            print(f"Failed to save paths snapshot: {e}")
+
+    def load_snapshot(self):
+        """
+        Load the topology and paths saved in the snapshot store, without any request.
+
+        The loaded topology is revalidated by the next get_topology(), and the next
+        get_paths() only fetches the cross-connects of trails missing from the snapshot.
+
+        :return: List of Path objects, or None if the store has no snapshot of this network
+        """
+        if self._snapshot_store is None:
+            return None
+        snapshot = self._snapshot_store.load(self._multiverse._BASE_URL, self._network_id)
+        if snapshot is None or snapshot.topology is None or snapshot.paths is None:
+            return None
+        cache = self._topology_cache
+        self._update_maps(snapshot.topology)
+        cache.topology = snapshot.topology
+        cache.graph = topology_to_graph(snapshot.topology)
+        cache.etag = snapshot.etag
+        cache.last_modified = snapshot.last_modified
+        cache.fetched_at = None
+        cache.version += 1
+        paths = Path.from_dicts(snapshot.paths)
+        self._snapshot_oxcs = {path['id']: path['oxcs'] for path in snapshot.paths if 'id' in path}
+        self._ledger.reset(paths)
+        return paths
+
+    def reconcile(self):
+        """
+        Bring the topology and paths up to date with the server (and the snapshot store).
+
+        :return: List of Path objects, as get_paths()
+        """
+        self.get_topology()
+        return self.get_paths()
+
+    def warm_start(self, background=True):
+        """
+        Return the paths of the snapshot immediately and reconcile with the server
+        in a background thread (see wait_reconciled()). Without a snapshot, the
+        topology and paths are fetched synchronously.
+
+        The background reconciliation fetches the topology and paths into a private
+        copy of the network state, then swaps the new topology cache and graph, maps
+        and ledger content in at once when it completes, so the network can be
+        searched and used meanwhile: a graph obtained before the swap keeps the
+        snapshot topology, and the returned paths are not updated.
+
+        :param background: Reconcile in a background thread instead of before returning
+        :return: List of Path objects
+        """
+        paths = self.load_snapshot()
+        if paths is None or not background:
+            return self.reconcile()
+        self._reconciliation = threading.Thread(target=self._reconcile_staged, name=f"reconcile-{self._name}",
+                                                  daemon=True)
+        self._reconciliation.start()
+        return paths
+
+    def _reconcile_staged(self):
+        """Reconcile a private copy of the network state, then swap it in."""
+        staging, version = self._staging_copy()
+        staging.get_topology()
+        paths = staging.get_paths() if staging._topology_cache.graph is not None else None
+        return self._adopt_staging(staging, version, paths)
+
+    def _staging_copy(self):
+        """Return a private copy of the network state to reconcile, and the topology version it starts from."""
+        staging = type(self)(self._multiverse, self._network_id, self._name, self.max_workers, self.topology_ttl,
+                             self._snapshot_store)
+        with self._state_lock:
+            staging._topology_cache = self._topology_cache.copy()
+            if self._node_map is not None:
+                staging._node_map = dict(self._node_map)
+                staging._port_map = dict(self._port_map)
+                staging._node_ids = dict(self._node_ids)
+                staging._port_ids = dict(self._port_ids)
+            staging._snapshot_oxcs = self._snapshot_oxcs
+            return staging, self._topology_cache.version
+
+    def _adopt_staging(self, staging, version, paths):
+        """Swap the state of a reconciled staging copy in (see _staging_copy()) and return its paths."""
+        if staging._topology_cache.graph is None:
+            return None
+
+        with self._state_lock:
+            self._topology_cache = staging._topology_cache
+            self._node_map = staging._node_map
+            self._port_map = staging._port_map
+            self._node_ids = staging._node_ids
+            self._port_ids = staging._port_ids
+            self._snapshot_oxcs = staging._snapshot_oxcs
+            if paths is not None:
+                self._failed_path_ids = staging._failed_path_ids
+                self._ledger.reset(paths)
+            if self._topology_cache.version != version:
+                self._notify_topology_change(staging._topology_delta)
+        return paths
+
+    def wait_reconciled(self, timeout=None):
+        """Wait for the background reconciliation started by warm_start(); return True if it is done."""
+        thread = self._reconciliation
+        if thread is None:
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
+    def _try_get_path_vxcs(self, path_id):
+        """Fetch cross-connects for a path, reporting connection errors instead of raising."""
+        import requests
+        try:
+            return self._get_path_vxcs(path_id)
+        except requests.RequestException as e:
+            print(f"Failed to get path cross-connects: {e}")
+            return None
+
     def _get_path_vxcs(self, path_id):
         """Fetch cross-connects for a given path ID."""
         url = f"{self._multiverse._BASE_URL}/trail/{path_id}/oxcs"
         response = self._multiverse.session.get(url)
         if response.status_code == 200:
-            vxcs = response.json()
-            # Convert IDs to names for consistency
-            for vxc in vxcs:
-                switch_id = vxc['switchId']
-                switch_name = self._node_map.get(switch_id)
-                ingress_port_id = vxc['ingressPortId']
-                egress_port_id = vxc['egressPortId']
-                ingress_port = self._port_map.get(ingress_port_id)
-                egress_port = self._port_map.get(egress_port_id)
-                vxc['switch'] = switch_name
-                vxc['inPort'] = ingress_port
-                vxc['outPort'] = egress_port
-            return vxcs
+            return self._convert_vxcs(self._decode(response, 'vxcs'))
         else:
             print(f"Failed to get path cross-connects: {response.text}")
             return None
 
-    def create_path(self, path):
-        """Create a path with the specified data."""
-        if self._node_map is None or self._port_map is None:
-            t = self.get_topology()
+    def _convert_vxcs(self, vxcs):
+        """Convert the IDs in a list of cross-connects to names for consistency."""
+        for vxc in vxcs:
+            switch_id = vxc['switchId']
+            switch_name = self._node_map.get(switch_id)
+            ingress_port_id = vxc['ingressPortId']
+            egress_port_id = vxc['egressPortId']
+            ingress_port = self._port_map.get(ingress_port_id)
+            egress_port = self._port_map.get(egress_port_id)
+            vxc['switch'] = switch_name
+            vxc['inPort'] = ingress_port
+            vxc['outPort'] = egress_port
+        return vxcs
 
+    def _path_payload(self, path):
+        """Build the trail payload for a path, converting node and port names to IDs."""
         # Convert node and port names to IDs
         j_oxcs = []
         for oxc in path.oxcs:
@@ -156,22 +699,13 @@ class Network:
             egress_port_name = oxc.outPort
 
             # Find node ID
-            node_id = None
-            for nid, nname in self._node_map.items():
-                if nname == node_name:
-                    node_id = nid
-                    break
+            node_id = self._resolve_node_id(node_name)
             if not node_id:
                 raise ValueError(f"Node '{node_name}' not found.")
 
             # Find port IDs
-            ingress_port_id = None
-            egress_port_id = None
-            for pid, pname in self._port_map.items():
-                if pname == f"{node_name}.{ingress_port_name}":
-                    ingress_port_id = pid
-                if pname == f"{node_name}.{egress_port_name}":
-                    egress_port_id = pid
+            ingress_port_id = self._resolve_port_id(node_name, ingress_port_name)
+            egress_port_id = self._resolve_port_id(node_name, egress_port_name)
             if ingress_port_id is None or egress_port_id is None:
                 raise ValueError(f"Ports '{ingress_port_name}' or '{egress_port_name}' not found on node '{node_name}'.")
 
@@ -194,30 +728,137 @@ class Network:
             "vxcs": j_oxcs
         }
 
-        url = f"{self._multiverse._BASE_URL}/trail"
-        headers = {'Content-Type': 'application/json'}
-        response = self._multiverse.session.post(url, headers=headers, data=json.dumps(payload))
+        return payload
+
+    def create_path(self, path):
+        """Create a path with the specified data."""
+        if self._node_map is None or self._port_map is None:
+            t = self.get_topology()
+
+        payload = self._path_payload(path)
+
+        response = self._post_path(payload)
         if response.status_code == 201:
             print(f"Path {path.name} created")
-            path.id = response.json()['id']
+            path.id = self._decode(response)['id']
+            self._ledger.add_path(path)
             return path
         else:
             print(f"Failed to create path: {response.text}")
             return None
 
+    def _post_path(self, payload):
+        url = f"{self._multiverse._BASE_URL}/trail"
+        headers = {'Content-Type': 'application/json'}
+        return self._multiverse.session.post(url, headers=headers, data=self._multiverse.codec.dumps(payload))
+
     def delete_path(self, path, force=False):
         """Delete a path."""
         if not path.id:
             print("Path ID is required to delete a path.")
             return False
-        url = f"{self._multiverse._BASE_URL}/trail/{path.id}"
-        response = self._multiverse.session.delete(url)
+        response = self._delete_path_request(path.id)
         if response.status_code == 200 or response.status_code == 204:
             if force:
                 return self.delete_path(path, False)
             else:
                 print(f"Path {path.name} deleted.")
+                self._ledger.remove_path(path)
                 return True
         else:
             print(f"Failed to delete path: {response.text}")
             return False
+
+    def _delete_path_request(self, path_id):
+        url = f"{self._multiverse._BASE_URL}/trail/{path_id}"
+        return self._multiverse.session.delete(url)
+
+    def create_paths(self, paths, max_workers=None):
+        """
+        Create several paths concurrently.
+
+        Node and port names of all paths are resolved to IDs before any request is
+        sent. Nothing is printed; the outcome of every path is returned instead.
+
+        :param paths: List of Path objects
+        :param max_workers: Maximum number of parallel requests (defaults to self.max_workers)
+        :return: List of dicts in the order of paths, with keys 'path', 'id' (ID of the
+            created path or None), 'status_code' and 'error' (None on success)
+        """
+        import requests
+        if self._node_map is None or self._port_map is None:
+            self.get_topology()
+
+        results = [None] * len(paths)
+        requests_to_send = []
+        for idx, path in enumerate(paths):
+            try:
+                requests_to_send.append((idx, path, self._path_payload(path)))
+            except ValueError as e:
+                results[idx] = _create_result(path, None, None, str(e))
+
+        def send(item):
+            idx, path, payload = item
+            try:
+                response = self._post_path(payload)
+            except requests.RequestException as e:
+                return _create_result(path, None, None, str(e))
+            if response.status_code == 201:
+                path.id = self._decode(response)['id']
+                return _create_result(path, path.id, response.status_code, None)
+            return _create_result(path, None, response.status_code, response.text)
+
+        sent = self._map_concurrently(send, requests_to_send, max_workers)
+        for (idx, _, _), result in zip(requests_to_send, sent):
+            results[idx] = result
+        self._record_created(results)
+        return results
+
+    def delete_paths(self, paths, force=False, max_workers=None):
+        """
+        Delete several paths concurrently.
+
+        :param paths: List of Path objects
+        :param force: Same as in delete_path(), applied to every path
+        :param max_workers: Maximum number of parallel requests (defaults to self.max_workers)
+        :return: List of dicts in the order of paths, with keys 'path', 'deleted',
+            'status_code' and 'error' (None on success)
+        """
+        import requests
+
+        def send(path):
+            if not path.id:
+                return _delete_result(path, False, None, "Path ID is required to delete a path.")
+            try:
+                response = self._delete_path_request(path.id)
+                if force and response.status_code in (200, 204):
+                    response = self._delete_path_request(path.id)
+            except requests.RequestException as e:
+                return _delete_result(path, False, None, str(e))
+            if response.status_code in (200, 204):
+                return _delete_result(path, True, response.status_code, None)
+            return _delete_result(path, False, response.status_code, response.text)
+
+        results = self._map_concurrently(send, list(paths), max_workers)
+        self._record_deleted(results)
+        return results
+
+    def _record_created(self, results):
+        """Add the paths successfully created in bulk to the ledger."""
+        for result in results:
+            if result['id'] is not None:
+                self._ledger.add_path(result['path'])
+
+    def _record_deleted(self, results):
+        """Release the ports of the paths successfully deleted in bulk."""
+        for result in results:
+            if result['deleted']:
+                self._ledger.remove_path(result['path'])
+
+
+def _create_result(path, path_id, status_code, error):
+    return {'path': path, 'id': path_id, 'status_code': status_code, 'error': error}
+
+
+def _delete_result(path, deleted, status_code, error):
+    return {'path': path, 'deleted': deleted, 'status_code': status_code, 'error': error}
@@ -1,4 +1,6 @@
 class OXC:
+    __slots__ = ('_label', '_switch', '_inPort', '_outPort')
+
     def __init__(self, label, switch, inPort, outPort):
         """
         Initialize an OXC object.
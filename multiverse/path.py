@@ -1,9 +1,9 @@
-import json
-
 from .oxc import OXC
 
 
 class Path:
+    __slots__ = ('_id', '_name', '_label', '_oxcs')
+
     def __init__(self, name, label):
         """
         Initialize a Path object.
@@ -102,13 +102,16 @@ class Path:
             print(f"    Label: {oxc.label}, Switch: {oxc.switch}, InPort: {oxc.inPort}, OutPort: {oxc.outPort}")
 
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, trusted=False):
         """
         Create a Path object from a dictionary.
 
         :param data: Dictionary containing path data
+        :param trusted: Skip the validation of the fields, for data coming from the server
         :return: Path object
         """
+        if trusted:
+            return cls._from_trusted_dict(data)
         path = cls(name=data["name"], label=data["label"])
         if "id" in data:
             path.id = data["id"]
@@ -118,6 +121,32 @@ class Path:
         return path
 
 
+    @classmethod
+    def _from_trusted_dict(cls, data):
+        """Create a Path object from a dictionary without validating its fields."""
+        path = cls.__new__(cls)
+        path._id = data.get("id", 0)
+        path._name = data["name"]
+        path._label = data["label"]
+        path._oxcs = [
+            OXC(oxc_data["label"], oxc_data["switch"], oxc_data["inPort"], oxc_data["outPort"])
+            for oxc_data in data.get("oxcs", [])
+        ]
+        return path
+
+    @classmethod
+    def from_dicts(cls, data_list, trusted=True):
+        """
+        Create Path objects from a list of dictionaries, such as a trail list from the server.
+
+        :param data_list: List of dictionaries containing path data
+        :param trusted: Skip the validation of the fields (default), see from_dict()
+        :return: List of Path objects
+        """
+        if trusted:
+            return [cls._from_trusted_dict(data) for data in data_list]
+        return [cls.from_dict(data) for data in data_list]
+
     @classmethod
     def from_computed_path(cls, computed_path, name=None, label=None):
         """
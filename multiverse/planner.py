@@ -0,0 +1,298 @@
+# multiverse/planner.py
+
+import heapq
+import time
+
+from .ledger import full_port_name
+from .path import Path
+from .utils import _port_occupancy, search_paths_many
+
+STRATEGIES = ('greedy', 'min-conflict', 'best', 'exact')
+
+
+class ProvisioningPlan:
+    """
+    Conflict-free assignment of candidate paths to demands.
+
+    Demands are identified by their index in the request, so a repeated demand asks
+    for as many paths.
+
+    :param demands: List of the (start_name, end_name) demands, in the order of the request
+    :param assignments: Dict of demand index to the chosen path information (search_paths format)
+    :param candidates: List of the feasible candidates of each demand
+    :param strategy: Strategy that produced the assignment
+    :param optimal: True if the assignment is proven to serve the most demands (exact strategy)
+    :param conflicts: Number of conflicting candidate pairs of the conflict graph
+    """
+
+    def __init__(self, demands, assignments, candidates, strategy, optimal=False, conflicts=0):
+        self.demands = demands
+        self.assignments = assignments
+        self.candidates = candidates
+        self.strategy = strategy
+        self.optimal = optimal
+        self.conflicts = conflicts
+
+    @property
+    def unassigned(self):
+        """Indexes of the demands left without a path, in the order of the request."""
+        return [index for index in range(len(self.demands)) if index not in self.assignments]
+
+    @property
+    def hops(self):
+        """Total number of links of the assigned paths."""
+        return sum(len(info['path']) - 1 for info in self.assignments.values())
+
+    def __len__(self):
+        return len(self.assignments)
+
+    def paths(self, name_format="TRAIL_{index}_{start}_TO_{end}"):
+        """
+        Return the assigned paths as Path objects, ready for Network.create_paths().
+
+        :param name_format: Format of the path names, with the fields index (of the
+            demand in the request), start and end (node names)
+        """
+        paths = []
+        for index, info in sorted(self.assignments.items()):
+            nodes = info['path']
+            paths.append(Path.from_computed_path(info, name=name_format.format(index=index, start=nodes[0],
+                                                                               end=nodes[-1])))
+        return paths
+
+    def to_dict(self):
+        return {
+            'strategy': self.strategy,
+            'optimal': self.optimal,
+            'assigned': len(self.assignments),
+            'unassigned': [[index, *self.demands[index]] for index in self.unassigned],
+            'hops': self.hops,
+            'conflicts': self.conflicts,
+        }
+
+    def __repr__(self):
+        return (f"ProvisioningPlan({len(self.assignments)}/{len(self.demands)} demands, "
+                f"strategy={self.strategy!r}, optimal={self.optimal})")
+
+
+def _candidate_ports(info):
+    """
+    Return the (node, 'NODE.port') pairs used by a candidate: the ports of its
+    cross-connects, and the ports its first and last links use at its ends.
+    """
+    ports = {(cc['switch'], full_port_name(cc['switch'], port))
+             for cc in info['cross_connects'] for port in (cc['inPort'], cc['outPort'])}
+    if len(info['path']) > 1:
+        # 'NODE (out:port)' and 'NODE (in:port)' entries of path_with_ports
+        for node, entry in ((info['path'][0], info['path_with_ports'][0]),
+                            (info['path'][-1], info['path_with_ports'][-1])):
+            port = entry[entry.rindex(':') + 1:-1]
+            ports.add((node, full_port_name(node, port)))
+    return frozenset(ports)
+
+
+class _ConflictGraph:
+    """Candidates of all demands, linked when they share a port or serve the same demand."""
+
+    def __init__(self, candidates):
+        self.demands = []       # demand index of each candidate
+        self.infos = []
+        self.ports = []         # frozenset of (node, 'NODE.port') of each candidate
+        self.hops = []
+        self.by_demand = []     # candidate indexes of each demand, in search order
+        for demand_idx, infos in enumerate(candidates):
+            indexes = []
+            for info in infos:
+                indexes.append(len(self.infos))
+                self.demands.append(demand_idx)
+                self.infos.append(info)
+                self.ports.append(_candidate_ports(info))
+                self.hops.append(len(info['path']) - 1)
+            self.by_demand.append(indexes)
+
+        users = {}
+        for idx, ports in enumerate(self.ports):
+            for port in ports:
+                users.setdefault(port, []).append(idx)
+        # Only conflicts between different demands; candidates of a demand exclude each other anyway
+        self.conflicts = [set() for _ in self.infos]
+        for indexes in users.values():
+            for idx in indexes:
+                self.conflicts[idx].update(other for other in indexes if self.demands[other] != self.demands[idx])
+        self.edges = sum(len(conflicts) for conflicts in self.conflicts) // 2
+
+    def fill(self, chosen):
+        """Assign the free candidate with the fewest hops to every demand that still has one."""
+        used = set()
+        for idx in chosen.values():
+            used.update(self.ports[idx])
+        for demand_idx, indexes in enumerate(self.by_demand):
+            if demand_idx in chosen:
+                continue
+            options = [idx for idx in indexes if used.isdisjoint(self.ports[idx])]
+            if options:
+                idx = min(options, key=lambda idx: self.hops[idx])
+                chosen[demand_idx] = idx
+                used.update(self.ports[idx])
+        return chosen
+
+    def greedy(self):
+        """Most constrained demands first, each taking its free candidate with the fewest conflicts."""
+        order = sorted(range(len(self.by_demand)), key=lambda demand_idx: len(self.by_demand[demand_idx]))
+        used = set()
+        chosen = {}
+        for demand_idx in order:
+            options = [idx for idx in self.by_demand[demand_idx] if used.isdisjoint(self.ports[idx])]
+            if options:
+                idx = min(options, key=lambda idx: (len(self.conflicts[idx]), self.hops[idx]))
+                chosen[demand_idx] = idx
+                used.update(self.ports[idx])
+        return chosen
+
+    def min_conflict(self):
+        """
+        Repeatedly take the candidate with the fewest remaining conflicts (an independent
+        set heuristic), then remove its conflicting candidates and those of its demand.
+        """
+        alive = [True] * len(self.infos)
+        degree = [len(conflicts) + len(self.by_demand[self.demands[idx]]) - 1
+                  for idx, conflicts in enumerate(self.conflicts)]
+        heap = [(degree[idx], self.hops[idx], idx) for idx in range(len(self.infos))]
+        heapq.heapify(heap)
+        chosen = {}
+        while heap:
+            idx_degree, _, idx = heapq.heappop(heap)
+            if not alive[idx] or idx_degree != degree[idx]:
+                continue
+            chosen[self.demands[idx]] = idx
+            removed = set(self.conflicts[idx]) | set(self.by_demand[self.demands[idx]])
+            for other in removed:
+                if not alive[other]:
+                    continue
+                alive[other] = False
+                # Neighbours of a removed candidate lose a conflict
+                neighbours = set(self.conflicts[other]) | set(self.by_demand[self.demands[other]])
+                for neighbour in neighbours:
+                    if alive[neighbour] and neighbour != other:
+                        degree[neighbour] -= 1
+                        heapq.heappush(heap, (degree[neighbour], self.hops[neighbour], neighbour))
+        return chosen
+
+    def exact(self, initial, deadline=None):
+        """
+        Branch and bound maximizing the number of served demands, then minimizing the
+        number of hops, starting from an initial assignment. Each step branches on the
+        demand with the fewest free candidates; the bound counts the demands that still
+        have one, with their fewest hops.
+
+        :return: Tuple (assignment, True if proven optimal)
+        """
+        best = {'chosen': dict(initial), 'count': len(initial),
+                'hops': sum(self.hops[idx] for idx in initial.values())}
+        state = {'steps': 0, 'complete': True}
+        used = set()
+        chosen = {}
+
+        def search(remaining, count, hops):
+            state['steps'] += 1
+            if deadline is not None and state['steps'] % 256 == 0 and time.monotonic() > deadline:
+                state['complete'] = False
+            if not state['complete']:
+                return
+            options = {}
+            for demand_idx in remaining:
+                free = [idx for idx in self.by_demand[demand_idx] if used.isdisjoint(self.ports[idx])]
+                if free:
+                    options[demand_idx] = free
+            bound = count + len(options)
+            bound_hops = hops + sum(min(self.hops[idx] for idx in free) for free in options.values())
+            if bound < best['count'] or (bound == best['count'] and bound_hops >= best['hops']):
+                return
+            if not options:
+                best.update(chosen=dict(chosen), count=count, hops=hops)
+                return
+            demand_idx = min(options, key=lambda demand_idx: len(options[demand_idx]))
+            rest = [other for other in options if other != demand_idx]
+            for idx in sorted(options[demand_idx], key=lambda idx: self.hops[idx]):
+                chosen[demand_idx] = idx
+                used.update(self.ports[idx])
+                search(rest, count + 1, hops + self.hops[idx])
+                used.difference_update(self.ports[idx])
+                del chosen[demand_idx]
+            search(rest, count, hops)
+
+        search([demand_idx for demand_idx, indexes in enumerate(self.by_demand) if indexes], 0, 0)
+        return best['chosen'], state['complete']
+
+
+def plan_paths(graph, demands, paths_data, k=8, strategy='best', exact_limit=20, time_budget=None,
+               weight=None, processes=None):
+    """
+    Chooses a conflict-free path for as many demands as possible.
+
+    The candidates of every demand are its k shortest feasible paths, searched over
+    the free ports (see search_paths_many with only_possible). Candidates of
+    different demands conflict when they share a port, at a cross-connect or at the
+    ends of the path. A conflict-free assignment is then picked with the given strategy:
+
+    - 'greedy': the demands with the fewest candidates first, each taking its free
+      candidate with the fewest conflicts.
+    - 'min-conflict': the candidate with the fewest remaining conflicts first, over all demands.
+    - 'best': both heuristics, keeping the assignment serving the most demands (then
+      with the fewest hops).
+    - 'exact': a branch and bound, seeded with 'best', that serves the most demands
+      (then with the fewest hops). Only for up to exact_limit demands with candidates;
+      with a time_budget, the best assignment found in time is returned.
+
+    Every assignment is maximal: no unassigned demand has a candidate free of conflicts.
+
+    Parameters:
+    - graph: The NetworkX graph, or a CompactTopology.
+    - demands: Iterable of (start_name, end_name) tuples, with optional ports (e.g., ('SOURCE.1', 'DETECTOR')).
+      A demand given n times asks for n paths.
+    - paths_data: The established Path objects, or a PortLedger of them.
+    - k: The maximum number of candidates per demand, or None for all their feasible paths (without weight).
+    - strategy: One of 'greedy', 'min-conflict', 'best' or 'exact'.
+    - exact_limit: Largest number of demands the exact strategy accepts.
+    - time_budget: Optional, with the exact strategy, stop the search after this many seconds.
+    - weight: Optional, the edge attribute or function ranking the candidates instead of the hop count.
+    - processes: Optional, the number of worker processes searching the candidates.
+
+    Returns:
+    ProvisioningPlan: The assignment; plan.paths() gives the Path objects to create.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}'. Expected one of: {', '.join(STRATEGIES)}")
+    demands = [tuple(demand) for demand in demands]
+    ledger = _port_occupancy(paths_data)
+    results = search_paths_many(graph, demands, ledger, processes=processes, k=k, weight=weight,
+                                only_possible=True)
+    # Established candidates are already provisioned: only new paths are planned. The
+    # candidates of a repeated demand are shared; they conflict, so each is assigned once.
+    candidates = [
+        [info for info in results[demand] if info['is_possible'] and not info['is_established']]
+        for demand in demands
+    ]
+    conflict_graph = _ConflictGraph(candidates)
+
+    def score(chosen):
+        return len(chosen), -sum(conflict_graph.hops[idx] for idx in chosen.values())
+
+    optimal = False
+    if strategy == 'greedy':
+        chosen = conflict_graph.greedy()
+    elif strategy == 'min-conflict':
+        chosen = conflict_graph.min_conflict()
+    else:
+        chosen = max(conflict_graph.greedy(), conflict_graph.min_conflict(), key=score)
+        if strategy == 'exact':
+            served = sum(1 for indexes in conflict_graph.by_demand if indexes)
+            if served > exact_limit:
+                raise ValueError(f"The exact strategy is limited to {exact_limit} demands with candidates, "
+                                 f"got {served}. Use a heuristic strategy or raise exact_limit.")
+            deadline = time.monotonic() + time_budget if time_budget is not None else None
+            chosen, optimal = conflict_graph.exact(chosen, deadline)
+    chosen = conflict_graph.fill(chosen)
+
+    assignments = {demand_idx: conflict_graph.infos[idx] for demand_idx, idx in sorted(chosen.items())}
+    return ProvisioningPlan(demands, assignments, candidates, strategy, optimal, conflict_graph.edges)
@@ -0,0 +1,154 @@
+# multiverse/search_cache.py
+
+import threading
+from collections import OrderedDict
+
+
+class SearchCache:
+    """
+    Least-recently-used cache of path search results.
+
+    Results are keyed by (topology fingerprint, occupancy fingerprint, start, end,
+    search options), so a result is only reused while neither the graph nor the
+    port occupancy changed. Entries can also be grouped by scope (e.g. one scope per
+    network) and dropped with invalidate() as soon as their state changes, instead
+    of waiting to be evicted.
+
+    The cache is bounded both by the number of entries and by the total number of
+    paths they hold. One cache can be shared by the networks of several threads.
+
+    :param maxsize: Maximum number of cached searches
+    :param max_paths: Maximum total number of cached paths (None for no limit)
+    """
+
+    def __init__(self, maxsize=256, max_paths=100000):
+        self.maxsize = maxsize
+        self.max_paths = max_paths
+        self._entries = OrderedDict()    # key -> (scope, result)
+        self._paths = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(topology_fingerprint, occupancy_fingerprint, start_name, end_name, options=None):
+        """
+        Return the cache key of a search, or None if it cannot be cached (unhashable options).
+
+        :param options: Dict of the search options that change the result
+        """
+        key = (topology_fingerprint, occupancy_fingerprint, start_name, end_name,
+               tuple(sorted((options or {}).items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """Return the cached result of a key, or None, counting a hit or a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, result, scope=None):
+        """Store the result (list of paths) of a key, evicting the least recently used entries."""
+        size = len(result)
+        if self.maxsize <= 0 or (self.max_paths is not None and size > self.max_paths):
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._paths -= len(old[1])
+            self._entries[key] = (scope, result)
+            self._paths += size
+            while len(self._entries) > self.maxsize or (self.max_paths is not None and self._paths > self.max_paths):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._paths -= len(evicted)
+                self.evictions += 1
+
+    def get_or_search(self, key, search, scope=None):
+        """
+        Return the cached result of a key, or call search() and cache its result.
+
+        A None key or a None result is not cached. The returned list is a copy; the
+        path dictionaries in it are shared with the cache and must not be modified.
+        """
+        if key is None:
+            return search()
+        result = self.get(key)
+        if result is None:
+            result = search()
+            if result is None:
+                return None
+            self.put(key, result, scope)
+        return list(result)
+
+    def invalidate(self, scope=None):
+        """
+        Drop the entries of a scope (all entries if scope is None).
+
+        :return: Number of entries dropped
+        """
+        with self._lock:
+            if scope is None:
+                keys = list(self._entries)
+            else:
+                keys = [key for key, (entry_scope, _) in self._entries.items() if entry_scope == scope]
+            for key in keys:
+                _, result = self._entries.pop(key)
+                self._paths -= len(result)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self):
+        """Drop all entries and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._paths = 0
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self):
+        """Return the hit/miss statistics and the current size of the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'entries': len(self._entries),
+                'paths': self._paths,
+                'maxsize': self.maxsize,
+                'max_paths': self.max_paths,
+            }
+
+    def __repr__(self):
+        stats = self.stats()
+        return (f"SearchCache(entries={stats['entries']}/{self.maxsize}, paths={stats['paths']}, "
+                f"hits={stats['hits']}, misses={stats['misses']})")
+
+
+def make_search_cache(search_cache):
+    """Accept None/False (no cache), True (default size), a maximum number of entries or a SearchCache."""
+    if search_cache is None or search_cache is False:
+        return None
+    if search_cache is True:
+        return SearchCache()
+    if isinstance(search_cache, int):
+        return SearchCache(maxsize=search_cache)
+    return search_cache
@@ -0,0 +1,136 @@
+# multiverse/snapshot.py
+
+import os
+import sqlite3
+import threading
+import time
+
+from .codec import get_codec
+
+
+def default_snapshot_path():
+    """Return the default snapshot database, under $XDG_CACHE_HOME or ~/.cache."""
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "multiverse", "snapshots.sqlite3")
+
+
+class Snapshot:
+    """
+    Topology and paths of a network as last saved.
+
+    :param topology: Topology dictionary as returned by the server, or None
+    :param etag: ETag of the topology response, to revalidate it
+    :param last_modified: Last-Modified of the topology response
+    :param paths: List of path dictionaries (Path.to_dict()), or None if never saved
+    :param saved_at: Wall-clock time of the last save
+    """
+
+    def __init__(self, topology, etag, last_modified, paths, saved_at):
+        self.topology = topology
+        self.etag = etag
+        self.last_modified = last_modified
+        self.paths = paths
+        self.saved_at = saved_at
+
+
+class SnapshotStore:
+    """
+    SQLite store of network snapshots (topology and paths with their cross-connects),
+    keyed by server URL and network ID, so that a new process can start from the
+    last known state instead of downloading everything first. The ID/name maps and
+    the graph are rebuilt from the stored topology when a snapshot is loaded.
+
+    One store can be shared by the networks of several threads.
+
+    :param path: Database file (default: default_snapshot_path())
+    :param codec: JSON codec or codec name used to serialize the snapshots
+    """
+
+    def __init__(self, path=None, codec=None):
+        self.path = path or default_snapshot_path()
+        self._codec = get_codec(codec)
+        self._lock = threading.Lock()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                " server TEXT NOT NULL,"
+                " network_id TEXT NOT NULL,"
+                " topology BLOB,"
+                " etag TEXT,"
+                " last_modified TEXT,"
+                " paths BLOB,"
+                " saved_at REAL NOT NULL,"
+                " PRIMARY KEY (server, network_id))"
+            )
+
+    def _upsert(self, server, network_id, columns):
+        names = ", ".join(columns)
+        placeholders = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{name} = excluded.{name}" for name in columns)
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT INTO snapshots (server, network_id, {names}, saved_at)"
+                f" VALUES (?, ?, {placeholders}, ?)"
+                f" ON CONFLICT (server, network_id) DO UPDATE SET {updates}, saved_at = excluded.saved_at",
+                (server, str(network_id), *columns.values(), time.time()),
+            )
+
+    def save_topology(self, server, network_id, topology, etag=None, last_modified=None):
+        """Store the topology of a network with its validators."""
+        self._upsert(server, network_id, {
+            'topology': self._codec.dumps(topology),
+            'etag': etag,
+            'last_modified': last_modified,
+        })
+
+    def save_paths(self, server, network_id, paths):
+        """Store the paths of a network (Path objects)."""
+        self._upsert(server, network_id, {'paths': self._codec.dumps([path.to_dict() for path in paths])})
+
+    def load(self, server, network_id):
+        """
+        Return the snapshot of a network.
+
+        :return: Snapshot, or None if nothing was saved for this network
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT topology, etag, last_modified, paths, saved_at FROM snapshots"
+                " WHERE server = ? AND network_id = ?",
+                (server, str(network_id)),
+            ).fetchone()
+        if row is None:
+            return None
+        topology, etag, last_modified, paths, saved_at = row
+        return Snapshot(
+            self._codec.loads(topology, 'topology') if topology is not None else None,
+            etag,
+            last_modified,
+            self._codec.loads(paths) if paths is not None else None,
+            saved_at,
+        )
+
+    def delete(self, server, network_id):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM snapshots WHERE server = ? AND network_id = ?",
+                                     (server, str(network_id)))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def make_snapshot_store(snapshot_store):
+    """Accept None/False (no store), True (default location), a path or a SnapshotStore."""
+    if not snapshot_store:
+        return None
+    if snapshot_store is True:
+        return SnapshotStore()
+    if isinstance(snapshot_store, (str, os.PathLike)):
+        return SnapshotStore(os.fspath(snapshot_store))
+    return snapshot_store
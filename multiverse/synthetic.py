@@ -0,0 +1,221 @@
+# multiverse/synthetic.py
+
+import random
+
+from .path import Path
+
+
+class TopologyBuilder:
+    """
+    Builds topology dictionaries in the format returned by the server
+    (nodes with vltps, links between ports), allocating IDs and ports.
+    """
+
+    def __init__(self, ports_per_switch=16):
+        self.ports_per_switch = ports_per_switch
+        self._next_id = 1
+        self._nodes = []
+        self._links = []
+        self._nodes_by_name = {}
+        self._free_ports = {}   # node name -> list of unused vltps
+
+    def _new_id(self):
+        new_id = self._next_id
+        self._next_id += 1
+        return new_id
+
+    def add_node(self, name, node_type='SWITCH', num_ports=None):
+        """Add a node with num_ports ports named 'NAME.1' to 'NAME.n'."""
+        num_ports = self.ports_per_switch if num_ports is None else num_ports
+        node = {'id': self._new_id(), 'name': name, 'type': node_type, 'vltps': []}
+        for port in range(1, num_ports + 1):
+            node['vltps'].append({'id': self._new_id(), 'name': f"{name}.{port}"})
+        self._nodes.append(node)
+        self._nodes_by_name[name] = node
+        self._free_ports[name] = list(node['vltps'])
+        return node
+
+    def _take_port(self, node_name):
+        if not self._free_ports[node_name]:
+            raise ValueError(f"No free port left on node '{node_name}'.")
+        return self._free_ports[node_name].pop(0)
+
+    def add_link(self, src_name, dest_name):
+        """Add a directed link between the next free ports of two nodes."""
+        src_port = self._take_port(src_name)
+        dest_port = self._take_port(dest_name)
+        link = {
+            'id': self._new_id(),
+            'name': f"{src_port['name']}_{dest_port['name']}",
+            'srcVnodeId': self._nodes_by_name[src_name]['id'],
+            'srcVltpId': src_port['id'],
+            'destVnodeId': self._nodes_by_name[dest_name]['id'],
+            'destVltpId': dest_port['id'],
+        }
+        self._links.append(link)
+        return link
+
+    def add_fiber(self, name_a, name_b, links=1):
+        """Add links parallel links in each direction between two nodes."""
+        for _ in range(links):
+            self.add_link(name_a, name_b)
+            self.add_link(name_b, name_a)
+
+    def add_endpoints(self, source_switches, detector_switches, num_ports=2):
+        """Add a SOURCE and a DETECTOR with num_ports ports, linked to the given switches in turn."""
+        self.add_node("SOURCE", 'SOURCE', num_ports)
+        self.add_node("DETECTOR", 'DETECTOR', num_ports)
+        for idx in range(num_ports):
+            self.add_link("SOURCE", source_switches[idx % len(source_switches)])
+            self.add_link(detector_switches[idx % len(detector_switches)], "DETECTOR")
+
+    def build(self):
+        return {'nodes': self._nodes, 'links': self._links}
+
+
+def ring_topology(num_switches, ports_per_switch=16, links_per_hop=1, num_endpoint_ports=2):
+    """
+    Ring of switches, with links_per_hop parallel links in each direction between neighbours.
+    SOURCE is attached to the first switch and DETECTOR to the opposite one.
+
+    :return: Topology dictionary in server format
+    """
+    builder = TopologyBuilder(ports_per_switch)
+    names = [f"SW{idx}" for idx in range(num_switches)]
+    for name in names:
+        builder.add_node(name)
+    for idx, name in enumerate(names):
+        if num_switches > 2 or idx == 0:
+            builder.add_fiber(name, names[(idx + 1) % num_switches], links_per_hop)
+    builder.add_endpoints([names[0]], [names[num_switches // 2]], num_endpoint_ports)
+    return builder.build()
+
+
+def grid_topology(rows, cols, ports_per_switch=16, links_per_hop=1, num_endpoint_ports=2):
+    """
+    Rows x cols grid of switches connected to their horizontal and vertical neighbours.
+    SOURCE is attached to the top-left switch and DETECTOR to the bottom-right one.
+
+    :return: Topology dictionary in server format
+    """
+    builder = TopologyBuilder(ports_per_switch)
+    for row in range(rows):
+        for col in range(cols):
+            builder.add_node(f"SW{row}_{col}")
+    for row in range(rows):
+        for col in range(cols):
+            if col + 1 < cols:
+                builder.add_fiber(f"SW{row}_{col}", f"SW{row}_{col + 1}", links_per_hop)
+            if row + 1 < rows:
+                builder.add_fiber(f"SW{row}_{col}", f"SW{row + 1}_{col}", links_per_hop)
+    builder.add_endpoints(["SW0_0"], [f"SW{rows - 1}_{cols - 1}"], num_endpoint_ports)
+    return builder.build()
+
+
+def mesh_topology(num_switches, degree=4, ports_per_switch=32, links_per_hop=1, num_endpoint_ports=2, seed=0):
+    """
+    Fat mesh: a ring for connectivity plus random chords until every switch has about
+    degree neighbours, with links_per_hop parallel links per neighbour pair.
+
+    :return: Topology dictionary in server format
+    """
+    rng = random.Random(seed)
+    builder = TopologyBuilder(ports_per_switch)
+    names = [f"SW{idx}" for idx in range(num_switches)]
+    for name in names:
+        builder.add_node(name)
+    pairs = set()
+    for idx in range(num_switches):
+        pairs.add(tuple(sorted((idx, (idx + 1) % num_switches))))
+    neighbours = {idx: 2 for idx in range(num_switches)}
+    candidates = [(a, b) for a in range(num_switches) for b in range(a + 1, num_switches)]
+    rng.shuffle(candidates)
+    for a, b in candidates:
+        if (a, b) not in pairs and neighbours[a] < degree and neighbours[b] < degree:
+            pairs.add((a, b))
+            neighbours[a] += 1
+            neighbours[b] += 1
+    for a, b in sorted(pairs):
+        if a != b:
+            builder.add_fiber(names[a], names[b], links_per_hop)
+    builder.add_endpoints([names[0]], [names[num_switches // 2]], num_endpoint_ports)
+    return builder.build()
+
+
+def trunk_topology(num_switches, links_per_trunk=4, ports_per_switch=32, num_endpoint_ports=2):
+    """
+    Chain of switches connected by multi-link trunks (links_per_trunk parallel links in
+    each direction). SOURCE is attached to the first switch and DETECTOR to the last one.
+
+    :return: Topology dictionary in server format
+    """
+    builder = TopologyBuilder(ports_per_switch)
+    names = [f"SW{idx}" for idx in range(num_switches)]
+    for name in names:
+        builder.add_node(name)
+    for idx in range(num_switches - 1):
+        builder.add_fiber(names[idx], names[idx + 1], links_per_trunk)
+    builder.add_endpoints([names[0]], [names[-1]], num_endpoint_ports)
+    return builder.build()
+
+
+def establish_trails(graph, count, seed=0, candidates=8):
+    """
+    Generate a load of non-conflicting established paths between random switches.
+
+    :param graph: Graph of the topology, from topology_to_graph
+    :param count: Number of paths to generate (fewer are returned if the topology is full)
+    :param seed: Seed of the random generator
+    :param candidates: Number of shortest candidates tried per random demand
+    :return: List of Path objects
+    """
+    from .ledger import PortLedger
+    from .utils import search_paths
+
+    rng = random.Random(seed)
+    switches = [node for node, data in graph.nodes(data=True) if data.get('type') == 'SWITCH']
+    ledger = PortLedger()
+    paths = []
+    attempts = 0
+    while len(paths) < count and attempts < count * 10 and len(switches) > 1:
+        attempts += 1
+        start, end = rng.sample(switches, 2)
+        for info in search_paths(graph, start, end, ledger, k=candidates):
+            if info['is_possible'] and not info['is_established'] and info['cross_connects']:
+                idx = len(paths)
+                path = Path.from_computed_path(info, name=f"LOAD_{idx}", label=f"LOAD_{idx}")
+                path.id = idx + 1
+                ledger.add_path(path)
+                paths.append(path)
+                break
+    return paths
+
+
+def trails_to_server(topology, paths):
+    """
+    Convert Path objects to trail dictionaries in server format, with their
+    cross-connects as 'vxcs' of switch and port IDs (e.g. for the mock server).
+    """
+    node_ids = {}
+    port_ids = {}
+    for node in topology['nodes']:
+        node_ids[node['name']] = node['id']
+        for port in node['vltps']:
+            port_ids[port['name']] = port['id']
+
+    def port_id(switch, port):
+        return port_ids[port if port.startswith(f"{switch}.") else f"{switch}.{port}"]
+
+    trails = []
+    for path in paths:
+        vxcs = [{
+            'name': "",
+            'label': oxc.label,
+            'description': "",
+            'switchId': node_ids[oxc.switch],
+            'ingressPortId': port_id(oxc.switch, oxc.inPort),
+            'egressPortId': port_id(oxc.switch, oxc.outPort),
+        } for oxc in path.oxcs]
+        trails.append({'name': path.name, 'label': path.label, 'description': "",
+                       'status': "PENDING", 'vxcs': vxcs})
+    return trails
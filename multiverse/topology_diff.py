@@ -0,0 +1,230 @@
+# multiverse/topology_diff.py
+
+
+class TopologyDelta:
+    """
+    Differences between two topology dictionaries, by ID.
+
+    Every attribute is a list of IDs: nodes, ports (vltps) and links that were added,
+    removed or changed (any field differs; for nodes, any field but their vltps). Ports
+    of added or removed nodes are listed as added or removed ports too, and port_nodes
+    is the set of IDs of the nodes whose ports were compared (those whose vltps differ).
+    affected_nodes is the set of node names, before and after the change, whose node,
+    ports or links changed, for callers that invalidate caches per node.
+    """
+
+    def __init__(self):
+        self.added_nodes = []
+        self.removed_nodes = []
+        self.changed_nodes = []
+        self.added_ports = []
+        self.removed_ports = []
+        self.changed_ports = []
+        self.added_links = []
+        self.removed_links = []
+        self.changed_links = []
+        self.port_nodes = set()
+        self.affected_nodes = set()
+        self.full_rebuild = False
+
+    def __len__(self):
+        return (len(self.added_nodes) + len(self.removed_nodes) + len(self.changed_nodes)
+                + len(self.added_ports) + len(self.removed_ports) + len(self.changed_ports)
+                + len(self.added_links) + len(self.removed_links) + len(self.changed_links))
+
+    def __bool__(self):
+        return len(self) > 0 or self.full_rebuild
+
+    def to_dict(self):
+        return {
+            'nodes': {'added': self.added_nodes, 'removed': self.removed_nodes, 'changed': self.changed_nodes},
+            'ports': {'added': self.added_ports, 'removed': self.removed_ports, 'changed': self.changed_ports},
+            'links': {'added': self.added_links, 'removed': self.removed_links, 'changed': self.changed_links},
+            'affected_nodes': sorted(self.affected_nodes, key=str),
+            'full_rebuild': self.full_rebuild,
+        }
+
+    def __repr__(self):
+        return (f"TopologyDelta(nodes +{len(self.added_nodes)} -{len(self.removed_nodes)} ~{len(self.changed_nodes)}, "
+                f"ports +{len(self.added_ports)} -{len(self.removed_ports)} ~{len(self.changed_ports)}, "
+                f"links +{len(self.added_links)} -{len(self.removed_links)} ~{len(self.changed_links)})")
+
+
+class _TopologyIndex:
+    """Nodes and links of a topology dictionary by ID, with port names resolved on demand."""
+
+    def __init__(self, topology):
+        self.nodes = {node['id']: node for node in topology['nodes']}
+        self.links = {link['id']: link for link in topology.get('links', [])}
+        self._node_ports = {}      # node ID -> {port ID: port name}
+        self._all_ports = None
+
+    def node_name(self, node_id):
+        node = self.nodes.get(node_id)
+        return node.get('name', '') if node is not None else None
+
+    def node_ports(self, node_id):
+        """Return the ports of a node as a dict of port ID to port dict."""
+        node = self.nodes.get(node_id)
+        return {port['id']: port for port in node.get('vltps', [])} if node is not None else {}
+
+    def port_name(self, node_id, port_id):
+        """Return the name of a port, looked up in its node first (as topology_to_graph, '' if unknown)."""
+        names = self._node_ports.get(node_id)
+        if names is None:
+            names = self._node_ports[node_id] = {
+                port_id: port.get('name', '') for port_id, port in self.node_ports(node_id).items()}
+        if port_id in names:
+            return names[port_id]
+        if self._all_ports is None:
+            self._all_ports = {port['id']: port.get('name', '')
+                               for node in self.nodes.values() for port in node.get('vltps', [])}
+        return self._all_ports.get(port_id, '')
+
+    def has_unique_names(self):
+        return len({node.get('name', '') for node in self.nodes.values()}) == len(self.nodes)
+
+
+def _diff_by_id(old, new, same=None):
+    """Return the added, removed and changed keys of two dicts, in the order of new then old."""
+    added = [key for key in new if key not in old]
+    removed = [key for key in old if key not in new]
+    if same is None:
+        changed = [key for key in new if key in old and new[key] != old[key]]
+    else:
+        changed = [key for key in new if key in old and not same(old[key], new[key])]
+    return added, removed, changed
+
+
+def _same_node(old_node, new_node):
+    """Compare two nodes without their ports, which are compared separately."""
+    if len(old_node) != len(new_node):
+        return False
+    return all(key == 'vltps' or new_node.get(key) == value for key, value in old_node.items())
+
+
+def diff_topologies(old_topology, new_topology):
+    """
+    Compare two topology dictionaries (nodes, vltps and links by ID).
+
+    :param old_topology: Previous topology dictionary
+    :param new_topology: New topology dictionary
+    :return: TopologyDelta
+    """
+    return _diff(_TopologyIndex(old_topology), _TopologyIndex(new_topology))
+
+
+def _diff(old, new):
+    delta = TopologyDelta()
+    delta.added_nodes, delta.removed_nodes, delta.changed_nodes = _diff_by_id(old.nodes, new.nodes, _same_node)
+    if old.links != new.links:
+        delta.added_links, delta.removed_links, delta.changed_links = _diff_by_id(old.links, new.links)
+
+    # Only the ports of nodes whose vltps differ can have changed
+    delta.port_nodes = set(delta.added_nodes) | set(delta.removed_nodes)
+    for node_id in old.nodes.keys() & new.nodes.keys():
+        if old.nodes[node_id].get('vltps') != new.nodes[node_id].get('vltps'):
+            delta.port_nodes.add(node_id)
+    old_ports = {}
+    new_ports = {}
+    for node_id in delta.port_nodes:
+        for index, ports in ((old, old_ports), (new, new_ports)):
+            for port_id, port in index.node_ports(node_id).items():
+                ports[port_id] = (node_id, port)
+    delta.added_ports, delta.removed_ports, delta.changed_ports = _diff_by_id(old_ports, new_ports)
+
+    for node_id in delta.removed_nodes + delta.changed_nodes:
+        delta.affected_nodes.add(old.node_name(node_id))
+    for node_id in delta.added_nodes + delta.changed_nodes:
+        delta.affected_nodes.add(new.node_name(node_id))
+    for index, ports, port_ids in ((old, old_ports, delta.removed_ports + delta.changed_ports),
+                                   (new, new_ports, delta.added_ports + delta.changed_ports)):
+        for port_id in port_ids:
+            delta.affected_nodes.add(index.node_name(ports[port_id][0]))
+    for index, link_ids in ((old, delta.removed_links + delta.changed_links),
+                            (new, delta.added_links + delta.changed_links)):
+        for link_id in link_ids:
+            link = index.links[link_id]
+            delta.affected_nodes.add(index.node_name(link['srcVnodeId']))
+            delta.affected_nodes.add(index.node_name(link['destVnodeId']))
+    delta.affected_nodes.discard(None)
+    return delta
+
+
+def _edge_args(index, link):
+    """Return the add_edge arguments of a link as built by topology_to_graph, or None if an endpoint is unknown."""
+    src = index.node_name(link['srcVnodeId'])
+    dest = index.node_name(link['destVnodeId'])
+    if src is None or dest is None:
+        return None
+    attributes = {
+        'name': link.get('name', ''),
+        'src_port': index.port_name(link['srcVnodeId'], link['srcVltpId']),
+        'dest_port': index.port_name(link['destVnodeId'], link['destVltpId']),
+    }
+    return src, dest, int(link['id']), attributes
+
+
+def _links_to_rebuild(old, new, delta):
+    """IDs of the links whose edge must be removed and added again."""
+    # Added elements too: a link to a previously unknown port ID changes its port name
+    changed_nodes = set(delta.added_nodes) | set(delta.removed_nodes) | set(delta.changed_nodes)
+    changed_ports = set(delta.added_ports) | set(delta.removed_ports) | set(delta.changed_ports)
+    link_ids = set(delta.removed_links) | set(delta.changed_links) | set(delta.added_links)
+    if not changed_nodes and not changed_ports:
+        return link_ids
+    for index in (old, new):
+        for link_id, link in index.links.items():
+            if (link['srcVnodeId'] in changed_nodes or link['destVnodeId'] in changed_nodes
+                    or link['srcVltpId'] in changed_ports or link['destVltpId'] in changed_ports):
+                link_ids.add(link_id)
+    return link_ids
+
+
+def apply_topology_delta(graph, old_topology, new_topology, max_fraction=0.25):
+    """
+    Update a graph built by topology_to_graph(old_topology) in place so that it has
+    the nodes, edges and attributes of topology_to_graph(new_topology).
+
+    Only the nodes and links that changed, and the links attached to changed nodes or
+    ports, are touched; the iteration order of re-added elements may differ from a
+    rebuilt graph. When the change is too large (more than max_fraction of the
+    elements) or node names are not unique, nothing is applied and the returned delta
+    has full_rebuild set: the caller should rebuild the graph instead.
+
+    :param graph: NetworkX MultiDiGraph of old_topology, modified in place
+    :param old_topology: Topology dictionary the graph was built from
+    :param new_topology: New topology dictionary
+    :param max_fraction: Largest delta size, relative to the number of elements, applied in place
+    :return: TopologyDelta
+    """
+    old = _TopologyIndex(old_topology)
+    new = _TopologyIndex(new_topology)
+    delta = _diff(old, new)
+    size = len(new.nodes) + len(new.links)
+    if len(delta) > max_fraction * max(size, 1) or not (old.has_unique_names() and new.has_unique_names()):
+        delta.full_rebuild = True
+        return delta
+
+    link_ids = _links_to_rebuild(old, new, delta)
+    for link_id in link_ids:
+        link = old.links.get(link_id)
+        edge = _edge_args(old, link) if link is not None else None
+        if edge is not None and graph.has_edge(edge[0], edge[1], edge[2]):
+            graph.remove_edge(edge[0], edge[1], edge[2])
+
+    new_names = {node.get('name', '') for node in new.nodes.values()}
+    for node_id in delta.removed_nodes + delta.changed_nodes:
+        name = old.node_name(node_id)
+        if name not in new_names and name in graph:
+            graph.remove_node(name)
+    for node_id in delta.added_nodes + delta.changed_nodes:
+        node = new.nodes[node_id]
+        graph.add_node(node.get('name', ''), type=node.get('type', ''))
+
+    for link_id in new.links:
+        if link_id in link_ids:
+            edge = _edge_args(new, new.links[link_id])
+            if edge is not None:
+                graph.add_edge(edge[0], edge[1], key=edge[2], **edge[3])
+    return delta
@@ -1,9 +1,284 @@
 # multiverse/utils.py
 
-import networkx as nx
-import matplotlib.pyplot as plt
+import heapq
+import os
+import threading
+import time
+from collections import deque
 
-def compute_all_paths(graph, start_name, end_name, start_port=None, end_port=None):
+from .compact import CompactTopology
+from .ledger import PortLedger
+
+
+def _distances_to_end(graph, start_name, end_name, end_port=None):
+    """
+    Return the number of hops from every node to end_name, for the nodes that can
+    reach it (breadth-first search over the predecessors).
+
+    Only edges a path can use are followed: the last hop must arrive on end_port if
+    given, and start_name is never an intermediate node so it is not expanded.
+    """
+    if end_name not in graph:
+        return {}
+    distances = {end_name: 0}
+    queue = deque()
+    for predecessor in graph.predecessors(end_name):
+        if end_port and all(edge_data['dest_port'] != end_port
+                            for edge_data in graph[predecessor][end_name].values()):
+            continue
+        distances[predecessor] = 1
+        queue.append(predecessor)
+    while queue:
+        node = queue.popleft()
+        if node == start_name:
+            continue
+        for predecessor in graph.predecessors(node):
+            if predecessor not in distances:
+                distances[predecessor] = distances[node] + 1
+                queue.append(predecessor)
+    return distances
+
+
+def iter_all_paths(graph, start_name, end_name, start_port=None, end_port=None, max_hops=None, deadline=None,
+                   processes=None):
+    """
+    Generates all possible simple paths between two nodes, including edge keys,
+    considering optional source and destination ports. Paths are yielded as soon
+    as the depth-first search finds them.
+
+    The search is iterative and skips neighbors that cannot reach end_name, or not
+    within max_hops, so it only walks branches that lead to a path; paths are found
+    in the same order as by an exhaustive search.
+
+    With processes and a CompactTopology, the search tree is split into the subtrees
+    of its first hops (deeper if there are too few) and the subtrees are searched by
+    a process pool, kept for the next searches of the same topology; paths are still
+    yielded in the same order. Searches that complete within _PARALLEL_MIN_DURATION
+    seconds are run in this process only. Convert a NetworkX graph once with
+    CompactTopology.from_graph() to search it in parallel.
+
+    Parameters:
+    - graph: The NetworkX graph, or a CompactTopology (required with processes).
+    - start_name: The name of the starting node.
+    - end_name: The name of the ending node.
+    - start_port: Optional, the source port name (e.g., 'SOURCE.1').
+    - end_port: Optional, the destination port name (e.g., 'DETECTOR.1').
+    - max_hops: Optional, the maximum number of edges of a path.
+    - deadline: Optional, a time.monotonic() value after which the search stops.
+    - processes: Optional, the number of worker processes searching the subtrees.
+
+    Yields:
+    list: A path, as a list of edges (from_node, to_node, edge_key).
+    """
+    if isinstance(graph, CompactTopology):
+        start = graph.node_index.get(start_name)
+        for edges in _iter_compact_edge_paths(graph, start_name, end_name, start_port, end_port, max_hops,
+                                              deadline, processes):
+            yield graph.edge_tuples(start, edges)
+        return
+
+    if start_name == end_name:
+        if not end_port:
+            yield []
+        return
+    if processes is not None and processes > 1:
+        raise ValueError("Parallel path searches need a CompactTopology: convert the graph once with "
+                         "CompactTopology.from_graph()")
+    successors = graph.successors(start_name)  # Raises if start_name is not in the graph
+    distances = _distances_to_end(graph, start_name, end_name, end_port)
+    if start_name not in distances:
+        return
+
+    # Outgoing edges worth following from each node, as (neighbor, key, index of the
+    # first edge to the next neighbor), so a visited neighbor is skipped in one step
+    out_edges = {}
+
+    def edges_from(node):
+        edges = out_edges.get(node)
+        if edges is None:
+            edges = []
+            for neighbor in (successors if node == start_name else graph.successors(node)):
+                if neighbor not in distances or neighbor == start_name:
+                    continue
+                first = len(edges)
+                for key, edge_data in graph[node][neighbor].items():
+                    if node == start_name and start_port and edge_data['src_port'] != start_port:
+                        continue
+                    if neighbor == end_name and end_port and edge_data['dest_port'] != end_port:
+                        continue
+                    edges.append([neighbor, key, None])
+                for edge in edges[first:]:
+                    edge[2] = len(edges)
+            out_edges[node] = edges
+        return edges
+
+    visited = {start_name}
+    nodes = [start_name]                 # nodes of the current partial path
+    edge_lists = [edges_from(start_name)]
+    positions = [0]                      # next edge to try from each node
+    path = []                            # edges of the current partial path
+    steps = 0
+    while nodes:
+        edges = edge_lists[-1]
+        position = positions[-1]
+        if position >= len(edges):
+            visited.discard(nodes.pop())
+            edge_lists.pop()
+            positions.pop()
+            if path:
+                path.pop()
+            continue
+        if deadline is not None:
+            steps += 1
+            if steps % 1024 == 0 and time.monotonic() > deadline:
+                return
+        neighbor, key, next_neighbor = edges[position]
+        if neighbor in visited or (max_hops is not None and len(path) + 1 + distances[neighbor] > max_hops):
+            positions[-1] = next_neighbor
+            continue
+        positions[-1] = position + 1
+        edge = (nodes[-1], neighbor, key)
+        if neighbor == end_name:
+            yield path + [edge]
+            continue
+        visited.add(neighbor)
+        path.append(edge)
+        nodes.append(neighbor)
+        edge_lists.append(edges_from(neighbor))
+        positions.append(0)
+
+
+# State shared by the tasks handled in a worker process (search_paths_many, parallel path enumeration)
+_worker_state = {}
+
+# Deepest split of the search tree, and subtrees wanted per worker process for load balancing
+_MAX_SPLIT_DEPTH = 4
+_SUBTREES_PER_PROCESS = 4
+# Parallel searches completing in this process within this many seconds do not use the pool
+_PARALLEL_MIN_DURATION = 0.2
+
+# Process pool of the parallel path enumerations, reused across searches (see _walk_executor)
+_walk_pool = {'executor': None, 'compact': None, 'processes': 0}
+_walk_pool_lock = threading.Lock()
+
+
+def _init_walk_worker(compact):
+    _worker_state['compact'] = compact
+
+
+def _walk_subtree_in_worker(setup, max_hops, deadline, prefix):
+    """
+    Return the paths starting with the edges of prefix, as two arrays (the edge
+    indices of all paths one after the other, and the length of each path), much
+    cheaper to send back than lists.
+    """
+    from array import array
+
+    compact = _worker_state['compact']
+    flat = array('l')
+    lengths = array('l')
+    for _, edges in compact.walk(*setup, max_hops=max_hops, deadline=deadline, prefix=prefix):
+        flat.extend(edges)
+        lengths.append(len(edges))
+    return flat, lengths
+
+
+def _split_paths(flat, lengths):
+    """Rebuild the lists of edge indices returned by _walk_subtree_in_worker."""
+    flat = flat.tolist()
+    position = 0
+    for length in lengths:
+        yield flat[position:position + length]
+        position += length
+
+
+def _available_cpus():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _walk_executor(compact, processes):
+    """
+    Return the process pool of the parallel searches. It is kept while the same
+    CompactTopology is searched with the same number of processes, so the workers
+    are started and receive the topology only once.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    with _walk_pool_lock:
+        if _walk_pool['compact'] is not compact or _walk_pool['processes'] != processes:
+            if _walk_pool['executor'] is not None:
+                # Tasks already submitted by other searches still complete
+                _walk_pool['executor'].shutdown(wait=False)
+            _walk_pool.update(executor=ProcessPoolExecutor(max_workers=processes, initializer=_init_walk_worker,
+                                                           initargs=(compact,)),
+                              compact=compact, processes=processes)
+        return _walk_pool['executor']
+
+
+def _iter_compact_edge_paths(compact, start_name, end_name, start_port, end_port, max_hops, deadline, processes):
+    """Enumerate the paths of a CompactTopology as lists of edge indices, over a process pool with processes."""
+    if processes is not None and start_name != end_name:
+        processes = min(processes, _available_cpus())
+    if processes is not None and processes > 1 and start_name != end_name:
+        return _iter_paths_parallel(compact, start_name, end_name, start_port, end_port, max_hops, deadline,
+                                    processes)
+    return compact.iter_edge_paths(start_name, end_name, start_port, end_port, max_hops, deadline)
+
+
+def _iter_paths_parallel(compact, start_name, end_name, start_port, end_port, max_hops, deadline, processes):
+    """
+    Enumerate the paths of a CompactTopology over a process pool, in the order of the
+    sequential search, as lists of edge indices.
+
+    The search first runs in this process for _PARALLEL_MIN_DURATION seconds: a small
+    search completes and is returned as is, without the cost of the pool.
+    """
+    setup = compact.search_setup(start_name, end_name, start_port, end_port)
+    if setup is None:
+        return
+    probe_deadline = time.monotonic() + _PARALLEL_MIN_DURATION
+    if deadline is not None and deadline <= probe_deadline:
+        for _, edges in compact.walk(*setup, max_hops=max_hops, deadline=deadline):
+            yield edges
+        return
+    paths = [edges for _, edges in compact.walk(*setup, max_hops=max_hops, deadline=probe_deadline)]
+    if time.monotonic() < probe_deadline:
+        yield from paths
+        return
+
+    # Split the search tree at the shallowest depth giving enough subtrees; the paths
+    # shorter than the split are found here, in their place in the search order
+    for depth in range(1, _MAX_SPLIT_DEPTH + 1):
+        items = list(compact.walk(*setup, max_hops=max_hops, deadline=deadline, split_depth=depth))
+        subtrees = sum(1 for complete, _ in items if not complete)
+        if subtrees == 0 or subtrees >= processes * _SUBTREES_PER_PROCESS:
+            break
+    if subtrees == 0:
+        for _, edges in items:
+            yield edges
+        return
+
+    # time.monotonic() is system-wide on the supported platforms, so workers honour the same deadline
+    executor = _walk_executor(compact, processes)
+    futures = [None if complete else executor.submit(_walk_subtree_in_worker, setup, max_hops, deadline, edges)
+               for complete, edges in items]
+    try:
+        for (_, edges), future in zip(items, futures):
+            if future is None:
+                yield edges
+                continue
+            yield from _split_paths(*future.result())
+    finally:
+        # Do not run the remaining subtrees when the caller stops early
+        for future in futures:
+            if future is not None:
+                future.cancel()
+
+
+def compute_all_paths(graph, start_name, end_name, start_port=None, end_port=None, processes=None):
     """
     Computes all possible simple paths between two nodes, including edge keys,
     considering optional source and destination ports.
@@ -14,44 +289,145 @@ def compute_all_paths(graph, start_name, end_name, start_port=None, end_port=Non
     - end_name: The name of the ending node.
     - start_port: Optional, the source port name (e.g., 'SOURCE.1').
     - end_port: Optional, the destination port name (e.g., 'DETECTOR.1').
+    - processes: Optional, the number of worker processes (see iter_all_paths).
 
     Returns:
     list: A list of paths, each path is a list of edges (from_node, to_node, edge_key).
     """
-    all_simple_paths = []
-    
-    def dfs(current_node, end_node, path, visited_nodes):
-        if current_node == end_node:
-            # If an end_port is specified, check if the last edge uses that port
-            if end_port:
-                if not path:
-                    return  # No edges in path, can't check end port
-                last_edge = path[-1]
-                edge_data = graph[last_edge[0]][last_edge[1]][last_edge[2]]
-                dest_port = edge_data['dest_port']
-                if dest_port != end_port:
-                    return  # Skip paths that don't end with the specified destination port
-            all_simple_paths.append(list(path))
-            return
-        for neighbor in graph.successors(current_node):
-            for key, edge_data in graph[current_node][neighbor].items():
-                if neighbor not in visited_nodes:
-                    # If at the starting node, check for start_port constraint
-                    if current_node == start_name and start_port:
-                        src_port = edge_data['src_port']
-                        if src_port != start_port:
-                            continue  # Skip edges that don't use the specified start port
-                    # Proceed to neighbor
-                    path.append((current_node, neighbor, key))
-                    visited_nodes.add(neighbor)
-                    dfs(neighbor, end_node, path, visited_nodes)
-                    path.pop()
-                    visited_nodes.remove(neighbor)
-    
-    # Initialize path as empty, visited_nodes contains start_name
-    dfs(start_name, end_name, [], set([start_name]))
-    
-    return all_simple_paths
+    return list(iter_all_paths(graph, start_name, end_name, start_port, end_port, processes=processes))
+
+
+def _edge_weight_function(weight):
+    """Return a function giving the weight of an edge (u, v, key, data): 1 per hop, an edge attribute or a callable."""
+    if weight is None:
+        return lambda u, v, key, data: 1
+    if callable(weight):
+        return weight
+    return lambda u, v, key, data: data.get(weight, 1)
+
+
+def _shortest_edge_path(graph, source, target, weight_fn, edge_allowed, blocked_nodes=(), blocked_edges=()):
+    """
+    Dijkstra over a MultiDiGraph returning the cheapest path as a list of edges.
+
+    Parameters:
+    - graph: The NetworkX graph.
+    - source: The name of the source node.
+    - target: The name of the target node.
+    - weight_fn: Function (u, v, key, data) returning the non-negative weight of an edge.
+    - edge_allowed: Function (u, v, key, data) returning False for edges that cannot be used.
+    - blocked_nodes: Nodes that cannot be visited.
+    - blocked_edges: Edges (from_node, to_node, edge_key) that cannot be used.
+
+    Returns:
+    tuple: (cost, list of edges (from_node, to_node, edge_key)), or (None, None) if target is unreachable.
+    """
+    distances = {source: 0}
+    previous = {}
+    heap = [(0, 0, source)]
+    counter = 1
+    done = set()
+    while heap:
+        cost, _, node = heapq.heappop(heap)
+        if node in done:
+            continue
+        done.add(node)
+        if node == target:
+            path_edges = []
+            while node != source:
+                edge = previous[node]
+                path_edges.append(edge)
+                node = edge[0]
+            path_edges.reverse()
+            return cost, path_edges
+        for neighbor in graph.successors(node):
+            if neighbor in done or neighbor in blocked_nodes:
+                continue
+            for key, edge_data in graph[node][neighbor].items():
+                edge = (node, neighbor, key)
+                if edge in blocked_edges or not edge_allowed(node, neighbor, key, edge_data):
+                    continue
+                new_cost = cost + weight_fn(node, neighbor, key, edge_data)
+                if neighbor not in distances or new_cost < distances[neighbor]:
+                    distances[neighbor] = new_cost
+                    previous[neighbor] = edge
+                    heapq.heappush(heap, (new_cost, counter, neighbor))
+                    counter += 1
+    return None, None
+
+
+def compute_k_shortest_paths(graph, start_name, end_name, k, start_port=None, end_port=None, weight=None,
+                             edge_filter=None):
+    """
+    Computes the k shortest simple paths between two nodes (Yen's algorithm over edge keys),
+    considering optional source and destination ports.
+
+    Parameters:
+    - graph: The NetworkX graph.
+    - start_name: The name of the starting node.
+    - end_name: The name of the ending node.
+    - k: The maximum number of paths to return.
+    - start_port: Optional, the source port name (e.g., 'SOURCE.1').
+    - end_port: Optional, the destination port name (e.g., 'DETECTOR.1').
+    - weight: Optional, the edge attribute holding the edge weight, or a function
+      (from_node, to_node, edge_key, edge_data) returning it. Defaults to the hop count.
+    - edge_filter: Optional, a function (from_node, to_node, edge_key, edge_data) returning
+      False for the edges the paths cannot use.
+
+    Returns:
+    list: Up to k paths ordered by total weight, each path is a list of edges (from_node, to_node, edge_key).
+    """
+    if k <= 0:
+        return []
+    if start_name == end_name:
+        return [] if end_port else [[]]
+
+    weight_fn = _edge_weight_function(weight)
+
+    def edge_allowed(u, v, key, edge_data):
+        if start_port and u == start_name and edge_data['src_port'] != start_port:
+            return False
+        if end_port and v == end_name and edge_data['dest_port'] != end_port:
+            return False
+        return edge_filter is None or edge_filter(u, v, key, edge_data)
+
+    def edges_cost(path_edges):
+        return sum(weight_fn(u, v, key, graph[u][v][key]) for u, v, key in path_edges)
+
+    cost, first_path = _shortest_edge_path(graph, start_name, end_name, weight_fn, edge_allowed)
+    if first_path is None:
+        return []
+
+    shortest_paths = [first_path]
+    seen = {tuple(first_path)}
+    candidates = []
+    counter = 0
+    while len(shortest_paths) < k:
+        last_path = shortest_paths[-1]
+        for i in range(len(last_path)):
+            spur_node = last_path[i][0]
+            root_edges = last_path[:i]
+            # Remove the edges leaving the spur node that already extend this root in a chosen path
+            blocked_edges = {p[i] for p in shortest_paths if len(p) > i and p[:i] == root_edges}
+            # Keep the path simple: the root nodes (before the spur node) cannot be revisited
+            blocked_nodes = {edge[0] for edge in root_edges}
+            spur_cost, spur_edges = _shortest_edge_path(
+                graph, spur_node, end_name, weight_fn, edge_allowed, blocked_nodes, blocked_edges
+            )
+            if spur_edges is None:
+                continue
+            candidate = root_edges + spur_edges
+            candidate_key = tuple(candidate)
+            if candidate_key in seen:
+                continue
+            seen.add(candidate_key)
+            heapq.heappush(candidates, (edges_cost(root_edges) + spur_cost, counter, candidate))
+            counter += 1
+        if not candidates:
+            break
+        shortest_paths.append(heapq.heappop(candidates)[2])
+
+    return shortest_paths
 
 
 def extract_cross_connects(graph, path_edges):
@@ -65,6 +441,9 @@ def extract_cross_connects(graph, path_edges):
     Returns:
     list: A list of cross-connects, each cross-connect is a dict with 'switch', 'inPort', 'outPort'.
     """
+    if isinstance(graph, CompactTopology):
+        return graph.extract_cross_connects(path_edges)
+
     cross_connects = []
     
     for i in range(1, len(path_edges)):
@@ -92,123 +471,353 @@ def extract_cross_connects(graph, path_edges):
     return cross_connects
 
 
-def search_paths(graph, start_name, end_name, paths_data):
+def _parse_endpoint(name):
+    """Split 'NODE.port' into ('NODE', 'NODE.port'); a bare 'NODE' gives ('NODE', None)."""
+    split = name.split(".")
+    if len(split) == 2:
+        return split[0], name
+    return name, None
+
+
+def _port_occupancy(paths_data):
+    """Return the PortLedger of the established paths, building it if a list of Path objects is given."""
+    if isinstance(paths_data, PortLedger):
+        return paths_data
+    return PortLedger(paths_data)
+
+
+def _check_feasibility(cross_connects, ledger):
     """
-    Finds all possible paths between two nodes, considering optional source and destination ports.
+    Check whether a candidate's cross-connects are established or use free ports.
+
+    Returns:
+    tuple: (is_established, is_possible, set of conflicting path names)
     """
-    # Get port number if specified
-    start_port = None
-    start_split = start_name.split(".")
-    if len(start_split) == 2:
-        start_port = start_name
-        start_name = start_split[0]
-
-    end_port = None
-    end_split = end_name.split(".")
-    if len(end_split) == 2:
-        end_port = end_name
-        end_name = end_split[0]
-
-    # Compute all possible simple paths with edges, considering port constraints
-    all_paths_with_edges = compute_all_paths(graph, start_name, end_name, start_port, end_port)
-
-    # Prepare a list of established cross-connect sequences and a mapping of used ports to path names
-    established_cross_connects = []
-    used_ports = {}  # mapping from (switch, port) to set of path names
-    for path in paths_data:
-        # For each cross-connect, store a tuple (switch, inPort, outPort)
-        cross_connects_seq = [(oxc.switch, oxc.inPort, oxc.outPort) for oxc in path.oxcs]
-        established_cross_connects.append(cross_connects_seq)
-        # Collect used ports and map them to the path name
-        for oxc in path.oxcs:
-            # For inPort
-            port_key_rx = (oxc.switch, oxc.inPort)
-            if port_key_rx not in used_ports:
-                used_ports[port_key_rx] = set()
-            used_ports[port_key_rx].add(path.name)
-            # For outPort
-            port_key_tx = (oxc.switch, oxc.outPort)
-            if port_key_tx not in used_ports:
-                used_ports[port_key_tx] = set()
-            used_ports[port_key_tx].add(path.name)
-    
-    # The rest of the function remains the same, using the updated paths
-    paths_result = []
+    # Convert cross-connects to a sequence of tuples for comparison
+    cross_connects_seq = [(cc['switch'], cc['inPort'], cc['outPort']) for cc in cross_connects]
+
+    # Check if this cross-connect sequence matches any established path
+    is_established = ledger.is_established(cross_connects_seq)
+
+    conflicting_paths = set()
+
+    if is_established:
+        is_possible = True  # Already established
+    else:
+        # For each cross-connect, check if its ports are available (not used by established paths)
+        is_possible = True
+        for cc in cross_connects:
+            switch = cc['switch']
+            conflicts = False
+            for port in (cc['inPort'], cc['outPort']):
+                users = ledger.port_users(switch, port)
+                if users:
+                    conflicts = True
+                    conflicting_paths.update(users)
+            if conflicts:
+                is_possible = False
+        # Note: We do not break the loop to collect all conflicting paths
+
+    return is_established, is_possible, conflicting_paths
 
-    for path_edges in all_paths_with_edges:
-        # Extract node names from the edges
-        path_nodes = [start_name] + [edge[1] for edge in path_edges]
 
+def _edge_data(graph, edge):
+    """Return the attributes of an edge (from_node, to_node, edge_key) of a graph or CompactTopology."""
+    if isinstance(graph, CompactTopology):
+        return graph.edge_data(edge)
+    return graph[edge[0]][edge[1]][edge[2]]
+
+
+def _path_info(graph, start_name, end_name, path_edges, cross_connects, is_established, is_possible, conflicting_paths):
+    """Format a candidate path as returned by search_paths."""
+    # Extract node names from the edges
+    path_nodes = [start_name] + [edge[1] for edge in path_edges]
+    src_port = dest_port = None
+    if path_edges:
+        src_port = _edge_data(graph, path_edges[0])['src_port']
+        dest_port = _edge_data(graph, path_edges[-1])['dest_port']
+    return _format_path_info(path_nodes, src_port, dest_port, cross_connects, is_established, is_possible,
+                             conflicting_paths)
+
+
+def _format_path_info(path_nodes, src_port, dest_port, cross_connects, is_established, is_possible,
+                      conflicting_paths):
+    """Format a candidate path given its nodes and the ports of its first and last links."""
+    start_name = path_nodes[0]
+    end_name = path_nodes[-1]
+
+    # Build the path with port information
+    path_with_ports = []
+    # For the start node, get the outgoing port
+    if src_port is not None:
+        src_port_num = src_port.split('.')[-1]
+        path_with_ports.append(f"{start_name} (out:{src_port_num})")
+    else:
+        path_with_ports.append(start_name)
+    # For intermediate nodes
+    for i in range(len(cross_connects)):
+        cc = cross_connects[i]
+        switch = cc['switch']
+        in_port = cc['inPort']
+        out_port = cc['outPort']
+        path_with_ports.append(f"{switch} (in:{in_port}, out:{out_port})")
+    # For the end node, get the incoming port
+    if dest_port is not None:
+        dest_port_num = dest_port.split('.')[-1]
+        path_with_ports.append(f"{end_name} (in:{dest_port_num})")
+    else:
+        path_with_ports.append(end_name)
+
+    # Append the path information
+    path_info = {
+        'path': path_nodes,
+        'path_with_ports': path_with_ports,
+        'cross_connects': cross_connects,
+        'is_established': is_established,
+        'is_possible': is_possible
+    }
+    if not is_possible and conflicting_paths:
+        path_info['conflicting_paths'] = list(conflicting_paths)
+    return path_info
+
+
+def _iter_paths_info(graph, start_name, end_name, candidates, paths_data, only_possible=False, max_results=None):
+    """Check and format candidate paths (lists of edges) lazily, in order."""
+    ledger = _port_occupancy(paths_data)
+    count = 0
+    for path_edges in candidates:
+        if max_results is not None and count >= max_results:
+            return
         # Extract cross-connects for this path
         cross_connects = extract_cross_connects(graph, path_edges)
-        # Convert cross-connects to a sequence of tuples for comparison
-        cross_connects_seq = [(cc['switch'], cc['inPort'], cc['outPort']) for cc in cross_connects]
-
-        # Check if this cross-connect sequence matches any established path
-        is_established = cross_connects_seq in established_cross_connects
-
-        conflicting_paths = set()
-
-        if is_established:
-            is_possible = True  # Already established
-        else:
-            # For each cross-connect, check if its ports are available (not in used_ports)
-            is_possible = True
-            for cc in cross_connects:
-                in_port = cc['inPort']
-                out_port = cc['outPort']
-                switch = cc['switch']
-                port_key_rx = (switch, in_port)
-                port_key_tx = (switch, out_port)
-                conflicts = False
-                if port_key_rx in used_ports:
-                    conflicts = True
-                    conflicting_paths.update(used_ports[port_key_rx])
-                if port_key_tx in used_ports:
-                    conflicts = True
-                    conflicting_paths.update(used_ports[port_key_tx])
-                if conflicts:
-                    is_possible = False
-            # Note: We do not break the loop to collect all conflicting paths
-
-        # Build the path with port information
-        path_with_ports = []
-        # For the start node, get the outgoing port
-        if path_edges:
-            first_edge = path_edges[0]
-            edge_data = graph[first_edge[0]][first_edge[1]][first_edge[2]]
-            src_port_num = edge_data['src_port'].split('.')[-1]
-            path_with_ports.append(f"{start_name} (out:{src_port_num})")
-        else:
-            path_with_ports.append(start_name)
-        # For intermediate nodes
-        for i in range(len(cross_connects)):
-            cc = cross_connects[i]
-            switch = cc['switch']
-            in_port = cc['inPort']
-            out_port = cc['outPort']
-            path_with_ports.append(f"{switch} (in:{in_port}, out:{out_port})")
-        # For the end node, get the incoming port
-        if path_edges:
-            last_edge = path_edges[-1]
-            edge_data = graph[last_edge[0]][last_edge[1]][last_edge[2]]
-            dest_port_num = edge_data['dest_port'].split('.')[-1]
-            path_with_ports.append(f"{end_name} (in:{dest_port_num})")
-        else:
-            path_with_ports.append(end_name)
-
-        # Append the path information
-        path_info = {
-            'path': path_nodes,
-            'path_with_ports': path_with_ports,
-            'cross_connects': cross_connects,
-            'is_established': is_established,
-            'is_possible': is_possible
-        }
-        if not is_possible and conflicting_paths:
-            path_info['conflicting_paths'] = list(conflicting_paths)
-        paths_result.append(path_info)
+        is_established, is_possible, conflicting_paths = _check_feasibility(cross_connects, ledger)
+        if only_possible and not is_possible:
+            continue
+        count += 1
+        yield _path_info(graph, start_name, end_name, path_edges, cross_connects,
+                         is_established, is_possible, conflicting_paths)
+
+
+def _iter_edge_paths_info(compact, start_name, edge_paths, paths_data, only_possible=False, max_results=None):
+    """As _iter_paths_info, for paths of a CompactTopology given as lists of edge indices."""
+    ledger = _port_occupancy(paths_data)
+    start = compact.node_index.get(start_name)
+    count = 0
+    for edges in edge_paths:
+        if max_results is not None and count >= max_results:
+            return
+        cross_connects = compact.edge_cross_connects(edges)
+        is_established, is_possible, conflicting_paths = _check_feasibility(cross_connects, ledger)
+        if only_possible and not is_possible:
+            continue
+        count += 1
+        src_port = compact.edge_ports(edges[0])[0] if edges else None
+        dest_port = compact.edge_ports(edges[-1])[1] if edges else None
+        yield _format_path_info(compact.path_nodes(start, edges), src_port, dest_port, cross_connects,
+                                is_established, is_possible, conflicting_paths)
+
+
+def iter_search_paths(graph, start_name, end_name, paths_data, max_hops=None, max_results=None,
+                      only_possible=False, time_budget=None, processes=None):
+    """
+    Generates the possible paths between two nodes as the search finds them,
+    considering optional source and destination ports.
 
-    return paths_result
+    Parameters:
+    - graph: The NetworkX graph, or a CompactTopology.
+    - start_name: The starting node, with an optional port (e.g., 'SOURCE' or 'SOURCE.1').
+    - end_name: The ending node, with an optional port (e.g., 'DETECTOR' or 'DETECTOR.1').
+    - paths_data: The established Path objects, or a PortLedger of them.
+    - max_hops: Optional, the maximum number of links of a path.
+    - max_results: Optional, stop after yielding this many paths.
+    - only_possible: Skip paths conflicting with established paths without formatting them.
+    - time_budget: Optional, stop searching after this many seconds.
+    - processes: Optional, the number of worker processes enumerating the paths (see iter_all_paths).
+
+    Yields:
+    dict: The same path information as the items returned by search_paths.
+    """
+    start_name, start_port = _parse_endpoint(start_name)
+    end_name, end_port = _parse_endpoint(end_name)
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+
+    if isinstance(graph, CompactTopology):
+        # Stay on edge indices up to the formatting of the results
+        edge_paths = _iter_compact_edge_paths(graph, start_name, end_name, start_port, end_port, max_hops,
+                                              deadline, processes)
+        yield from _iter_edge_paths_info(graph, start_name, edge_paths, paths_data, only_possible, max_results)
+        return
+    candidates = iter_all_paths(graph, start_name, end_name, start_port, end_port, max_hops, deadline, processes)
+    yield from _iter_paths_info(graph, start_name, end_name, candidates, paths_data, only_possible, max_results)
+
+
+def _free_ports_filter(start_name, end_name, ledger):
+    """Return an edge filter keeping the edges whose ports at the intermediate switches are free."""
+    def edge_filter(u, v, key, edge_data):
+        if u != start_name and ledger.is_port_used(u, edge_data['src_port']):
+            return False
+        return v == end_name or not ledger.is_port_used(v, edge_data['dest_port'])
+    return edge_filter
 
 
+def search_paths(graph, start_name, end_name, paths_data, k=None, weight=None, processes=None,
+                 only_possible=False, max_hops=None, max_results=None):
+    """
+    Finds all possible paths between two nodes, considering optional source and destination ports.
+
+    Parameters:
+    - graph: The NetworkX graph, or a CompactTopology.
+    - start_name: The starting node, with an optional port (e.g., 'SOURCE' or 'SOURCE.1').
+    - end_name: The ending node, with an optional port (e.g., 'DETECTOR' or 'DETECTOR.1').
+    - paths_data: The established Path objects, or a PortLedger of them.
+    - k: Optional, only return the k shortest paths instead of enumerating all of them.
+    - weight: Optional, with k, the edge attribute or function used as edge weight instead of the hop count.
+    - processes: Optional, without k, the number of worker processes enumerating the paths.
+    - only_possible: Only return the paths using free ports. With k, these are the k
+      shortest of them (searched over the free ports), not the possible ones among the
+      k shortest paths.
+    - max_hops: Optional, the maximum number of links of a path. With k, the k shortest
+      paths longer than this are dropped (with the hop count as weight, this gives the
+      k shortest paths within max_hops).
+    - max_results: Optional, the maximum number of paths returned.
+    """
+    if k is None:
+        return list(iter_search_paths(graph, start_name, end_name, paths_data, max_hops, max_results,
+                                      only_possible, processes=processes))
+
+    start_name, start_port = _parse_endpoint(start_name)
+    end_name, end_port = _parse_endpoint(end_name)
+
+    # Compute the k shortest simple paths with edges, considering port constraints
+    if isinstance(graph, CompactTopology):
+        graph = graph.to_graph()
+    ledger = _port_occupancy(paths_data)
+    edge_filter = _free_ports_filter(start_name, end_name, ledger) if only_possible else None
+    candidates = compute_k_shortest_paths(graph, start_name, end_name, k, start_port, end_port, weight, edge_filter)
+    if max_hops is not None:
+        candidates = [path_edges for path_edges in candidates if len(path_edges) <= max_hops]
+    return list(_iter_paths_info(graph, start_name, end_name, candidates, ledger, only_possible, max_results))
+
+
+# The options of iter_search_paths that also apply to k shortest path searches
+_K_SEARCH_OPTIONS = frozenset(('max_hops', 'max_results', 'only_possible'))
+
+
+def _check_search_options(k, weight, options):
+    """Raise TypeError for search options that do not apply: weight without k, or enumeration options with k."""
+    if k is not None:
+        unsupported = sorted(set(options) - _K_SEARCH_OPTIONS)
+        if unsupported:
+            raise TypeError(f"Search options not supported with k: {', '.join(unsupported)}")
+    elif weight is not None:
+        raise TypeError("The weight option requires k")
+
+
+def _shared_search_graph(graph, k):
+    """
+    Return the graph form the searches of several demands share: a NetworkX graph for
+    k shortest path searches, else a CompactTopology (when numpy is available), so the
+    edge and port index is built once instead of once per demand.
+    """
+    if k is not None:
+        return graph.to_graph() if isinstance(graph, CompactTopology) else graph
+    if isinstance(graph, CompactTopology):
+        return graph
+    try:
+        return CompactTopology.from_graph(graph)
+    except ImportError:
+        return graph
+
+
+def _nodes_reaching(graph, target):
+    """Return the set of nodes from which target can be reached (including target)."""
+    if isinstance(graph, CompactTopology):
+        return graph.nodes_reaching(target)
+    if target not in graph:
+        return set()
+    reaching = {target}
+    queue = deque([target])
+    while queue:
+        node = queue.popleft()
+        for predecessor in graph.predecessors(node):
+            if predecessor not in reaching:
+                reaching.add(predecessor)
+                queue.append(predecessor)
+    return reaching
+
+
+def _search_demand(graph, demand, ledger, reaching, k, weight, options):
+    """Search the paths of one (start, end) demand with the shared graph, occupancy and reachability."""
+    start_name, end_name = demand
+    start_node, _ = _parse_endpoint(start_name)
+    end_node, _ = _parse_endpoint(end_name)
+    if start_node != end_node and start_node not in reaching:
+        return []
+    if k is not None:
+        return search_paths(graph, start_name, end_name, ledger, k=k, weight=weight, **options)
+    return list(iter_search_paths(graph, start_name, end_name, ledger, **options))
+
+
+def _init_search_worker(graph, ledger, reachability, k, weight, options):
+    _worker_state['graph'] = graph
+    _worker_state['ledger'] = ledger
+    _worker_state['reachability'] = reachability
+    _worker_state['search'] = k, weight, options
+
+
+def _search_demand_in_worker(demand):
+    end_node, _ = _parse_endpoint(demand[1])
+    return _search_demand(_worker_state['graph'], demand, _worker_state['ledger'],
+                          _worker_state['reachability'][end_node], *_worker_state['search'])
+
+
+def search_paths_many(graph, demands, paths_data, processes=None, **options):
+    """
+    Finds the possible paths of several demands at once.
+
+    The work that does not depend on a single demand is done once: the port
+    occupancy of the established paths, the edge and port index of the graph (a
+    CompactTopology for enumerations, a NetworkX graph with k), and the set of nodes
+    reaching each destination (demands that cannot be connected are answered without
+    a search). Independent demands can be spread over a process pool.
+
+    Parameters:
+    - graph: The NetworkX graph, or a CompactTopology.
+    - demands: Iterable of (start_name, end_name) tuples, with optional ports (e.g., ('SOURCE.1', 'DETECTOR')).
+    - paths_data: The established Path objects, or a PortLedger of them.
+    - processes: Optional, the number of worker processes; by default demands are searched in this process.
+    - options: Search options, either k with weight, only_possible, max_hops and max_results (see
+      search_paths) or max_hops, max_results, only_possible and time_budget (see iter_search_paths).
+      TypeError is raised for weight without k, and for time_budget with k. A weight function must be
+      picklable when processes is used.
+
+    Returns:
+    dict: For each distinct demand, the list of path information returned by search_paths.
+    """
+    options = dict(options)
+    k = options.pop('k', None)
+    weight = options.pop('weight', None)
+    _check_search_options(k, weight, options)
+    demands = list(dict.fromkeys(tuple(demand) for demand in demands))
+    if len(demands) > 1:
+        graph = _shared_search_graph(graph, k)
+    ledger = _port_occupancy(paths_data)
+    reachability = {}
+    for _, end_name in demands:
+        end_node, _ = _parse_endpoint(end_name)
+        if end_node not in reachability:
+            reachability[end_node] = _nodes_reaching(graph, end_node)
+
+    if not processes or processes <= 1 or len(demands) <= 1:
+        return {
+            demand: _search_demand(graph, demand, ledger, reachability[_parse_endpoint(demand[1])[0]], k, weight,
+                                   options)
+            for demand in demands
+        }
+
+    from concurrent.futures import ProcessPoolExecutor
+    chunksize = max(1, len(demands) // (processes * 4))
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_search_worker,
+                             initargs=(graph, ledger, reachability, k, weight, options)) as executor:
+        results = executor.map(_search_demand_in_worker, demands, chunksize=chunksize)
+        return dict(zip(demands, results))
@@ -0,0 +1,67 @@
+import pytest
+
+pytest.importorskip('networkx')
+
+from multiverse.compact import CompactTopology
+from multiverse.network import topology_to_graph
+from multiverse.synthetic import grid_topology, mesh_topology, ring_topology
+from multiverse.utils import iter_all_paths
+
+TOPOLOGIES = {
+    'ring': lambda: ring_topology(6, links_per_hop=2),
+    'grid': lambda: grid_topology(3, 3),
+    'mesh': lambda: mesh_topology(7, degree=3),
+}
+
+SEARCHES = [
+    ('SOURCE', 'DETECTOR', None, None, None),
+    ('SOURCE', 'DETECTOR', None, None, 6),
+    ('SOURCE', 'DETECTOR', 'SOURCE.2', None, None),
+    ('SOURCE', 'DETECTOR', None, 'DETECTOR.1', 5),
+    ('SOURCE', 'DETECTOR', 'SOURCE.1', 'DETECTOR.2', None),
+    ('SOURCE', 'SOURCE', None, None, None),
+]
+
+
+def _recursive_all_paths(graph, start_name, end_name, start_port=None, end_port=None):
+    """The recursive enumeration iter_all_paths replaced, kept as a reference."""
+    all_simple_paths = []
+
+    def dfs(current_node, path, visited_nodes):
+        if current_node == end_name:
+            if end_port:
+                if not path:
+                    return
+                last_edge = path[-1]
+                if graph[last_edge[0]][last_edge[1]][last_edge[2]]['dest_port'] != end_port:
+                    return
+            all_simple_paths.append(list(path))
+            return
+        for neighbor in graph.successors(current_node):
+            for key, edge_data in graph[current_node][neighbor].items():
+                if neighbor not in visited_nodes:
+                    if current_node == start_name and start_port and edge_data['src_port'] != start_port:
+                        continue
+                    path.append((current_node, neighbor, key))
+                    visited_nodes.add(neighbor)
+                    dfs(neighbor, path, visited_nodes)
+                    path.pop()
+                    visited_nodes.remove(neighbor)
+
+    dfs(start_name, [], {start_name})
+    return all_simple_paths
+
+
+@pytest.fixture(params=sorted(TOPOLOGIES))
+def graph(request):
+    return topology_to_graph(TOPOLOGIES[request.param]())
+
+
+@pytest.mark.parametrize('compact', [False, True], ids=['networkx', 'compact'])
+@pytest.mark.parametrize('search', SEARCHES)
+def test_paths_match_recursive_enumeration(graph, compact, search):
+    start, end, start_port, end_port, max_hops = search
+    expected = [path for path in _recursive_all_paths(graph, start, end, start_port, end_port)
+                if max_hops is None or len(path) <= max_hops]
+    searched = CompactTopology.from_graph(graph) if compact else graph
+    assert list(iter_all_paths(searched, start, end, start_port, end_port, max_hops)) == expected
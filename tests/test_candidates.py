@@ -0,0 +1,126 @@
+import gc
+
+import pytest
+
+pytest.importorskip('networkx')
+
+from multiverse.candidates import CandidateSet
+from multiverse.ledger import PortLedger
+from multiverse.network import topology_to_graph
+from multiverse.path import Path
+from multiverse.synthetic import establish_trails, grid_topology
+from multiverse.utils import iter_search_paths
+
+
+@pytest.fixture
+def graph():
+    return topology_to_graph(grid_topology(2, 3, links_per_hop=2, num_endpoint_ports=4))
+
+
+@pytest.fixture
+def ledger(graph):
+    return PortLedger(establish_trails(graph, 2))
+
+
+def _feasibility(candidates):
+    return {tuple(info['path_with_ports']): (info['is_established'], info['is_possible'],
+                                             set(info.get('conflicting_paths', ())))
+            for info in candidates}
+
+
+def _assert_up_to_date(candidates, graph, ledger):
+    assert _feasibility(candidates) == _feasibility(iter_search_paths(graph, 'SOURCE', 'DETECTOR', ledger))
+
+
+def _new_path(candidates, name, path_id):
+    path = Path.from_computed_path(next(info for info in candidates
+                                        if info['is_possible'] and not info['is_established']), name=name)
+    path.id = path_id
+    return path
+
+
+def test_updates_after_create_and_delete(graph, ledger):
+    candidates = CandidateSet.search(graph, 'SOURCE', 'DETECTOR', ledger)
+    initial = _feasibility(candidates)
+    created = []
+    for path_id in range(100, 102):
+        path = _new_path(candidates, f"NEW{path_id}", path_id)
+        candidates.evaluations = 0
+        ledger.add_path(path)
+        created.append(path)
+        # Only the candidates sharing a port with the new path are re-evaluated
+        assert 0 < candidates.evaluations < len(candidates)
+        _assert_up_to_date(candidates, graph, ledger)
+    for path in created:
+        ledger.remove_path(path)
+        _assert_up_to_date(candidates, graph, ledger)
+    assert _feasibility(candidates) == initial
+
+
+def test_reset_refreshes_every_candidate(graph, ledger):
+    candidates = CandidateSet.search(graph, 'SOURCE', 'DETECTOR', ledger)
+    path = _new_path(candidates, "NEW", 100)
+    ledger.reset([path])
+    assert candidates.evaluations == len(candidates)
+    _assert_up_to_date(candidates, graph, ledger)
+
+
+def test_listeners_receive_changed_candidates(graph, ledger):
+    candidates = CandidateSet.search(graph, 'SOURCE', 'DETECTOR', ledger)
+    changes = []
+    candidates.add_listener(lambda candidate_set, changed: changes.append(changed))
+    path = _new_path(candidates, "NEW", 100)
+    ledger.add_path(path)
+    assert len(changes) == 1
+    assert any(info['is_established'] for info in changes[0])
+    assert all(not info['is_possible'] for info in changes[0] if not info['is_established'])
+
+
+def test_search_results_are_not_modified(graph, ledger):
+    results = list(iter_search_paths(graph, 'SOURCE', 'DETECTOR', ledger))
+    before = _feasibility(results)
+    candidates = CandidateSet(results, ledger)
+    ledger.add_path(_new_path(candidates, "NEW", 100))
+    assert _feasibility(results) == before
+    assert _feasibility(candidates) != before
+
+
+def test_detach_and_attach(graph, ledger):
+    candidates = CandidateSet.search(graph, 'SOURCE', 'DETECTOR', ledger)
+    initial = _feasibility(candidates)
+    candidates.detach()
+    ledger.add_path(_new_path(candidates, "NEW", 100))
+    assert _feasibility(candidates) == initial
+    candidates.attach()
+    _assert_up_to_date(candidates, graph, ledger)
+
+
+def test_unused_set_is_released(graph, ledger):
+    candidates = CandidateSet.search(graph, 'SOURCE', 'DETECTOR', ledger)
+    path = _new_path(candidates, "NEW", 100)
+    del candidates
+    gc.collect()
+    ledger.add_path(path)
+    assert ledger._listeners == []
+
+
+def test_network_candidates_follow_created_paths(monkeypatch):
+    pytest.importorskip('requests')
+    from multiverse import Multiverse
+    from multiverse.mock_server import MockMultiverseServer
+
+    monkeypatch.setenv('MVS_USERNAME', 'user')
+    monkeypatch.setenv('MVS_PASSWORD', 'password')
+    with MockMultiverseServer() as server:
+        server.add_synthetic_network('grid', topology=grid_topology(2, 3, links_per_hop=2, num_endpoint_ports=4), num_trails=2)
+        client = Multiverse(server.host, api_port=server.api_port, auth_port=server.auth_port)
+        network = client.select_network('grid')
+        network.get_paths()
+        candidates = network.search_candidates('SOURCE', 'DETECTOR')
+        initial = _feasibility(candidates)
+        path = Path.from_computed_path(next(info for info in candidates
+                                            if info['is_possible'] and not info['is_established']), name="NEW")
+        assert network.create_path(path) is not None
+        _assert_up_to_date(candidates, network.get_topology(), network.ledger)
+        assert network.delete_path(path)
+        assert _feasibility(candidates) == initial
@@ -0,0 +1,132 @@
+import json
+
+import pytest
+
+from multiverse.codec import SCHEMAS, JSONCodec, make_codec
+
+CODEC_NAMES = ('json', 'orjson', 'msgspec')
+
+
+def _codec(name):
+    try:
+        return make_codec(name)
+    except ImportError:
+        pytest.skip(f"{name} is not installed")
+
+
+# Payloads with null and missing fields (only fields of the schemas, which typed decoders keep)
+NULL_FIELDS = {
+    'trails': [
+        {'id': 1, 'name': "TRAIL_1", 'label': None, 'oxcs': None},
+        {'id': 2, 'name': None, 'vxcs': None},
+        {'id': 3},
+    ],
+    'vxcs': [
+        {'id': 10, 'label': None, 'switchId': 5, 'ingressPortId': None, 'egressPortId': 7},
+        {'id': 11, 'switchId': None},
+    ],
+    'topology': {
+        'nodes': [
+            {'id': 5, 'name': "SW1", 'type': None, 'vltps': [{'id': 7, 'name': None}]},
+            {'id': 6, 'name': None, 'vltps': None},
+        ],
+        'links': None,
+    },
+}
+
+
+@pytest.mark.parametrize('name', CODEC_NAMES)
+@pytest.mark.parametrize('schema', SCHEMAS)
+def test_null_and_missing_fields(name, schema):
+    codec = _codec(name)
+    data = json.dumps(NULL_FIELDS[schema]).encode()
+    assert codec.loads(data, schema) == json.loads(data)
+
+
+@pytest.mark.parametrize('name', CODEC_NAMES)
+def test_unexpected_types_fall_back_to_untyped(name):
+    codec = _codec(name)
+    data = json.dumps([{'id': 1, 'name': 42, 'label': ["x"], 'vxcs': {}}]).encode()
+    assert codec.loads(data, 'trails') == json.loads(data)
+
+
+@pytest.mark.parametrize('name', CODEC_NAMES)
+def test_get_paths_with_null_labels(name, monkeypatch):
+    pytest.importorskip('requests')
+    _codec(name)
+    from multiverse import Multiverse
+    from multiverse.mock_server import MockMultiverseServer
+
+    monkeypatch.setenv('MVS_USERNAME', 'user')
+    monkeypatch.setenv('MVS_PASSWORD', 'password')
+    with MockMultiverseServer() as server:
+        network_id = server.add_synthetic_network('nulls', num_trails=3)
+        for trail in server._networks[network_id].trails.values():
+            trail['label'] = None
+            trail['description'] = None
+            for vxc in trail['vxcs']:
+                vxc['label'] = None
+        client = Multiverse(server.host, api_port=server.api_port, auth_port=server.auth_port, codec=name)
+        paths = client.select_network('nulls').get_paths()
+    assert paths is not None and len(paths) == 3
+
+
+class _RecordingCodec(JSONCodec):
+    """Stdlib codec recording the decoded payloads."""
+
+    def __init__(self):
+        self.decoded = []
+
+    def loads(self, data, schema=None):
+        obj = super().loads(data, schema)
+        self.decoded.append(obj)
+        return obj
+
+
+def _new_paths(graph, ledger, count):
+    from multiverse.path import Path
+    from multiverse.utils import search_paths
+
+    candidates = [info for info in search_paths(graph, 'SOURCE', 'DETECTOR', ledger, k=20, only_possible=True)
+                  if not info['is_established']]
+    return [Path.from_computed_path(info, name=f"NEW{idx}") for idx, info in enumerate(candidates[:count])]
+
+
+def _created_ids(codec):
+    return {obj['id'] for obj in codec.decoded if isinstance(obj, dict) and set(obj) == {'id'}}
+
+
+@pytest.mark.parametrize('client_name', ['Multiverse', 'AsyncMultiverse'])
+def test_created_paths_are_decoded_by_codec(client_name, monkeypatch):
+    pytest.importorskip('requests')
+    import asyncio
+
+    import multiverse
+    from multiverse.mock_server import MockMultiverseServer
+
+    monkeypatch.setenv('MVS_USERNAME', 'user')
+    monkeypatch.setenv('MVS_PASSWORD', 'password')
+    codec = _RecordingCodec()
+    with MockMultiverseServer() as server:
+        server.add_synthetic_network('create', num_switches=6, num_trails=0)
+        options = dict(api_port=server.api_port, auth_port=server.auth_port, codec=codec)
+        if client_name == 'Multiverse':
+            network = multiverse.Multiverse(server.host, **options).select_network('create')
+            network.get_paths()
+            single, *batch = _new_paths(network.get_topology(), network.ledger, 3)
+            assert network.create_path(single) is not None
+            results = network.create_paths(batch)
+        else:
+            pytest.importorskip('aiohttp')
+
+            async def main():
+                async with multiverse.AsyncMultiverse(server.host, **options) as client:
+                    network = await client.select_network('create')
+                    await network.get_paths()
+                    single, *batch = _new_paths(await network.get_topology(), network.ledger, 3)
+                    assert await network.create_path(single) is not None
+                    return single, batch, await network.create_paths(batch)
+
+            single, batch, results = asyncio.run(main())
+    assert [result['error'] for result in results] == [None, None]
+    assert _created_ids(codec) == {single.id} | {path.id for path in batch}
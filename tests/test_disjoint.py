@@ -0,0 +1,132 @@
+import itertools
+import random
+
+import pytest
+
+nx = pytest.importorskip('networkx')
+
+from multiverse.disjoint import compute_disjoint_paths, search_disjoint_paths
+from multiverse.ledger import PortLedger
+from multiverse.network import topology_to_graph
+from multiverse.oxc import OXC
+from multiverse.path import Path
+from multiverse.synthetic import establish_trails, grid_topology
+from multiverse.utils import iter_all_paths
+
+
+def _random_graph(seed, num_nodes=7, num_edges=30, num_ports=4):
+    rng = random.Random(seed)
+    graph = nx.MultiDiGraph()
+    names = [f"N{idx}" for idx in range(num_nodes)]
+    graph.add_nodes_from(names, type='SWITCH')
+    for key in range(num_edges):
+        u, v = rng.sample(names, 2)
+        graph.add_edge(u, v, key=key, name='', src_port=f"{u}.{rng.randint(1, num_ports)}",
+                       dest_port=f"{v}.{rng.randint(1, num_ports)}", cost=rng.randint(0, 5))
+    return graph
+
+
+def _busy_ledger(graph, rng):
+    """A ledger with a path holding a random cross-connect, if a node has two ports."""
+    path = Path("BUSY", "BUSY")
+    node = rng.choice(sorted(graph.nodes))
+    ports = sorted({data['src_port'] for _, _, data in graph.out_edges(node, data=True)}
+                   | {data['dest_port'] for _, _, data in graph.in_edges(node, data=True)})
+    if len(ports) >= 2:
+        in_port, out_port = rng.sample(ports, 2)
+        path.add_oxc(OXC("BUSY", node, in_port, out_port))
+    return PortLedger([path])
+
+
+def _usable(graph, path, ledger):
+    """Whether a path only uses free ports at its intermediate switches."""
+    for idx, (u, v, key) in enumerate(path):
+        data = graph[u][v][key]
+        if idx > 0 and ledger.is_port_used(u, data['src_port']):
+            return False
+        if idx < len(path) - 1 and ledger.is_port_used(v, data['dest_port']):
+            return False
+    return True
+
+
+def _disjoint(first, second, mode):
+    if set(first) & set(second):
+        return False
+    return mode == 'link' or not {v for _, v, _ in first[:-1]} & {v for _, v, _ in second[:-1]}
+
+
+def _brute_force(graph, start, end, start_port, end_port, ledger, mode, weight_fn):
+    """Smallest total weight of a disjoint pair of usable paths, or None."""
+    candidates = [path for path in iter_all_paths(graph, start, end, start_port, end_port)
+                  if _usable(graph, path, ledger)]
+    weights = [sum(weight_fn(*edge) for edge in pair[0] + pair[1])
+               for pair in itertools.combinations(candidates, 2) if _disjoint(*pair, mode)]
+    return min(weights, default=None)
+
+
+@pytest.mark.parametrize('weight', [None, 'cost'])
+@pytest.mark.parametrize('mode', ['node', 'link'])
+@pytest.mark.parametrize('seed', range(30))
+def test_matches_brute_force(seed, mode, weight):
+    graph = _random_graph(seed)
+    rng = random.Random(seed)
+    ledger = _busy_ledger(graph, rng)
+    start, end = rng.sample(sorted(graph.nodes), 2)
+    start_port = rng.choice([None, f"{start}.1"])
+    end_port = rng.choice([None, f"{end}.2"])
+
+    def weight_fn(u, v, key):
+        return 1 if weight is None else graph[u][v][key][weight]
+
+    best = _brute_force(graph, start, end, start_port, end_port, ledger, mode, weight_fn)
+    pair = compute_disjoint_paths(graph, start, end, start_port, end_port, ledger, mode, weight)
+    if best is None:
+        assert pair is None
+        return
+    first, second = pair
+    assert _disjoint(first, second, mode)
+    for path in pair:
+        assert path[0][0] == start and path[-1][1] == end
+        assert _usable(graph, path, ledger)
+        assert start_port is None or graph[start][path[0][1]][path[0][2]]['src_port'] == start_port
+        assert end_port is None or graph[path[-1][0]][end][path[-1][2]]['dest_port'] == end_port
+    assert sum(weight_fn(*edge) for edge in first) <= sum(weight_fn(*edge) for edge in second)
+    assert sum(weight_fn(*edge) for edge in first + second) == best
+
+
+def test_brute_force_finds_pairs():
+    # The random graphs above do not all lack disjoint pairs
+    found = sum(compute_disjoint_paths(_random_graph(seed), 'N0', 'N1') is not None for seed in range(30))
+    assert found >= 10
+
+
+@pytest.mark.parametrize('start, end, mode, num_trails', [('SW0_1', 'SW2_1', 'node', 2),
+                                                         ('SOURCE', 'DETECTOR', 'link', 0)])
+def test_search_disjoint_paths(start, end, mode, num_trails):
+    graph = topology_to_graph(grid_topology(3, 3))
+    ledger = PortLedger(establish_trails(graph, num_trails))
+    primary, backup = search_disjoint_paths(graph, start, end, ledger, disjoint=mode)
+    assert primary['path'][0] == backup['path'][0] == start
+    assert primary['path'][-1] == backup['path'][-1] == end
+    assert primary['is_possible'] and backup['is_possible']
+    assert not primary['is_established'] and not backup['is_established']
+    assert len(primary['path']) <= len(backup['path'])
+    if mode == 'node':
+        assert not set(primary['path'][1:-1]) & set(backup['path'][1:-1])
+    # Both paths can be created together
+    ledger.add_path(Path.from_computed_path(primary, name="PRIMARY"))
+    assert all(not ledger.is_port_used(cc['switch'], port)
+               for cc in backup['cross_connects'] for port in (cc['inPort'], cc['outPort']))
+
+
+def test_no_disjoint_pair():
+    graph = topology_to_graph(grid_topology(3, 3))
+    # Both links of the source lead to the same switch
+    assert search_disjoint_paths(graph, 'SOURCE', 'DETECTOR', [], disjoint='node') is None
+    # A trail takes the port of one of them
+    assert search_disjoint_paths(graph, 'SOURCE', 'DETECTOR', establish_trails(graph, 1), disjoint='link') is None
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        compute_disjoint_paths(_random_graph(0), 'N0', 'N1', disjoint='path')
@@ -0,0 +1,99 @@
+from multiverse.ledger import PortLedger
+from multiverse.oxc import OXC
+from multiverse.path import Path
+
+
+def _path(name, path_id, *cross_connects):
+    path = Path(name, name)
+    path.id = path_id
+    for switch, in_port, out_port in cross_connects:
+        path.add_oxc(OXC(name, switch, in_port, out_port))
+    return path
+
+
+A = _path("A", 1, ('SW1', 'SW1.1', 'SW1.2'), ('SW2', '3', '4'))
+B = _path("B", 2, ('SW1', 'SW1.3', 'SW1.4'))
+C = _path("C", 3, ('SW2', 'SW2.3', 'SW2.5'))
+
+
+def test_add_indexes_ports_and_sequence():
+    ledger = PortLedger([A])
+    assert len(ledger) == 1
+    assert ledger.is_port_used('SW1', 'SW1.1') and ledger.is_port_used('SW1', '2')
+    # Bare port numbers are stored with their full names
+    assert ledger.port_users('SW2', 'SW2.3') == {"A"}
+    assert not ledger.is_port_used('SW1', 'SW1.3')
+    assert ledger.is_established([('SW1', 'SW1.1', 'SW1.2'), ('SW2', 'SW2.3', 'SW2.4')])
+    assert not ledger.is_established([('SW1', 'SW1.1', 'SW1.2')])
+
+
+def test_shared_port_users():
+    ledger = PortLedger([A, B, C])
+    assert ledger.port_users('SW2', '3') == {"A", "C"}
+    ledger.remove_path(A)
+    assert ledger.port_users('SW2', '3') == {"C"}
+    assert not ledger.is_port_used('SW1', '1')
+
+
+def test_remove_releases_ports():
+    ledger = PortLedger([A, B])
+    version = ledger.version
+    assert ledger.remove_path(A)
+    assert not ledger.remove_path(A)
+    assert ledger.version == version + 1
+    assert len(ledger) == 1
+    assert not ledger.is_port_used('SW1', 'SW1.1')
+    assert not ledger.is_established([('SW1', 'SW1.1', 'SW1.2'), ('SW2', 'SW2.3', 'SW2.4')])
+    assert ledger.is_port_used('SW1', 'SW1.3')
+
+
+def test_add_again_replaces_path():
+    ledger = PortLedger([A])
+    moved = _path("A", 1, ('SW3', 'SW3.1', 'SW3.2'))
+    ledger.add_path(moved)
+    assert len(ledger) == 1
+    assert not ledger.is_port_used('SW1', 'SW1.1')
+    assert ledger.port_users('SW3', '1') == {"A"}
+
+
+def test_identical_sequences_are_counted():
+    twin = _path("A2", 4, ('SW1', 'SW1.1', 'SW1.2'), ('SW2', '3', '4'))
+    ledger = PortLedger([A, twin])
+    ledger.remove_path(A)
+    assert ledger.is_established([('SW1', 'SW1.1', 'SW1.2'), ('SW2', 'SW2.3', 'SW2.4')])
+    assert ledger.port_users('SW1', '1') == {"A2"}
+
+
+def test_reset_replaces_content():
+    ledger = PortLedger([A, B])
+    changes = []
+    ledger.add_listener(lambda ledger, ports: changes.append(ports))
+    ledger.reset([C])
+    assert changes == [None]
+    assert len(ledger) == 1
+    assert not ledger.is_port_used('SW1', '1')
+    assert ledger.port_users('SW2', '5') == {"C"}
+    ledger.reset()
+    assert len(ledger) == 0 and not ledger.is_port_used('SW2', '5')
+
+
+def test_listeners_receive_changed_ports():
+    ledger = PortLedger()
+    changes = []
+    ledger.add_listener(lambda ledger, ports: changes.append(ports))
+    ledger.add_path(B)
+    ledger.remove_path(B)
+    assert changes == [{('SW1', 'SW1.3'), ('SW1', 'SW1.4')}] * 2
+
+
+def test_unresolved_ports():
+    stale = _path("S", 5, ('SW1', 'SW1.5', None), (None, 'X.1', 'X.2'), ('SW2', '', 'SW2.6'))
+    ledger = PortLedger([A, stale])
+    assert ledger.unresolved_paths == ["S"]
+    # Resolved ports are occupied, the unresolved ones occupy nothing
+    assert ledger.port_users('SW1', '5') == {"S"}
+    assert ledger.port_users('SW2', '6') == {"S"}
+    assert not ledger.is_port_used('X', 'X.1')
+    ledger.remove_path(stale)
+    assert ledger.unresolved_paths == []
+    assert not ledger.is_port_used('SW2', '6')
@@ -0,0 +1,68 @@
+import pytest
+
+pytest.importorskip('requests')
+pytest.importorskip('networkx')
+
+from multiverse import Multiverse
+from multiverse.mock_server import MockMultiverseServer
+from multiverse.synthetic import grid_topology
+from multiverse.utils import iter_search_paths
+
+
+@pytest.fixture(scope='module')
+def network():
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv('MVS_USERNAME', 'user')
+        monkeypatch.setenv('MVS_PASSWORD', 'password')
+        with MockMultiverseServer() as server:
+            server.add_synthetic_network('grid', topology=grid_topology(3, 4), num_trails=4)
+            client = Multiverse(server.host, api_port=server.api_port, auth_port=server.auth_port,
+                                search_cache=True)
+            network = client.select_network('grid')
+            network.get_paths()
+            yield network
+
+
+def _hops(results):
+    return [len(info['path']) - 1 for info in results]
+
+
+def test_k_with_only_possible(network):
+    results = network.search_paths('SOURCE', 'DETECTOR', k=5, only_possible=True)
+    possible = list(iter_search_paths(network.get_topology(), 'SOURCE', 'DETECTOR', network.ledger,
+                                      only_possible=True))
+    assert len(results) == 5
+    assert all(info['is_possible'] for info in results)
+    assert _hops(results) == sorted(_hops(possible))[:5]
+    assert any(not info['is_possible'] for info in network.search_paths('SOURCE', 'DETECTOR', k=5))
+
+
+def test_k_with_max_hops(network):
+    shortest = min(_hops(network.search_paths('SOURCE', 'DETECTOR', k=1)))
+    results = network.search_paths('SOURCE', 'DETECTOR', k=20, max_hops=shortest)
+    assert results and all(hops <= shortest for hops in _hops(results))
+    assert network.search_paths('SOURCE', 'DETECTOR', k=20, max_hops=shortest - 1) == []
+
+
+def test_k_with_max_results(network):
+    results = network.search_paths('SOURCE', 'DETECTOR', k=10, max_results=3)
+    assert results == network.search_paths('SOURCE', 'DETECTOR', k=10)[:3]
+
+
+@pytest.mark.parametrize('option', [{'processes': 2}, {'time_budget': 1.0}])
+def test_k_with_unsupported_option(network, option):
+    with pytest.raises(TypeError):
+        network.search_paths('SOURCE', 'DETECTOR', k=5, **option)
+
+
+def test_weight_requires_k(network):
+    with pytest.raises(TypeError):
+        network.search_paths('SOURCE', 'DETECTOR', weight='length')
+
+
+def test_cached_results_follow_options(network):
+    unfiltered = network.search_paths('SOURCE', 'DETECTOR', k=5)
+    filtered = network.search_paths('SOURCE', 'DETECTOR', k=5, only_possible=True)
+    assert network.search_paths('SOURCE', 'DETECTOR', k=5) == unfiltered
+    assert network.search_paths('SOURCE', 'DETECTOR', k=5, only_possible=True) == filtered
+    assert filtered != unfiltered
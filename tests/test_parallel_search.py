@@ -0,0 +1,67 @@
+import itertools
+
+import pytest
+
+pytest.importorskip('networkx')
+pytest.importorskip('numpy')
+
+from multiverse import utils
+from multiverse.compact import CompactTopology
+from multiverse.ledger import PortLedger
+from multiverse.network import topology_to_graph
+from multiverse.synthetic import establish_trails, grid_topology, mesh_topology, trunk_topology
+
+TOPOLOGIES = {
+    'grid': lambda: grid_topology(4, 4),
+    'mesh': lambda: mesh_topology(10, degree=4),
+    'trunk': lambda: trunk_topology(5, links_per_trunk=3),
+}
+
+SEARCHES = [
+    ('SOURCE', 'DETECTOR', None, None, None),
+    ('SOURCE', 'DETECTOR', 'SOURCE.2', 'DETECTOR.1', None),
+    ('SOURCE', 'DETECTOR', None, None, 9),
+]
+
+
+@pytest.fixture
+def parallel(monkeypatch):
+    """Use the process pool even on one CPU and for small searches."""
+    monkeypatch.setattr(utils, '_available_cpus', lambda: 4)
+    monkeypatch.setattr(utils, '_PARALLEL_MIN_DURATION', 0)
+
+
+@pytest.fixture(params=sorted(TOPOLOGIES))
+def compact(request):
+    return CompactTopology.from_graph(topology_to_graph(TOPOLOGIES[request.param]()))
+
+
+@pytest.mark.parametrize('processes', [2, 3])
+@pytest.mark.parametrize('search', SEARCHES)
+def test_parallel_paths_match_sequential(parallel, compact, processes, search):
+    start, end, start_port, end_port, max_hops = search
+    sequential = list(utils.iter_all_paths(compact, start, end, start_port, end_port, max_hops))
+    assert sequential
+    assert list(utils.iter_all_paths(compact, start, end, start_port, end_port, max_hops,
+                                     processes=processes)) == sequential
+
+
+def test_parallel_search_results_match_sequential(parallel, compact):
+    ledger = PortLedger(establish_trails(compact.to_graph(), 4))
+    sequential = list(utils.iter_search_paths(compact, 'SOURCE', 'DETECTOR', ledger))
+    assert list(utils.iter_search_paths(compact, 'SOURCE', 'DETECTOR', ledger, processes=2)) == sequential
+
+
+def test_parallel_search_stopped_early(parallel, compact):
+    sequential = list(itertools.islice(utils.iter_all_paths(compact, 'SOURCE', 'DETECTOR'), 5))
+    paths = utils.iter_all_paths(compact, 'SOURCE', 'DETECTOR', processes=2)
+    assert list(itertools.islice(paths, 5)) == sequential
+    paths.close()
+    # The pool is reused by the next search
+    assert list(itertools.islice(utils.iter_all_paths(compact, 'SOURCE', 'DETECTOR', processes=2), 5)) == sequential
+
+
+def test_parallel_search_needs_compact_topology():
+    graph = topology_to_graph(grid_topology(3, 3))
+    with pytest.raises(ValueError):
+        list(utils.iter_all_paths(graph, 'SOURCE', 'DETECTOR', processes=2))
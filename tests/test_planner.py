@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+pytest.importorskip('networkx')
+
+from multiverse.network import topology_to_graph
+from multiverse.planner import plan_paths
+from multiverse.synthetic import establish_trails, grid_topology, ring_topology
+
+
+def _ports(info):
+    """All (node, port number) pairs of a path: its cross-connects and its end links."""
+    ports = {(cc['switch'], port.split('.')[-1])
+             for cc in info['cross_connects'] for port in (cc['inPort'], cc['outPort'])}
+    first, last = info['path_with_ports'][0], info['path_with_ports'][-1]
+    ports.add((info['path'][0], first.split('out:')[1].rstrip(')')))
+    ports.add((info['path'][-1], last.split('in:')[1].rstrip(')')))
+    return ports
+
+
+def _assert_disjoint(plan):
+    used = set()
+    for index, info in plan.assignments.items():
+        assert info['path'][0] == plan.demands[index][0].split('.')[0]
+        assert info['path'][-1] == plan.demands[index][1].split('.')[0]
+        ports = _ports(info)
+        assert used.isdisjoint(ports)
+        used |= ports
+
+
+@pytest.mark.parametrize('strategy', ['greedy', 'min-conflict', 'best', 'exact'])
+def test_repeated_one_hop_demand(strategy):
+    graph = topology_to_graph(ring_topology(4))
+    plan = plan_paths(graph, [('SW0', 'SW1')] * 2, [], k=4, strategy=strategy)
+    assert len(plan) == 2
+    _assert_disjoint(plan)
+
+
+@pytest.mark.parametrize('strategy', ['greedy', 'min-conflict', 'best', 'exact'])
+def test_single_link_serves_one_of_repeated_demands(strategy):
+    # A 2-switch ring has a single link in each direction
+    graph = topology_to_graph(ring_topology(2))
+    plan = plan_paths(graph, [('SW0', 'SW1')] * 3, [], k=4, strategy=strategy)
+    assert len(plan) == 1
+    assert plan.unassigned == [1, 2]
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_assignments_are_port_disjoint(seed):
+    graph = topology_to_graph(grid_topology(3, 4))
+    rng = random.Random(seed)
+    switches = sorted(node for node, data in graph.nodes(data=True) if data.get('type') == 'SWITCH')
+    neighbours = [(u, v) for u, v in graph.edges() if u in switches and v in switches]
+    demands = [tuple(rng.sample(switches, 2)) for _ in range(6)]
+    demands += [rng.choice(neighbours) for _ in range(3)]
+    demands += demands[:3]
+    load = establish_trails(graph, 3, seed=seed)
+    for strategy in ('greedy', 'min-conflict', 'best'):
+        _assert_disjoint(plan_paths(graph, demands, load, k=6, strategy=strategy))
@@ -0,0 +1,64 @@
+import pytest
+
+pytest.importorskip('networkx')
+
+from multiverse.compact import CompactTopology
+from multiverse.ledger import PortLedger
+from multiverse.network import topology_to_graph
+from multiverse.planner import plan_paths
+from multiverse.synthetic import establish_trails, grid_topology
+from multiverse.utils import search_paths, search_paths_many
+
+DEMANDS = [('SOURCE', 'DETECTOR'), ('SOURCE.2', 'DETECTOR'), ('SW0_1', 'SW2_2'), ('SW1_1', 'SW0_0'),
+           ('SOURCE', 'DETECTOR')]
+
+
+@pytest.fixture(scope='module')
+def graph():
+    return topology_to_graph(grid_topology(3, 3))
+
+
+@pytest.fixture(scope='module')
+def ledger(graph):
+    return PortLedger(establish_trails(graph, 3))
+
+
+@pytest.mark.parametrize('options', [
+    {},
+    {'k': None},
+    {'only_possible': True, 'max_hops': 7},
+    {'k': 4},
+    {'k': 4, 'weight': 'length', 'only_possible': True},
+    {'k': 6, 'max_hops': 6, 'max_results': 2},
+])
+def test_matches_single_searches(graph, ledger, options):
+    results = search_paths_many(graph, DEMANDS, ledger, **options)
+    assert list(results) == list(dict.fromkeys(DEMANDS))
+    for (start, end), infos in results.items():
+        assert infos == search_paths(graph, start, end, ledger, **options)
+    assert any(results.values())
+
+
+def test_compact_topology(graph, ledger):
+    compact = CompactTopology.from_graph(graph)
+    assert search_paths_many(compact, DEMANDS, ledger) == search_paths_many(graph, DEMANDS, ledger)
+    assert search_paths_many(compact, DEMANDS, ledger, k=3) == search_paths_many(graph, DEMANDS, ledger, k=3)
+
+
+def test_processes(graph, ledger):
+    assert search_paths_many(graph, DEMANDS, ledger, processes=2, k=3) == search_paths_many(graph, DEMANDS, ledger, k=3)
+
+
+@pytest.mark.parametrize('options', [{'weight': 'length'}, {'k': None, 'weight': 'length'},
+                                     {'k': 3, 'time_budget': 1.0}])
+def test_unsupported_options(graph, ledger, options):
+    with pytest.raises(TypeError):
+        search_paths_many(graph, DEMANDS, ledger, **options)
+
+
+def test_plan_without_k(graph, ledger):
+    demands = [('SW0_1', 'SW2_1'), ('SW1_0', 'SW1_2')]
+    plan = plan_paths(graph, demands, ledger, k=None)
+    assert len(plan) == 2
+    with pytest.raises(TypeError):
+        plan_paths(graph, demands, ledger, k=None, weight='length')
@@ -0,0 +1,118 @@
+import copy
+
+import pytest
+
+pytest.importorskip('networkx')
+
+from multiverse.network import topology_to_graph
+from multiverse.synthetic import mesh_topology
+from multiverse.topology_diff import apply_topology_delta, diff_topologies
+
+
+def _node(topology, name):
+    return next(node for node in topology['nodes'] if node['name'] == name)
+
+
+def _add_switch(topology):
+    topology['nodes'].append({'id': 9000, 'name': "NEW", 'type': 'SWITCH',
+                              'vltps': [{'id': 9001, 'name': "NEW.1"}, {'id': 9002, 'name': "NEW.2"}]})
+    sw0 = _node(topology, "SW0")
+    free = sw0['vltps'][-1]
+    topology['links'].append({'id': 9003, 'name': "NEW.1_SW0", 'srcVnodeId': 9000, 'srcVltpId': 9001,
+                              'destVnodeId': sw0['id'], 'destVltpId': free['id']})
+
+
+def _remove_switch(topology):
+    node = _node(topology, "SW3")
+    topology['nodes'].remove(node)
+    topology['links'] = [link for link in topology['links']
+                         if node['id'] not in (link['srcVnodeId'], link['destVnodeId'])]
+
+
+def _rename_port(topology):
+    link = topology['links'][0]
+    node = next(node for node in topology['nodes'] if node['id'] == link['srcVnodeId'])
+    port = next(port for port in node['vltps'] if port['id'] == link['srcVltpId'])
+    port['name'] = port['name'] + "b"
+
+
+def _rename_switch(topology):
+    _node(topology, "SW2")['name'] = "SW2b"
+
+
+def _change_links(topology):
+    del topology['links'][3]
+    topology['links'][5]['name'] = "renamed"
+
+
+def _change_type(topology):
+    _node(topology, "SW4")['type'] = 'ROADM'
+
+
+CHANGES = [_add_switch, _remove_switch, _rename_port, _rename_switch, _change_links, _change_type]
+
+
+def _contents(graph):
+    return (sorted(graph.nodes(data=True)),
+            sorted((u, v, key, sorted(data.items())) for u, v, key, data in graph.edges(keys=True, data=True)))
+
+
+@pytest.fixture
+def topology():
+    return mesh_topology(24, degree=3, ports_per_switch=8)
+
+
+@pytest.mark.parametrize('change', CHANGES)
+def test_in_place_update_matches_rebuild(topology, change):
+    new_topology = copy.deepcopy(topology)
+    change(new_topology)
+    graph = topology_to_graph(topology)
+    delta = apply_topology_delta(graph, topology, new_topology)
+    assert delta and not delta.full_rebuild
+    assert _contents(graph) == _contents(topology_to_graph(new_topology))
+
+
+def test_changes_in_sequence(topology):
+    graph = topology_to_graph(topology)
+    for change in CHANGES:
+        new_topology = copy.deepcopy(topology)
+        change(new_topology)
+        assert not apply_topology_delta(graph, topology, new_topology).full_rebuild
+        topology = new_topology
+    assert _contents(graph) == _contents(topology_to_graph(topology))
+
+
+def test_no_change(topology):
+    graph = topology_to_graph(topology)
+    delta = apply_topology_delta(graph, topology, copy.deepcopy(topology))
+    assert not delta
+    assert _contents(graph) == _contents(topology_to_graph(topology))
+
+
+def test_delta_content(topology):
+    new_topology = copy.deepcopy(topology)
+    _add_switch(new_topology)
+    _change_type(new_topology)
+    delta = diff_topologies(topology, new_topology)
+    assert delta.added_nodes == [9000]
+    assert delta.changed_nodes == [_node(topology, "SW4")['id']]
+    assert delta.added_ports == [9001, 9002]
+    assert delta.added_links == [9003]
+    assert not delta.removed_nodes and not delta.removed_links
+    assert delta.affected_nodes == {"NEW", "SW0", "SW4"}
+
+
+def test_large_change_asks_for_rebuild(topology):
+    new_topology = copy.deepcopy(topology)
+    new_topology['links'] = new_topology['links'][:len(new_topology['links']) // 2]
+    graph = topology_to_graph(topology)
+    delta = apply_topology_delta(graph, topology, new_topology)
+    assert delta.full_rebuild
+    # The graph is left untouched
+    assert _contents(graph) == _contents(topology_to_graph(topology))
+
+
+def test_duplicate_names_ask_for_rebuild(topology):
+    new_topology = copy.deepcopy(topology)
+    _node(new_topology, "SW2")['name'] = "SW1"
+    assert apply_topology_delta(topology_to_graph(topology), topology, new_topology).full_rebuild
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip('requests')
+pytest.importorskip('networkx')
+
+from multiverse import Multiverse
+from multiverse.mock_server import MockMultiverseServer
+from multiverse.path import Path
+from multiverse.utils import search_paths
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path):
+    monkeypatch.setenv('MVS_USERNAME', 'user')
+    monkeypatch.setenv('MVS_PASSWORD', 'password')
+    with MockMultiverseServer() as server:
+        network_id = server.add_synthetic_network('warm', num_trails=4)
+        server.snapshot_path = str(tmp_path / 'snapshots.sqlite3')
+        client = Multiverse(server.host, api_port=server.api_port, auth_port=server.auth_port,
+                            snapshot_store=server.snapshot_path)
+        network = client.select_network('warm')
+        network.warm_start()
+        # The server moves on after the snapshot: one more switch and one more path
+        candidate = next(info for info in search_paths(network.get_topology(), 'SOURCE', 'DETECTOR',
+                                                       network.ledger, k=8)
+                         if info['is_possible'] and not info['is_established'])
+        assert network.create_path(Path.from_computed_path(candidate, name="NEW")) is not None
+        server_network = server._networks[network_id]
+        server_network.topology['nodes'].append({'id': 99999, 'name': "EXTRA", 'type': "SWITCH", 'vltps': []})
+        server_network.version += 1
+        server.latency = 0.05
+        yield server
+
+
+def _state(network):
+    with network._state_lock:
+        return "EXTRA" in network._topology_cache.graph, len(network.ledger)
+
+
+def _client(server, client_class=Multiverse, **options):
+    return client_class(server.host, api_port=server.api_port, auth_port=server.auth_port,
+                        snapshot_store=server.snapshot_path, **options)
+
+
+def test_warm_start_swaps_reconciled_state(server):
+    network = _client(server).select_network('warm')
+    paths = network.warm_start()
+    assert len(paths) == 4
+    states = set()
+    while network._reconciliation.is_alive():
+        states.add(_state(network))
+        network._reconciliation.join(0.005)
+    assert network.wait_reconciled(10)
+    # The topology and the ledger went from the snapshot to the server state at once
+    assert states <= {(False, 4), (True, 5)}
+    assert _state(network) == (True, 5)
+
+
+def test_async_warm_start_swaps_reconciled_state(server):
+    from multiverse import AsyncMultiverse
+
+    async def main():
+        async with _client(server, AsyncMultiverse) as client:
+            network = await client.select_network('warm')
+            paths = await network.warm_start()
+            assert len(paths) == 4
+            states = set()
+            while not network._reconciliation.done():
+                states.add(_state(network))
+                await asyncio.sleep(0.005)
+            assert await network.wait_reconciled(10)
+            return states, network
+
+    states, network = asyncio.run(main())
+    assert states <= {(False, 4), (True, 5)}
+    assert _state(network) == (True, 5)